@@ -3,6 +3,7 @@ import sys
 import signal
 from decimal import Decimal
 from datetime import datetime
+from contextlib import nullcontext
 import threading
 from loguru import logger
 from typing import Dict, List
@@ -115,7 +116,8 @@ class ArbitrageTradingBot:
             self.binance,
             self.upbit,
             max_slippage=config.max_slippage_percent / 100,
-            transfer_timeout_minutes=config.transfer_timeout_minutes
+            transfer_timeout_minutes=config.transfer_timeout_minutes,
+            is_paper_trading=config.dry_run
         )
         
         # Initialize dashboard
@@ -161,6 +163,8 @@ class ArbitrageTradingBot:
             asyncio.create_task(self._update_metrics()),
             asyncio.create_task(self._monitor_system_health()),
         ]
+        if self.balance_manager:
+            self.tasks.append(asyncio.create_task(self.balance_manager.run_periodic_flush()))
         
         try:
             await asyncio.gather(*self.tasks)
@@ -184,6 +188,9 @@ class ArbitrageTradingBot:
         # Wait for tasks to complete
         await asyncio.gather(*self.tasks, return_exceptions=True)
         
+        if self.balance_manager:
+            self.balance_manager.close()
+        
         # Generate performance report for paper trading
         if config.dry_run and self.balance_manager:
             logger.info("Generating paper trading performance report...")
@@ -383,15 +390,18 @@ class ArbitrageTradingBot:
             trade_id = f"{opportunity.coin_symbol}_{datetime.now().timestamp()}"
             await self.risk_manager.register_trade_start(trade_id, opportunity)
             
-            # Execute based on direction
-            if opportunity.direction == "forward":
-                result = await self.forward_strategy.execute_arbitrage(opportunity)
-            else:
-                result = await self.reverse_strategy.execute_arbitrage(opportunity)
-                
+            # Execute based on direction; in paper trading, tag the cycle's
+            # simulated trades and transfers for the performance report
+            cycle = self.balance_manager.arbitrage_cycle() if self.balance_manager else nullcontext()
+            with cycle:
+                if opportunity.direction == "forward":
+                    result = await self.forward_strategy.execute_arbitrage(opportunity)
+                else:
+                    result = await self.reverse_strategy.execute_arbitrage(opportunity)
+                    
             # Register trade completion
-            success = result['status'].value == 'completed'
-            profit = result.get('profit', {}).get('profit_krw', Decimal('0'))
+            success = result.status.value == 'completed'
+            profit = result.profit['profit_krw'] if result.profit else Decimal('0')
             await self.risk_manager.register_trade_complete(trade_id, profit, success)
             
             # Update dashboard
@@ -399,7 +409,7 @@ class ArbitrageTradingBot:
                 self.dashboard.update_data('trade', {
                     'coin': opportunity.coin_symbol,
                     'direction': opportunity.direction,
-                    'status': result['status'].value,
+                    'status': result.status.value,
                     'profit_krw': float(profit)
                 })
                 
@@ -517,13 +527,13 @@ class ArbitrageTradingBot:
                     'current_value_krw': float(current_value),
                     'profit_loss_krw': float(profit_loss),
                     'profit_loss_percent': float(profit_loss_pct),
-                    'total_trades': len(self.balance_manager.trades)
+                    'total_trades': self.balance_manager.trade_counter
                 }
                 
                 logger.info(
                     f"Paper Trading Performance - "
                     f"P&L: {profit_loss:,.0f} KRW ({profit_loss_pct:.2f}%), "
-                    f"Total trades: {len(self.balance_manager.trades)}"
+                    f"Total trades: {self.balance_manager.trade_counter}"
                 )
                 
             if self.dashboard:
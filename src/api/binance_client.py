@@ -1,6 +1,7 @@
 from typing import Dict, List, Optional, Tuple, Set
 from decimal import Decimal
 import asyncio
+import json
 from binance.client import Client
 from binance.exceptions import BinanceAPIException
 from loguru import logger
@@ -8,6 +9,19 @@ import time
 from datetime import datetime, timedelta
 
 
+def _parse_24hr_stats(stats: Dict) -> Dict:
+    return {
+        'symbol': stats['symbol'],
+        'priceChange': Decimal(stats['priceChange']),
+        'priceChangePercent': Decimal(stats['priceChangePercent']),
+        'volume': Decimal(stats['volume']),
+        'quoteVolume': Decimal(stats['quoteVolume']),
+        'highPrice': Decimal(stats['highPrice']),
+        'lowPrice': Decimal(stats['lowPrice']),
+        'lastPrice': Decimal(stats['lastPrice'])
+    }
+
+
 class BinanceClient:
     def __init__(self, api_key: str, api_secret: str, testnet: bool = False):
         self.api_key = api_key
@@ -54,6 +68,20 @@ class BinanceClient:
             logger.error(f"Failed to get balance for {asset}: {e}")
             raise
             
+    def get_balances(self) -> Dict[str, Dict[str, Decimal]]:
+        """Every spot balance from a single account call, keyed by asset"""
+        try:
+            account_info = self.client.get_account()
+            result = {}
+            for balance in account_info['balances']:
+                free = Decimal(balance['free'])
+                locked = Decimal(balance['locked'])
+                result[balance['asset']] = {'free': free, 'locked': locked, 'total': free + locked}
+            return result
+        except BinanceAPIException as e:
+            logger.error(f"Failed to get balances: {e}")
+            raise
+            
     def get_ticker_price(self, symbol: str) -> Decimal:
         try:
             ticker = self.client.get_symbol_ticker(symbol=symbol.upper())
@@ -139,6 +167,13 @@ class BinanceClient:
             logger.error(f"Failed to place limit order: {e}")
             raise
             
+    def get_order(self, symbol: str, order_id: int) -> Dict:
+        try:
+            return self.client.get_order(symbol=symbol.upper(), orderId=order_id)
+        except BinanceAPIException as e:
+            logger.error(f"Failed to get order {order_id}: {e}")
+            raise
+            
     def get_deposit_address(self, coin: str, network: str = None) -> Dict:
         try:
             params = {'coin': coin.upper()}
@@ -241,21 +276,22 @@ class BinanceClient:
         
     async def get_24hr_stats(self, symbol: str) -> Dict:
         try:
-            stats = self.client.get_ticker(symbol=symbol.upper())
-            return {
-                'symbol': stats['symbol'],
-                'priceChange': Decimal(stats['priceChange']),
-                'priceChangePercent': Decimal(stats['priceChangePercent']),
-                'volume': Decimal(stats['volume']),
-                'quoteVolume': Decimal(stats['quoteVolume']),
-                'highPrice': Decimal(stats['highPrice']),
-                'lowPrice': Decimal(stats['lowPrice']),
-                'lastPrice': Decimal(stats['lastPrice'])
-            }
+            return _parse_24hr_stats(self.client.get_ticker(symbol=symbol.upper()))
         except BinanceAPIException as e:
             logger.error(f"Failed to get 24hr stats for {symbol}: {e}")
             raise
             
+    async def get_24hr_stats_batch(self, symbols: List[str]) -> List[Dict]:
+        """Get 24hr stats for several symbols with one request, in symbol order"""
+        wanted = [symbol.upper() for symbol in symbols]
+        try:
+            data = self.client.get_ticker(symbols=json.dumps(wanted, separators=(',', ':')))
+        except BinanceAPIException as e:
+            logger.error(f"Failed to get 24hr stats for {', '.join(wanted)}: {e}")
+            raise
+        by_symbol = {stats['symbol']: stats for stats in data}
+        return [_parse_24hr_stats(by_symbol[symbol]) for symbol in wanted]
+            
     def get_usdt_markets(self, force_refresh: bool = False) -> Set[str]:
         """Get all USDT trading pairs from Binance"""
         now = datetime.now()
@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from decimal import Decimal
 import asyncio
 import pyupbit
@@ -9,9 +9,67 @@ import uuid
 import hashlib
 from urllib.parse import urlencode
 import requests
+from bisect import bisect_right
 from datetime import datetime, timedelta
 
 
+_D0 = Decimal('0')
+_FEE = Decimal('0.0005')
+_Q_8 = Decimal('0.00000001')
+_Q_1 = Decimal('0.1')
+_Q_2 = Decimal('0.01')
+_Q_3 = Decimal('0.001')
+
+# Seconds before a direct REST request to Upbit is abandoned
+_REQUEST_TIMEOUT = 10
+
+
+def _parse_24hr_stats(stats: Dict) -> Dict:
+    return {
+        'ticker': stats['market'],
+        'trade_price': Decimal(str(stats['trade_price'])),
+        'change_rate': Decimal(str(stats['signed_change_rate'])),
+        'change_price': Decimal(str(stats['signed_change_price'])),
+        'acc_trade_volume_24h': Decimal(str(stats['acc_trade_volume_24h'])),
+        'acc_trade_price_24h': Decimal(str(stats['acc_trade_price_24h'])),
+        'high_price': Decimal(str(stats['high_price'])),
+        'low_price': Decimal(str(stats['low_price'])),
+        'prev_closing_price': Decimal(str(stats['prev_closing_price']))
+    }
+
+
+def _quantize_to(quantum: Decimal) -> Callable[[Decimal], Decimal]:
+    return lambda price: price.quantize(quantum)
+    
+    
+def _truncate_to(step: int) -> Callable[[Decimal], Decimal]:
+    return lambda price: Decimal(int(price / step) * step)
+    
+    
+# Upbit KRW tick sizes: lower bound of each price band and its rounder
+_KRW_TICK_BOUNDS = (1, 10, 100, 1000, 10000, 100000, 500000, 1000000, 2000000)
+_KRW_TICK_ROUNDERS = (
+    _quantize_to(_Q_3),   # < 1: round to 0.001
+    _quantize_to(_Q_2),   # >= 1: round to 0.01
+    _quantize_to(_Q_1),   # >= 10: round to 0.1
+    _truncate_to(1),      # >= 100: round to 1
+    _truncate_to(5),      # >= 1,000: round to 5
+    _truncate_to(10),     # >= 10,000: round to 10
+    _truncate_to(50),     # >= 100,000: round to 50
+    _truncate_to(100),    # >= 500,000: round to 100
+    _truncate_to(500),    # >= 1,000,000: round to 500
+    _truncate_to(1000),   # >= 2,000,000: round to 1000
+)
+
+
+def _krw_round(price: Decimal) -> Decimal:
+    return _KRW_TICK_ROUNDERS[bisect_right(_KRW_TICK_BOUNDS, price)](price)
+    
+    
+def _btc_round(price: Decimal) -> Decimal:
+    return price.quantize(_Q_8)
+
+
 class UpbitClient:
     def __init__(self, access_key: str, secret_key: str):
         self.access_key = access_key
@@ -20,8 +78,11 @@ class UpbitClient:
         self.server_url = "https://api.upbit.com"
         self._krw_markets_cache = []
         self._krw_markets_last_update = None
+        self._krw_markets_etag = None
+        self._krw_markets_last_modified = None
         self._cache_duration = timedelta(minutes=30)
         self._api_access_verified = False
+        self._price_rounders: Dict[str, Callable[[Decimal], Decimal]] = {}
         
     def _generate_jwt_token(self, query: Dict = None) -> str:
         payload = {
@@ -51,11 +112,29 @@ class UpbitClient:
                         'total': Decimal(balance['balance']) + Decimal(balance['locked']),
                         'avg_buy_price': Decimal(balance['avg_buy_price'])
                     }
-            return {'free': Decimal('0'), 'locked': Decimal('0'), 'total': Decimal('0')}
+            return {'free': _D0, 'locked': _D0, 'total': _D0}
         except Exception as e:
             logger.error(f"Failed to get balance for {ticker}: {e}")
             raise
             
+    def get_balances(self) -> Dict[str, Dict[str, Decimal]]:
+        """Every account balance from a single /v1/accounts call, keyed by currency"""
+        try:
+            result = {}
+            for balance in self.upbit.get_balances():
+                free = Decimal(balance['balance'])
+                locked = Decimal(balance['locked'])
+                result[balance['currency']] = {
+                    'free': free,
+                    'locked': locked,
+                    'total': free + locked,
+                    'avg_buy_price': Decimal(balance['avg_buy_price'])
+                }
+            return result
+        except Exception as e:
+            logger.error(f"Failed to get balances: {e}")
+            raise
+            
     def get_ticker_price(self, ticker: str) -> Decimal:
         try:
             price = pyupbit.get_current_price(ticker)
@@ -151,9 +230,7 @@ class UpbitClient:
             
     def place_market_sell_order(self, ticker: str, volume: Decimal) -> Dict:
         try:
-            # Get market info for volume precision
-            market_info = self._get_market_info(ticker)
-            volume = self._apply_volume_precision(volume, market_info)
+            volume = self._apply_volume_precision(volume)
             
             order = self.upbit.sell_market_order(ticker, float(volume))
             logger.info(f"Market sell order placed: {order}")
@@ -165,9 +242,8 @@ class UpbitClient:
             
     def place_limit_buy_order(self, ticker: str, price: Decimal, volume: Decimal) -> Dict:
         try:
-            market_info = self._get_market_info(ticker)
-            price = self._apply_price_precision(price, ticker)
-            volume = self._apply_volume_precision(volume, market_info)
+            price = self._price_rounder(ticker)(price)
+            volume = self._apply_volume_precision(volume)
             
             order = self.upbit.buy_limit_order(ticker, float(price), float(volume))
             logger.info(f"Limit buy order placed: {order}")
@@ -179,9 +255,8 @@ class UpbitClient:
             
     def place_limit_sell_order(self, ticker: str, price: Decimal, volume: Decimal) -> Dict:
         try:
-            market_info = self._get_market_info(ticker)
-            price = self._apply_price_precision(price, ticker)
-            volume = self._apply_volume_precision(volume, market_info)
+            price = self._price_rounder(ticker)(price)
+            volume = self._apply_volume_precision(volume)
             
             order = self.upbit.sell_limit_order(ticker, float(price), float(volume))
             logger.info(f"Limit sell order placed: {order}")
@@ -191,6 +266,26 @@ class UpbitClient:
             logger.error(f"Failed to place limit sell order: {e}")
             raise
             
+    def get_order(self, order_uuid: str) -> Dict:
+        try:
+            params = {'uuid': order_uuid}
+            headers = {"Authorization": self._generate_jwt_token(params)}
+            res = requests.get(
+                f"{self.server_url}/v1/order",
+                params=params,
+                headers=headers,
+                timeout=_REQUEST_TIMEOUT
+            )
+            if not 200 <= res.status_code < 300:
+                name, message = self._parse_error(res)
+                raise Exception(f"Order lookup failed ({res.status_code}): {name} - {message}")
+                
+            return res.json()
+            
+        except Exception as e:
+            logger.error(f"Failed to get order {order_uuid}: {e}")
+            raise
+            
     def get_deposit_address(self, currency: str) -> Dict:
         try:
             headers = {"Authorization": self._generate_jwt_token()}
@@ -299,8 +394,8 @@ class UpbitClient:
             # Some accounts may have different fee rates
             return {
                 'market': market,
-                'maker_fee': Decimal('0.0005'),
-                'taker_fee': Decimal('0.0005')
+                'maker_fee': _FEE,
+                'taker_fee': _FEE
             }
         except Exception as e:
             logger.error(f"Failed to get trading fee: {e}")
@@ -326,46 +421,19 @@ class UpbitClient:
         # Upbit requires KRW amounts to be integers
         return Decimal(int(amount))
         
-    def _apply_price_precision(self, price: Decimal, ticker: str) -> Decimal:
-        # Upbit price precision rules based on price range
-        if 'KRW' in ticker:
-            if price >= 2000000:
-                # Round to nearest 1000
-                return Decimal(int(price / 1000) * 1000)
-            elif price >= 1000000:
-                # Round to nearest 500
-                return Decimal(int(price / 500) * 500)
-            elif price >= 500000:
-                # Round to nearest 100
-                return Decimal(int(price / 100) * 100)
-            elif price >= 100000:
-                # Round to nearest 50
-                return Decimal(int(price / 50) * 50)
-            elif price >= 10000:
-                # Round to nearest 10
-                return Decimal(int(price / 10) * 10)
-            elif price >= 1000:
-                # Round to nearest 5
-                return Decimal(int(price / 5) * 5)
-            elif price >= 100:
-                # Round to nearest 1
-                return Decimal(int(price))
-            elif price >= 10:
-                # Round to 0.1
-                return price.quantize(Decimal('0.1'))
-            elif price >= 1:
-                # Round to 0.01
-                return price.quantize(Decimal('0.01'))
-            else:
-                # Round to 0.001
-                return price.quantize(Decimal('0.001'))
-        else:
-            # BTC markets
-            return price.quantize(Decimal('0.00000001'))
-            
-    def _apply_volume_precision(self, volume: Decimal, market_info: Dict) -> Decimal:
+    def _price_rounder(self, ticker: str) -> Callable[[Decimal], Decimal]:
+        # Upbit price precision rules depend on the market, so resolve the
+        # rounder once per ticker and reuse it on subsequent orders
+        rounder = self._price_rounders.get(ticker)
+        if rounder is None:
+            # KRW markets use price-band tick sizes, BTC markets use 8 decimals
+            rounder = _krw_round if 'KRW' in ticker else _btc_round
+            self._price_rounders[ticker] = rounder
+        return rounder
+        
+    def _apply_volume_precision(self, volume: Decimal) -> Decimal:
         # Most cryptos use 8 decimal places
-        return volume.quantize(Decimal('0.00000001'))
+        return volume.quantize(_Q_8)
         
     async def get_24hr_stats(self, ticker: str) -> Dict:
         try:
@@ -374,22 +442,24 @@ class UpbitClient:
             if not data or not isinstance(data, list) or len(data) == 0:
                 raise ValueError(f"Failed to get 24hr stats for {ticker}")
                 
-            stats = data[0]
-            return {
-                'ticker': stats['market'],
-                'trade_price': Decimal(str(stats['trade_price'])),
-                'change_rate': Decimal(str(stats['signed_change_rate'])),
-                'change_price': Decimal(str(stats['signed_change_price'])),
-                'acc_trade_volume_24h': Decimal(str(stats['acc_trade_volume_24h'])),
-                'acc_trade_price_24h': Decimal(str(stats['acc_trade_price_24h'])),
-                'high_price': Decimal(str(stats['high_price'])),
-                'low_price': Decimal(str(stats['low_price'])),
-                'prev_closing_price': Decimal(str(stats['prev_closing_price']))
-            }
+            return _parse_24hr_stats(data[0])
         except Exception as e:
             logger.error(f"Failed to get 24hr stats for {ticker}: {e}")
             raise
             
+    async def get_24hr_stats_batch(self, tickers: List[str]) -> List[Dict]:
+        """Get 24hr stats for several tickers with one request, in ticker order"""
+        try:
+            data = pyupbit.get_ticker(list(tickers))
+            if not data or not isinstance(data, list):
+                raise ValueError(f"Failed to get 24hr stats for {', '.join(tickers)}")
+                
+            by_market = {stats['market']: stats for stats in data}
+            return [_parse_24hr_stats(by_market[ticker]) for ticker in tickers]
+        except Exception as e:
+            logger.error(f"Failed to get 24hr stats for {', '.join(tickers)}: {e}")
+            raise
+            
     def get_krw_markets(self, force_refresh: bool = False) -> List[str]:
         """Get all KRW market symbols from Upbit"""
         now = datetime.now()
@@ -402,19 +472,33 @@ class UpbitClient:
             return self._krw_markets_cache
             
         try:
+            # Conditional GET: the market list rarely changes, so let the server
+            # answer 304 Not Modified instead of resending the full body
+            headers = {}
+            if self._krw_markets_cache:
+                if self._krw_markets_etag:
+                    headers['If-None-Match'] = self._krw_markets_etag
+                if self._krw_markets_last_modified:
+                    headers['If-Modified-Since'] = self._krw_markets_last_modified
+                    
+            res = requests.get(f"{self.server_url}/v1/market/all", headers=headers,
+                               timeout=_REQUEST_TIMEOUT)
+            if res.status_code == 304:
+                self._krw_markets_last_update = now
+                logger.debug("KRW markets unchanged since last refresh")
+                return self._krw_markets_cache
+            res.raise_for_status()
+            
             # Get all markets
-            markets = pyupbit.get_tickers()
+            markets = [market['market'] for market in res.json()]
             
             # Filter KRW markets and extract coin symbols
-            krw_markets = []
-            for market in markets:
-                if market.startswith('KRW-'):
-                    coin_symbol = market.split('-')[1]
-                    krw_markets.append(coin_symbol)
+            krw_markets = [m[4:] for m in markets if m.startswith('KRW-')]
                     
-            # Update cache
-            self._krw_markets_cache = krw_markets
-            self._krw_markets_last_update = now
+            # Update cache list and timestamp together
+            self._krw_markets_cache, self._krw_markets_last_update = krw_markets, now
+            self._krw_markets_etag = res.headers.get('ETag')
+            self._krw_markets_last_modified = res.headers.get('Last-Modified')
             
             logger.info(f"Updated KRW markets cache: {len(krw_markets)} markets found")
             return krw_markets
@@ -445,6 +529,14 @@ class UpbitClient:
             logger.error(f"Failed to get tradable markets: {e}")
             raise
             
+    def _parse_error(self, res: requests.Response) -> Tuple[str, str]:
+        """Extract (name, message) from an Upbit error response body"""
+        try:
+            error = res.json().get('error', {})
+        except (ValueError, AttributeError):
+            return 'Unknown', res.text
+        return error.get('name', 'Unknown'), error.get('message', 'No message')
+        
     def verify_api_access(self) -> Tuple[bool, str]:
         """Verify API access and permissions
         
@@ -456,56 +548,49 @@ class UpbitClient:
             logger.info("Verifying Upbit API access...")
             
             # Try to get balance (requires authentication)
-            try:
-                balances = self.upbit.get_balances()
-                if balances is None:
-                    return False, "API returned None for balance check - verify API keys"
-                logger.info("✓ Balance API access verified")
-            except Exception as e:
-                error_msg = str(e)
-                if 'jwt' in error_msg.lower() or 'unauthorized' in error_msg.lower():
-                    return False, f"Authentication failed: {error_msg} - Check API keys and secret"
-                else:
-                    return False, f"Balance API error: {error_msg}"
+            res = requests.get(
+                f"{self.server_url}/v1/accounts",
+                headers={"Authorization": self._generate_jwt_token()},
+                timeout=_REQUEST_TIMEOUT
+            )
+            if res.status_code in (401, 403):
+                name, message = self._parse_error(res)
+                return False, f"Authentication failed: {name} - {message} - Check API keys and secret"
+            if res.status_code != 200:
+                name, message = self._parse_error(res)
+                return False, f"Balance API error: {name} - {message}"
+            if res.json() is None:
+                return False, "API returned None for balance check - verify API keys"
+            logger.info("✓ Balance API access verified")
             
             # Test 2: Check orderbook access (public API but may be IP restricted)
             test_ticker = "KRW-BTC"
-            try:
-                orderbook = pyupbit.get_orderbook(test_ticker)
-                if orderbook is None:
-                    return False, "Orderbook API returned None - IP may not be whitelisted"
-                    
-                # Handle both dict and list responses
-                if isinstance(orderbook, dict):
-                    # Single ticker response
-                    if 'error' in orderbook:
-                        error_info = orderbook['error']
-                        return False, f"Orderbook API error: {error_info.get('message', 'Unknown error')} - Add your IP to Upbit whitelist"
-                    if 'orderbook_units' not in orderbook:
-                        return False, f"Invalid orderbook structure - missing orderbook_units"
-                elif isinstance(orderbook, list):
-                    # Multiple ticker response
-                    if len(orderbook) == 0:
-                        return False, f"Empty orderbook list - API may be restricted"
-                    if 'error' in orderbook[0]:
-                        error_info = orderbook[0]['error']
-                        return False, f"Orderbook API error: {error_info.get('message', 'Unknown error')} - Add your IP to Upbit whitelist"
-                else:
-                    return False, f"Invalid orderbook format: {type(orderbook)} - API may be restricted"
-                    
-                logger.info("✓ Orderbook API access verified")
+            res = requests.get(
+                f"{self.server_url}/v1/orderbook",
+                params={'markets': test_ticker},
+                timeout=_REQUEST_TIMEOUT
+            )
+            if res.status_code != 200:
+                name, message = self._parse_error(res)
+                return False, f"Orderbook API error: {message} - Add your IP to Upbit whitelist"
                 
-            except Exception as e:
-                return False, f"Orderbook API error: {str(e)} - Check IP whitelist"
+            orderbook = res.json()
+            if not isinstance(orderbook, list):
+                return False, f"Invalid orderbook format: {type(orderbook)} - API may be restricted"
+            if len(orderbook) == 0:
+                return False, f"Empty orderbook list - API may be restricted"
+            if 'orderbook_units' not in orderbook[0]:
+                return False, f"Invalid orderbook structure - missing orderbook_units"
+            logger.info("✓ Orderbook API access verified")
             
             # Test 3: Try to get markets list
-            try:
-                markets = pyupbit.get_tickers()
-                if not markets:
-                    return False, "Cannot fetch market list - API access may be restricted"
-                logger.info("✓ Market list API access verified")
-            except Exception as e:
-                return False, f"Market API error: {str(e)}"
+            res = requests.get(f"{self.server_url}/v1/market/all", timeout=_REQUEST_TIMEOUT)
+            if res.status_code != 200:
+                name, message = self._parse_error(res)
+                return False, f"Market API error: {name} - {message}"
+            if not res.json():
+                return False, "Cannot fetch market list - API access may be restricted"
+            logger.info("✓ Market list API access verified")
             
             self._api_access_verified = True
             return True, "All API access verified successfully"
@@ -1,275 +1,544 @@
 import dash
-from dash import dcc, html, Input, Output, State
+import flask
+from dash import dcc, html, Input, Output, State, Patch
 import plotly.graph_objs as go
-import plotly.express as px
+import plotly.io as pio
 from datetime import datetime, timedelta
-import pandas as pd
+import numpy as np
 from decimal import Decimal
 import asyncio
-from typing import Dict, List
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
 import json
+from collections import deque
+from functools import lru_cache
 
 
+# Dash serializes every callback response through plotly's JSON encoder;
+# use orjson when available (it handles the NumPy trace arrays natively)
+try:
+    import orjson  # noqa: F401
+    pio.json.config.default_engine = 'orjson'
+except ImportError:
+    pass
+
+
+# Premium samples kept per coin
+PREMIUM_HISTORY_SIZE = 1000
+# Points per trace sent when a client receives the full premium chart
+PREMIUM_CHART_POINTS = 800
+
+# Chart layouts, built once; a fixed uirevision keeps the user's zoom/pan
+# when a client is sent a fresh figure
+_PREMIUM_LAYOUT = go.Layout(
+    title='실시간 프리미엄 추이',
+    xaxis_title='시간',
+    yaxis_title='프리미엄 (%)',
+    hovermode='x unified',
+    uirevision='premium'
+)
+_EMPTY_LAYOUT = go.Layout(title='프리미엄 데이터 대기중...')
+
+
+def _lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Pick n_out points that preserve the visual shape of a series
+    
+    Largest-Triangle-Three-Buckets: keep the first and last points and, from
+    each bucket in between, the point forming the largest triangle with the
+    previously kept point and the average of the next bucket.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+        
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = (edges[i + 1], edges[i + 2]) if i + 2 < n_out - 1 else (n - 1, n)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) -
+                      (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        indices[i + 1] = a
+        
+    return indices
+
+
+@lru_cache(maxsize=128)
+def _format_krw(value) -> str:
+    return f"{value:,.0f} KRW"
+
+
+@lru_cache(maxsize=128)
+def _format_percent(value) -> str:
+    return f"{value:.1f}%"
+
+
+# Clientside renderers: the server sends raw balances/trades through dcc.Store
+# and the browser builds the html.Div nodes itself
+_RENDER_BALANCES_JS = """
+function(balances) {
+    if (!balances) { return []; }
+    var items = [];
+    Object.entries(balances).forEach(function([exchange, balanceData]) {
+        Object.entries(balanceData).forEach(function([currency, amount]) {
+            var text = amount.toLocaleString('en-US',
+                {minimumFractionDigits: 2, maximumFractionDigits: 2});
+            items.push({
+                type: 'Div', namespace: 'dash_html_components',
+                props: {className: 'balance-item',
+                        children: exchange + ' - ' + currency + ': ' + text}
+            });
+        });
+    });
+    return items;
+}
+"""
+
+# Lookup tables for per-row styling; anything not listed gets the default
+_STATUS_COLOR = {'completed': '#27ae60', 'failed': '#e74c3c', 'cancelled': '#e74c3c'}
+_ALERT_CLASS = {
+    'warning': 'alert alert-warning',
+    'danger': 'alert alert-danger',
+    'success': 'alert alert-success'
+}
+
+_RENDER_TRADES_JS = """
+(function() {
+    var STATUS_COLOR = %s;
+    return function(trades) {
+        if (!trades) { return []; }
+        return trades.map(function(trade) {
+            var color = STATUS_COLOR[trade.status] || '#e74c3c';
+            var profit = Math.round(trade.profit_krw || 0).toLocaleString('en-US');
+            var div = function(children, style) {
+                return {type: 'Div', namespace: 'dash_html_components',
+                        props: {children: children, style: style}};
+            };
+            return {
+                type: 'Div', namespace: 'dash_html_components',
+                props: {className: 'trade-item', children: [
+                    div(trade.coin + ' - ' + trade.direction, {fontWeight: 'bold'}),
+                    div('수익: ' + profit + ' KRW'),
+                    div('상태: ' + trade.status, {color: color})
+                ]}
+            };
+        });
+    };
+})()
+""" % json.dumps(_STATUS_COLOR)
+
+
+# Dashboard sections, each re-rendered only when its own data changes
+_SECTIONS = ('metrics', 'premiums', 'balances', 'trades', 'alerts')
+_SECTION_OF = {
+    'metrics': 'metrics',
+    'premium': 'premiums',
+    'balances': 'balances',
+    'trade': 'trades',
+    'alert': 'alerts'
+}
+
+
+# Static page layout; built once at import and shared by every dashboard.
+# Styling lives in assets/style.css, which Dash serves with cache-busting URLs
+_LAYOUT = html.Div([
+    html.Div([
+        html.H1('암호화폐 재정거래 모니터링 대시보드', 
+               style={'textAlign': 'center', 'color': '#2c3e50'}),
+        html.Div(id='last-update', style={'textAlign': 'center', 'color': '#7f8c8d'})
+    ]),
+
+    # Alerts Section
+    html.Div(id='alerts-section', style={'margin': '20px'}),
+
+    # Key Metrics Row
+    html.Div([
+        html.Div([
+            html.H3('일일 거래량'),
+            html.H2(id='daily-volume', children='0 KRW')
+        ], className='metric-box', style={'width': '23%', 'display': 'inline-block'}),
+
+        html.Div([
+            html.H3('일일 수익'),
+            html.H2(id='daily-profit', children='0 KRW')
+        ], className='metric-box', style={'width': '23%', 'display': 'inline-block'}),
+
+        html.Div([
+            html.H3('성공률'),
+            html.H2(id='success-rate', children='0%')
+        ], className='metric-box', style={'width': '23%', 'display': 'inline-block'}),
+
+        html.Div([
+            html.H3('활성 거래'),
+            html.H2(id='active-trades', children='0')
+        ], className='metric-box', style={'width': '23%', 'display': 'inline-block'}),
+    ], style={'margin': '20px', 'textAlign': 'center'}),
+
+    # Premium Charts
+    html.Div([
+        dcc.Graph(id='premium-chart', style={'height': '400px'}),
+        dcc.Store(id='premium-cursor'),
+        # Per-section data versions; each drives its own narrow callback
+        *[dcc.Store(id=f'{section}-version') for section in _SECTIONS],
+        dcc.Interval(id='interval-component', interval=5000)  # Check for new data every 5 seconds
+    ], style={'margin': '20px'}),
+
+    # Balance Information
+    html.Div([
+        html.Div([
+            html.H3('거래소 잔고'),
+            html.Div(id='balance-info'),
+            dcc.Store(id='balances-store')
+        ], style={'width': '48%', 'display': 'inline-block', 'verticalAlign': 'top'}),
+
+        html.Div([
+            html.H3('최근 거래 내역'),
+            html.Div(id='recent-trades'),
+            dcc.Store(id='trades-store')
+        ], style={'width': '48%', 'display': 'inline-block', 'verticalAlign': 'top'})
+    ], style={'margin': '20px'}),
+
+    # Hidden div to store data
+    html.Div(id='data-store', style={'display': 'none'})
+])
+
+
+class _PremiumRing:
+    """Fixed-size ring buffer of (timestamp, premium rate) samples for one coin"""
+    
+    __slots__ = ('timestamps', 'rates', 'count', 'writing')
+    
+    def __init__(self, size: int):
+        self.timestamps = np.empty(size, dtype='datetime64[ms]')
+        self.rates = np.empty(size, dtype=np.float64)
+        self.count = 0  # Total samples ever appended
+        self.writing = 0  # Samples appended or being appended
+        
+    def append(self, timestamp: datetime, rate: float):
+        self.writing = self.count + 1
+        i = self.count % len(self.rates)
+        self.timestamps[i] = timestamp
+        self.rates[i] = rate
+        self.count += 1
+        
+    def slice(self, start: int, stop: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Samples numbered [start, stop) in arrival order (must still be retained)
+        
+        Safe without a lock against a concurrent append: samples whose slot
+        was overwritten while copying are dropped from the front.
+        """
+        size = len(self.rates)
+        index = np.arange(start, stop) % size
+        timestamps, rates = self.timestamps[index], self.rates[index]
+        overwritten = self.writing - size - start
+        if overwritten > 0:
+            return timestamps[overwritten:], rates[overwritten:]
+        return timestamps, rates
+        
+        
 class TradingDashboard:
     def __init__(self, port: int = 8050):
-        self.app = dash.Dash(__name__)
+        server = flask.Flask(__name__)
+        # Compress responses; set before Dash installs flask-compress, which
+        # would otherwise restrict it to gzip
+        server.config.update(
+            COMPRESS_ALGORITHM=['br', 'gzip'],
+            COMPRESS_MIN_SIZE=1024
+        )
+        self.app = dash.Dash(__name__, server=server, compress=True, serve_locally=False)
         self.port = port
+        self._trades = deque(maxlen=100)
+        self._alerts = deque(maxlen=20)
+        # Published snapshots read by the callbacks. update_data replaces each
+        # value with a single reference assignment and never mutates one in
+        # place (premium rings excepted, see _PremiumRing.slice), so readers
+        # need no lock
         self.data_store = {
-            'premiums': [],
-            'trades': [],
+            'premiums': {},  # coin -> _PremiumRing of recent premium samples
+            'trades': (),
             'metrics': {},
             'balances': {},
-            'alerts': []
+            'alerts': ()
         }
+        # Serializes producers only; readers never take it
+        self._publish_lock = threading.Lock()
+        # (epoch second, formatted local time) of the last _now_str call
+        self._now_cache: Tuple[int, str] = (0, '')
+        # Bumped per section by update_data; clients re-render a section
+        # only when its version moves
+        self._versions = dict.fromkeys(_SECTIONS, 0)
+        self._section_cache: Dict[str, Tuple[int, any]] = {}
+        # Held while the premium chart renders so slow renders never overlap
+        self._update_lock = threading.Lock()
         self._setup_layout()
         self._setup_callbacks()
         
     def _setup_layout(self):
-        self.app.layout = html.Div([
-            html.Div([
-                html.H1('암호화폐 재정거래 모니터링 대시보드', 
-                       style={'textAlign': 'center', 'color': '#2c3e50'}),
-                html.Div(id='last-update', style={'textAlign': 'center', 'color': '#7f8c8d'})
-            ]),
-            
-            # Alerts Section
-            html.Div(id='alerts-section', style={'margin': '20px'}),
-            
-            # Key Metrics Row
-            html.Div([
-                html.Div([
-                    html.H3('일일 거래량'),
-                    html.H2(id='daily-volume', children='0 KRW')
-                ], className='metric-box', style={'width': '23%', 'display': 'inline-block'}),
-                
-                html.Div([
-                    html.H3('일일 수익'),
-                    html.H2(id='daily-profit', children='0 KRW')
-                ], className='metric-box', style={'width': '23%', 'display': 'inline-block'}),
-                
-                html.Div([
-                    html.H3('성공률'),
-                    html.H2(id='success-rate', children='0%')
-                ], className='metric-box', style={'width': '23%', 'display': 'inline-block'}),
-                
-                html.Div([
-                    html.H3('활성 거래'),
-                    html.H2(id='active-trades', children='0')
-                ], className='metric-box', style={'width': '23%', 'display': 'inline-block'}),
-            ], style={'margin': '20px', 'textAlign': 'center'}),
-            
-            # Premium Charts
-            html.Div([
-                dcc.Graph(id='premium-chart', style={'height': '400px'}),
-                dcc.Interval(id='interval-component', interval=5000)  # Update every 5 seconds
-            ], style={'margin': '20px'}),
-            
-            # Balance Information
-            html.Div([
-                html.Div([
-                    html.H3('거래소 잔고'),
-                    html.Div(id='balance-info')
-                ], style={'width': '48%', 'display': 'inline-block', 'verticalAlign': 'top'}),
-                
-                html.Div([
-                    html.H3('최근 거래 내역'),
-                    html.Div(id='recent-trades')
-                ], style={'width': '48%', 'display': 'inline-block', 'verticalAlign': 'top'})
-            ], style={'margin': '20px'}),
-            
-            # Hidden div to store data
-            html.Div(id='data-store', style={'display': 'none'})
-        ])
-        
-        # Add CSS styling
-        self.app.index_string = '''
-        <!DOCTYPE html>
-        <html>
-            <head>
-                {%metas%}
-                <title>{%title%}</title>
-                {%favicon%}
-                {%css%}
-                <style>
-                    body {
-                        font-family: Arial, sans-serif;
-                        background-color: #ecf0f1;
-                        margin: 0;
-                        padding: 0;
-                    }
-                    .metric-box {
-                        background-color: white;
-                        border-radius: 10px;
-                        padding: 20px;
-                        margin: 10px;
-                        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                    }
-                    .metric-box h3 {
-                        color: #7f8c8d;
-                        margin: 0;
-                        font-size: 14px;
-                    }
-                    .metric-box h2 {
-                        color: #2c3e50;
-                        margin: 10px 0 0 0;
-                        font-size: 24px;
-                    }
-                    .alert {
-                        padding: 15px;
-                        margin: 10px;
-                        border-radius: 5px;
-                        color: white;
-                    }
-                    .alert-warning {
-                        background-color: #f39c12;
-                    }
-                    .alert-danger {
-                        background-color: #e74c3c;
-                    }
-                    .alert-success {
-                        background-color: #27ae60;
-                    }
-                    .trade-item {
-                        background-color: white;
-                        padding: 10px;
-                        margin: 5px 0;
-                        border-radius: 5px;
-                        border-left: 4px solid #3498db;
-                    }
-                    .balance-item {
-                        background-color: white;
-                        padding: 10px;
-                        margin: 5px 0;
-                        border-radius: 5px;
-                    }
-                </style>
-            </head>
-            <body>
-                {%app_entry%}
-                <footer>
-                    {%config%}
-                    {%scripts%}
-                    {%renderer%}
-                </footer>
-            </body>
-        </html>
-        '''
+        self.app.layout = _LAYOUT
+        # Asset URLs carry an mtime query, so browsers may cache them for long
+        self.app.server.config['SEND_FILE_MAX_AGE_DEFAULT'] = 31536000
         
     def _setup_callbacks(self):
+        @self.app.callback(
+            [Output(f'{section}-version', 'data') for section in _SECTIONS] +
+            [Output('last-update', 'children')],
+            [Input('interval-component', 'n_intervals')],
+            [State(f'{section}-version', 'data') for section in _SECTIONS]
+        )
+        def check_data_versions(n, *client_versions):
+            # Cheap poll: only version numbers cross the wire, and a section
+            # is re-rendered only when update_data has touched it since
+            versions = dict(self._versions)
+            # A chart render still in flight keeps the client on its old
+            # version, so the next tick retries with the latest data
+            if self._update_lock.locked():
+                versions['premiums'] = client_versions[_SECTIONS.index('premiums')]
+            changed = [versions[section] if versions[section] != client else dash.no_update
+                       for section, client in zip(_SECTIONS, client_versions)]
+            if all(value is dash.no_update for value in changed):
+                raise dash.exceptions.PreventUpdate
+                
+            last_update = f"마지막 업데이트: {self._now_str()}"
+            return changed + [last_update]
+            
         @self.app.callback(
             [Output('daily-volume', 'children'),
              Output('daily-profit', 'children'),
              Output('success-rate', 'children'),
-             Output('active-trades', 'children'),
-             Output('premium-chart', 'figure'),
-             Output('balance-info', 'children'),
-             Output('recent-trades', 'children'),
-             Output('alerts-section', 'children'),
-             Output('last-update', 'children')],
-            [Input('interval-component', 'n_intervals')]
+             Output('active-trades', 'children')],
+            [Input('metrics-version', 'data')]
         )
-        def update_dashboard(n):
-            # Update metrics
-            metrics = self.data_store.get('metrics', {})
-            daily_volume = f"{metrics.get('daily_volume_krw', 0):,.0f} KRW"
-            daily_profit = f"{metrics.get('net_profit_krw', 0):,.0f} KRW"
-            success_rate = f"{metrics.get('success_rate', 0):.1f}%"
-            active_trades = str(metrics.get('active_trades', 0))
+        def update_metrics(version):
+            return self._render_section('metrics', self._render_metrics)
             
-            # Create premium chart
-            premium_data = self.data_store.get('premiums', [])
-            if premium_data:
-                df = pd.DataFrame(premium_data)
-                fig = go.Figure()
+        @self.app.callback(
+            [Output('premium-chart', 'figure'),
+             Output('premium-cursor', 'data'),
+             Output('premiums-version', 'data', allow_duplicate=True)],
+            [Input('premiums-version', 'data')],
+            [State('premium-cursor', 'data')],
+            prevent_initial_call=True
+        )
+        def update_premium_chart(version, cursor):
+            # Single-flight: skip instead of queueing behind a slow render.
+            # The lock is shared by every client, so a skipped client's
+            # version is cleared and its next poll retries the render
+            if not self._update_lock.acquire(blocking=False):
+                return dash.no_update, dash.no_update, None
+            try:
+                # Incremental when the client already has the chart
+                return (*self._update_premium_chart(cursor), dash.no_update)
+            finally:
+                self._update_lock.release()
                 
-                for coin in df['coin'].unique():
-                    coin_data = df[df['coin'] == coin]
-                    fig.add_trace(go.Scatter(
-                        x=coin_data['timestamp'],
-                        y=coin_data['premium_rate'],
-                        mode='lines',
-                        name=f'{coin} Premium'
-                    ))
-                    
-                fig.update_layout(
-                    title='실시간 프리미엄 추이',
-                    xaxis_title='시간',
-                    yaxis_title='프리미엄 (%)',
-                    hovermode='x unified'
-                )
-            else:
-                fig = go.Figure()
-                fig.update_layout(title='프리미엄 데이터 대기중...')
+        # Balances and recent trades are sent raw and rendered in the browser
+        @self.app.callback(
+            Output('balances-store', 'data'),
+            [Input('balances-version', 'data')]
+        )
+        def update_balances(version):
+            return self.data_store.get('balances', {})
+            
+        @self.app.callback(
+            Output('trades-store', 'data'),
+            [Input('trades-version', 'data')]
+        )
+        def update_trades(version):
+            return self._render_section('trades', self._render_trades)
+            
+        @self.app.callback(
+            Output('alerts-section', 'children'),
+            [Input('alerts-version', 'data')]
+        )
+        def update_alerts(version):
+            return self._render_section('alerts', self._render_alerts)
+            
+        self.app.clientside_callback(
+            _RENDER_BALANCES_JS,
+            Output('balance-info', 'children'),
+            Input('balances-store', 'data')
+        )
+        self.app.clientside_callback(
+            _RENDER_TRADES_JS,
+            Output('recent-trades', 'children'),
+            Input('trades-store', 'data')
+        )
+        
+    def _now_str(self) -> str:
+        """Local time as 'YYYY-MM-DD HH:MM:SS', formatted once per second"""
+        now = int(time.time())
+        cached = self._now_cache
+        if cached[0] != now:
+            tm = time.localtime(now)
+            cached = (now, f"{tm.tm_year}-{tm.tm_mon:02d}-{tm.tm_mday:02d} "
+                           f"{tm.tm_hour:02d}:{tm.tm_min:02d}:{tm.tm_sec:02d}")
+            self._now_cache = cached
+        return cached[1]
+        
+    def _render_section(self, section: str, render: Callable):
+        """Render a client-independent section, memoized per section version"""
+        version = self._versions[section]
+        cached = self._section_cache.get(section)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        rendered = render()
+        self._section_cache[section] = (version, rendered)
+        return rendered
+        
+    def _render_metrics(self) -> Tuple:
+        metrics = self.data_store.get('metrics', {})
+        return (_format_krw(metrics.get('daily_volume_krw', 0)),
+                _format_krw(metrics.get('net_profit_krw', 0)),
+                _format_percent(metrics.get('success_rate', 0)),
+                str(metrics.get('active_trades', 0)))
                 
-            # Update balances
-            balances = self.data_store.get('balances', {})
-            balance_items = []
-            for exchange, balance_data in balances.items():
-                for currency, amount in balance_data.items():
-                    balance_items.append(
-                        html.Div(f"{exchange} - {currency}: {amount:,.2f}", 
-                                className='balance-item')
-                    )
+    def _render_trades(self) -> List[Dict]:
+        return list(self.data_store['trades'][-10:][::-1])  # Last 10 trades
+        
+    def _render_alerts(self) -> List:
+        alerts = self.data_store['alerts'][-5:]  # Last 5 alerts
+        alert_items = []
+        for alert in alerts:
+            level = alert['level']
+            alert_class = _ALERT_CLASS.get(level) or f"alert alert-{level}"
+            alert_items.append(
+                html.Div(f"{alert['timestamp']} - {alert['message']}", 
+                        className=alert_class)
+            )
+        return alert_items
+        
+    def _update_premium_chart(self, cursor: Optional[Dict]) -> Tuple:
+        """Build the premium figure, or a Patch appending only unseen samples
+        
+        The cursor is kept per client in a dcc.Store and records the trace
+        order, how many samples of each coin were sent, and how many points
+        each client-side trace currently holds.
+        """
+        # Snapshot sample counts first; samples appended after this are
+        # picked up on the next update
+        premiums = [(coin, ring, ring.count)
+                    for coin, ring in self.data_store['premiums'].items()]
+        
+        if not premiums:
+            return go.Figure(layout=_EMPTY_LAYOUT), None
+            
+        # Rebuild from scratch for new clients, or when a client missed samples
+        # that were already evicted, or when its traces grew too long
+        rebuild = cursor is None
+        if not rebuild:
+            for coin, ring, count in premiums:
+                new = count - cursor['sent'].get(coin, 0)
+                if (new > PREMIUM_HISTORY_SIZE or
+                        cursor['shown'].get(coin, 0) + new > 2 * PREMIUM_HISTORY_SIZE):
+                    rebuild = True
+                    break
                     
-            # Update recent trades
-            trades = self.data_store.get('trades', [])[-10:]  # Last 10 trades
-            trade_items = []
-            for trade in reversed(trades):
-                status_color = '#27ae60' if trade['status'] == 'completed' else '#e74c3c'
-                trade_items.append(
-                    html.Div([
-                        html.Div(f"{trade['coin']} - {trade['direction']}", 
-                                style={'fontWeight': 'bold'}),
-                        html.Div(f"수익: {trade.get('profit_krw', 0):,.0f} KRW"),
-                        html.Div(f"상태: {trade['status']}", 
-                                style={'color': status_color})
-                    ], className='trade-item')
-                )
+        if rebuild:
+            traces = []
+            cursor = {'coins': [], 'sent': {}, 'shown': {}}
+            for coin, ring, count in premiums:
+                timestamps, rates = ring.slice(max(0, count - PREMIUM_HISTORY_SIZE), count)
+                if len(rates) > PREMIUM_CHART_POINTS:
+                    # Downsample; most points would land on the same pixel anyway
+                    index = _lttb_indices(timestamps.astype(np.float64), rates,
+                                          PREMIUM_CHART_POINTS)
+                    timestamps, rates = timestamps[index], rates[index]
+                traces.append(go.Scattergl(
+                    x=timestamps,
+                    y=rates,
+                    mode='lines',
+                    name=f'{coin} Premium'
+                ))
+                cursor['coins'].append(coin)
+                cursor['sent'][coin] = count
+                cursor['shown'][coin] = len(rates)
                 
-            # Update alerts
-            alerts = self.data_store.get('alerts', [])[-5:]  # Last 5 alerts
-            alert_items = []
-            for alert in alerts:
-                alert_class = f"alert alert-{alert['level']}"
-                alert_items.append(
-                    html.Div(f"{alert['timestamp']} - {alert['message']}", 
-                            className=alert_class)
-                )
+            return go.Figure(data=traces, layout=_PREMIUM_LAYOUT), cursor
+            
+        patched_fig = Patch()
+        changed = False
+        for coin, ring, count in premiums:
+            sent = cursor['sent'].get(coin, 0)
+            if count <= sent:
+                continue
+            timestamps, rates = ring.slice(sent, count)
+            x = timestamps.tolist()
+            y = rates.tolist()
+            
+            if coin in cursor['coins']:
+                index = cursor['coins'].index(coin)
+                patched_fig['data'][index]['x'].extend(x)
+                patched_fig['data'][index]['y'].extend(y)
+            else:
+                patched_fig['data'].append({
+                    'type': 'scattergl',
+                    'mode': 'lines',
+                    'name': f'{coin} Premium',
+                    'x': x,
+                    'y': y
+                })
+                cursor['coins'].append(coin)
                 
-            # Update timestamp
-            last_update = f"마지막 업데이트: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+            cursor['sent'][coin] = count
+            cursor['shown'][coin] = cursor['shown'].get(coin, 0) + len(y)
+            changed = True
             
-            return (daily_volume, daily_profit, success_rate, active_trades,
-                   fig, balance_items, trade_items, alert_items, last_update)
-                   
+        if not changed:
+            return dash.no_update, dash.no_update
+        return patched_fig, cursor
+        
     def update_data(self, data_type: str, data: any):
         """Update dashboard data"""
-        if data_type == 'premium':
-            self.data_store['premiums'].append(data)
-            # Keep only last 1000 entries
-            if len(self.data_store['premiums']) > 1000:
-                self.data_store['premiums'] = self.data_store['premiums'][-1000:]
-                
-        elif data_type == 'trade':
-            self.data_store['trades'].append(data)
-            if len(self.data_store['trades']) > 100:
-                self.data_store['trades'] = self.data_store['trades'][-100:]
+        with self._publish_lock:
+            if data_type == 'premium':
+                coin = data['coin']
+                ring = self.data_store['premiums'].get(coin)
+                if ring is None:
+                    ring = _PremiumRing(PREMIUM_HISTORY_SIZE)
+                    # Copy-on-write so readers can iterate the coins unlocked
+                    self.data_store['premiums'] = {**self.data_store['premiums'], coin: ring}
+                ring.append(data['timestamp'], data['premium_rate'])
+                    
+            elif data_type == 'trade':
+                self._trades.append(data)
+                self.data_store['trades'] = tuple(self._trades)
+                    
+            elif data_type in ('metrics', 'balances'):
+                # These are re-sent every cycle; an unchanged copy leaves the
+                # version alone so no client re-renders it
+                if data == self.data_store[data_type]:
+                    return
+                self.data_store[data_type] = dict(data)
                 
-        elif data_type == 'metrics':
-            self.data_store['metrics'] = data
-            
-        elif data_type == 'balances':
-            self.data_store['balances'] = data
-            
-        elif data_type == 'alert':
-            self.data_store['alerts'].append({
-                'timestamp': datetime.now().strftime('%H:%M:%S'),
-                'level': data.get('level', 'warning'),
-                'message': data.get('message', '')
-            })
-            if len(self.data_store['alerts']) > 20:
-                self.data_store['alerts'] = self.data_store['alerts'][-20:]
+            elif data_type == 'alert':
+                self._alerts.append({
+                    'timestamp': self._now_str()[11:],  # HH:MM:SS
+                    'level': data.get('level', 'warning'),
+                    'message': data.get('message', '')
+                })
+                self.data_store['alerts'] = tuple(self._alerts)
+                    
+            # Publish after the data is in place so a poll never sees a version
+            # whose data is not stored yet
+            section = _SECTION_OF.get(data_type)
+            if section is not None:
+                self._versions[section] += 1
                 
     def run(self, debug: bool = False):
-        """Run the dashboard"""
-        self.app.run_server(debug=debug, port=self.port, host='0.0.0.0')
\ No newline at end of file
+        """Run the dashboard
+        
+        Serves one worker thread per request in this process; the data fed
+        through update_data lives here, so it cannot be split across worker
+        processes. The reloader is off since this runs outside the main thread.
+        """
+        self.app.run(debug=debug, port=self.port, host='0.0.0.0',
+                     threaded=True, use_reloader=False)
\ No newline at end of file
@@ -1,5 +1,7 @@
 """Simulation module for paper trading"""
-from .virtual_balance_manager import VirtualBalanceManager, SimulatedTrade, SimulatedTransfer
+from .virtual_balance_manager import (
+    VirtualBalanceManager, SimulatedTrade, SimulatedTransfer, TradeSpec, TransferSpec
+)
 from .mock_exchange_clients import MockBinanceClient, MockUpbitClient
 from .performance_analyzer import PerformanceAnalyzer, PerformanceMetrics
 
@@ -7,6 +9,8 @@ __all__ = [
     "VirtualBalanceManager",
     "SimulatedTrade", 
     "SimulatedTransfer",
+    "TradeSpec",
+    "TransferSpec",
     "MockBinanceClient",
     "MockUpbitClient",
     "PerformanceAnalyzer",
@@ -1,13 +1,228 @@
 """Mock exchange clients for paper trading simulation"""
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from decimal import Decimal
-from datetime import datetime
-import asyncio
+import time
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
+import numpy as np
 from loguru import logger
 
 from src.simulation.virtual_balance_manager import VirtualBalanceManager, SimulatedTrade
 
 
+# How long a fetched ticker price / order book is reused (seconds)
+QUOTE_CACHE_TTL = 0.5
+# How long exchange market lists are reused (seconds)
+MARKETS_CACHE_TTL = 60
+# Market orders within this fraction of the depth last seen at the best
+# level fill at that level's price without fetching the order book
+SMALL_ORDER_DEPTH_FRACTION = 0.5
+
+# Fixed network fees charged on simulated withdrawals
+_NETWORK_FEES: Dict[str, Decimal] = {
+    "BTC": Decimal("0.0005"),
+    "ETH": Decimal("0.005"),
+    "XRP": Decimal("0.25"),
+    "USDT": Decimal("1.0")
+}
+_DEFAULT_NETWORK_FEE = Decimal("1.0")
+
+# Address substrings that identify the destination exchange of a simulated
+# withdrawal, per sending exchange; anything else goes "external"
+_BINANCE_ADDR_ROUTING = (("upbit", "upbit"),)
+_UPBIT_ADDR_ROUTING = (("binance", "binance"),)
+
+
+def _route_address(address: str, routing: Tuple[Tuple[str, str], ...]) -> str:
+    """Destination exchange for a withdrawal address"""
+    addr = address.casefold()
+    return next((exchange for marker, exchange in routing if marker in addr), "external")
+
+# Returned by get_balance for assets with no virtual balance; read-only so
+# one instance can be shared
+_ZERO_BALANCE = MappingProxyType({"free": Decimal("0"), "locked": Decimal("0"), "total": Decimal("0")})
+
+# Shared pool for overlapping the ticker and order book REST calls of a
+# simulated market order
+_io_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="mock-quotes")
+
+
+
+@lru_cache(maxsize=64)
+def _mock_deposit_address(exchange_name: str, coin: str, network: Optional[str]) -> MappingProxyType:
+    """Read-only Binance-style deposit address for a coin"""
+    return MappingProxyType({
+        "address": f"MOCK_{exchange_name}_{coin}_ADDRESS",
+        "tag": None,
+        "coin": coin,
+        "network": network or "MOCK_NETWORK"
+    })
+
+
+@lru_cache(maxsize=64)
+def _mock_upbit_deposit_address(exchange_name: str, currency: str) -> MappingProxyType:
+    """Read-only Upbit-style deposit address for a currency"""
+    return MappingProxyType({
+        "currency": currency,
+        "deposit_address": f"MOCK_{exchange_name}_{currency}_ADDRESS",
+        "secondary_address": None
+    })
+
+
+def _vwap_for_quantity(prices: np.ndarray, sizes: np.ndarray, quantity: float,
+                       default_price: float) -> float:
+    """Average fill price for `quantity` walking the book levels in order
+    
+    Any quantity beyond the listed depth fills at default_price.
+    """
+    remaining = quantity
+    cost = 0.0
+    for price, size in zip(prices, sizes):
+        if remaining <= size:
+            return (cost + remaining * price) / quantity
+        cost += size * price
+        remaining -= size
+    # Not enough liquidity, use last price for remaining
+    return (cost + remaining * default_price) / quantity
+
+
+def _vwap_for_amount(prices: np.ndarray, sizes: np.ndarray, amount: float) -> float:
+    """Average fill price spending `amount` of quote currency down the book
+    
+    Returns 0.0 when the book has no liquidity at all.
+    """
+    cost = 0.0
+    volume = 0.0
+    for price, size in zip(prices, sizes):
+        level_cost = price * size
+        if cost + level_cost <= amount:
+            cost += level_cost
+            volume += size
+        else:
+            # Partial fill of this level
+            volume += (amount - cost) / price
+            cost = amount
+            break
+    return cost / volume if volume > 0 else 0.0
+
+
+# The book walks are plain scalar loops over float64 arrays so Numba can
+# compile them to native code when it is installed; without it they run as
+# ordinary Python, which iterates lists of floats much faster than arrays
+try:
+    from numba import njit
+except ImportError:
+    _walk_quantity = _vwap_for_quantity
+    _walk_amount = _vwap_for_amount
+    
+    def _vwap_for_quantity(prices, sizes, quantity, default_price):
+        return _walk_quantity(prices.tolist(), sizes.tolist(), quantity, default_price)
+        
+    def _vwap_for_amount(prices, sizes, amount):
+        return _walk_amount(prices.tolist(), sizes.tolist(), amount)
+else:
+    _vwap_for_quantity = njit(cache=True)(_vwap_for_quantity)
+    _vwap_for_amount = njit(cache=True)(_vwap_for_amount)
+    # Compile once at import rather than on the first simulated order
+    _vwap_for_quantity(np.ones(1), np.ones(1), 1.0, 1.0)
+    _vwap_for_amount(np.ones(1), np.ones(1), 1.0)
+
+
+def _to_decimal(value: float) -> Decimal:
+    """Decimal of a float price, via its shortest round-trip repr
+    
+    Order books are converted to floats once when parsed, so this is the
+    only Decimal construction left per simulated fill.
+    """
+    return Decimal(str(value))
+
+
+def _binance_levels(orders: List[List]) -> Tuple[np.ndarray, np.ndarray]:
+    """Prices and sizes of Binance [price, quantity] rows"""
+    count = len(orders)
+    prices = np.fromiter((float(order[0]) for order in orders), dtype=np.float64, count=count)
+    sizes = np.fromiter((float(order[1]) for order in orders), dtype=np.float64, count=count)
+    return prices, sizes
+
+
+def _upbit_side(prices: np.ndarray, sizes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Drop the empty levels of one side of an Upbit order book"""
+    nonempty = (prices != 0) & (sizes != 0)
+    return prices[nonempty], sizes[nonempty]
+
+
+@dataclass(frozen=True)
+class ParsedOrderBook:
+    """Order book converted once into per-side float arrays
+    
+    Parsed at fetch time and cached alongside the raw book, so buy and
+    sell simulations on the same tick walk the arrays without re-reading
+    the exchange rows.
+    """
+    ask_prices: np.ndarray
+    ask_sizes: np.ndarray
+    bid_prices: np.ndarray
+    bid_sizes: np.ndarray
+    
+    @classmethod
+    def from_binance(cls, order_book: Optional[Dict]) -> "ParsedOrderBook":
+        order_book = order_book or {}
+        ask_prices, ask_sizes = _binance_levels(order_book.get("asks", []))
+        bid_prices, bid_sizes = _binance_levels(order_book.get("bids", []))
+        return cls(ask_prices, ask_sizes, bid_prices, bid_sizes)
+        
+    @classmethod
+    def from_upbit(cls, order_book: Optional[Dict]) -> "ParsedOrderBook":
+        units = (order_book or {}).get("orderbook_units", [])
+        # One pass over the units reads both sides of every level
+        levels = np.array(
+            [(unit.get("ask_price", 0), unit.get("ask_size", 0),
+              unit.get("bid_price", 0), unit.get("bid_size", 0)) for unit in units],
+            dtype=np.float64).reshape(-1, 4)
+        ask_prices, ask_sizes = _upbit_side(levels[:, 0], levels[:, 1])
+        bid_prices, bid_sizes = _upbit_side(levels[:, 2], levels[:, 3])
+        return cls(ask_prices, ask_sizes, bid_prices, bid_sizes)
+
+
+class _QuoteCache:
+    """Short-lived memo of real-API lookups, keyed by call arguments
+    
+    Orders simulated within one strategy tick see the same quotes, so
+    repeated lookups for a symbol cost one REST call instead of one each.
+    The best level of each fetched book is kept here too (put/peek), so it
+    expires with the book. Market lists use the same memo with a longer TTL.
+    """
+    
+    def __init__(self, ttl: float = QUOTE_CACHE_TTL):
+        self.ttl = ttl
+        self._entries: Dict[Tuple, Tuple[float, object]] = {}
+        
+    def get(self, key: Tuple, fetch: Callable[[], object]):
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and now - entry[0] < self.ttl:
+            return entry[1]
+        value = fetch()
+        if value is not None:
+            self._entries[key] = (now, value)
+        return value
+        
+    def peek(self, key: Tuple):
+        """Cached value if still fresh, else None; never fetches"""
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] < self.ttl:
+            return entry[1]
+        return None
+        
+    def put(self, key: Tuple, value):
+        self._entries[key] = (time.monotonic(), value)
+        
+    def clear(self):
+        self._entries.clear()
+
+
 class MockBinanceClient:
     """Mock Binance client for paper trading"""
     
@@ -23,6 +238,19 @@ class MockBinanceClient:
         self.balance_manager = balance_manager
         self.exchange_name = "binance"
         self.trading_fee = Decimal("0.001")  # 0.1% default fee
+        fee_bps = str(self.trading_fee * 1000)  # Basis points, as reported
+        self._trading_fees = (MappingProxyType({
+            "symbol": "BTCUSDT",
+            "makerCommission": fee_bps,
+            "takerCommission": fee_bps
+        }),)
+        self._quote_cache = _QuoteCache()
+        self._markets_cache = _QuoteCache(MARKETS_CACHE_TTL)
+        
+    def clear_cache(self):
+        """Drop cached ticker prices, order books, best levels and market lists"""
+        self._quote_cache.clear()
+        self._markets_cache.clear()
         
     def get_balance(self, asset: str) -> Dict[str, Decimal]:
         """Get virtual balance for an asset"""
@@ -33,35 +261,77 @@ class MockBinanceClient:
                 "locked": balance.locked,
                 "total": balance.total
             }
-        return {"free": Decimal("0"), "locked": Decimal("0"), "total": Decimal("0")}
+        return _ZERO_BALANCE
+        
+    def get_balances(self) -> Dict[str, Dict[str, Decimal]]:
+        """Get virtual balances for every asset"""
+        balances = self.balance_manager.balances.get(self.exchange_name, {})
+        return {
+            balance.asset: {
+                "free": balance.available,
+                "locked": balance.locked,
+                "total": balance.total
+            }
+            for balance in list(balances.values())
+        }
         
     def get_ticker_price(self, symbol: str) -> Optional[Decimal]:
-        """Get real ticker price from actual API"""
-        return self.real_client.get_ticker_price(symbol)
+        """Get real ticker price from actual API (briefly cached)"""
+        return self._quote_cache.get(
+            ("ticker", symbol), lambda: self.real_client.get_ticker_price(symbol))
         
     def get_order_book(self, symbol: str, limit: int = 5) -> Dict:
-        """Get real order book from actual API"""
-        return self.real_client.get_order_book(symbol, limit)
-        
-    def place_market_order(self, symbol: str, side: str, quantity: Decimal) -> Dict:
-        """Simulate market order"""
-        # Get current price
-        price = self.get_ticker_price(symbol)
-        if not price:
-            raise Exception(f"Could not get price for {symbol}")
-            
-        # Get order book for slippage simulation
-        order_book = self.get_order_book(symbol, limit=10)
-        
-        # Calculate execution price with slippage
-        if side.upper() == "BUY":
-            # For buy orders, use ask prices
-            asks = order_book.get("asks", [])
-            exec_price = self._calculate_execution_price(asks, quantity, price)
+        """Get real order book from actual API (briefly cached)"""
+        return self._quote_cache.get(
+            ("order_book", symbol, limit),
+            lambda: self.real_client.get_order_book(symbol, limit))
+        
+    def _get_parsed_order_book(self, symbol: str, limit: int) -> ParsedOrderBook:
+        """Order book as float arrays, cached for as long as the raw book"""
+        return self._quote_cache.get(
+            ("parsed_order_book", symbol, limit),
+            lambda: ParsedOrderBook.from_binance(self.get_order_book(symbol, limit)))
+        
+    def quote_market_order(self, symbol: str, side: str, quantity: Decimal) -> Decimal:
+        """Execution price a market order would get, from real market data
+        
+        Blocks on REST calls unless the quotes are cached; the strategies
+        run it on an executor and pass the result to place_market_order.
+        """
+        is_buy = side.upper() == "BUY"
+        # (best price, depth) of the level this order would hit, as of the
+        # last book fetched within the quote TTL
+        top = self._quote_cache.peek(("top", symbol, is_buy))
+        if top is not None and float(quantity) <= top[1] * SMALL_ORDER_DEPTH_FRACTION:
+            # Small order: fills at the best bid/ask, no need for the order book
+            exec_price = top[0]
         else:
-            # For sell orders, use bid prices
-            bids = order_book.get("bids", [])
-            exec_price = self._calculate_execution_price(bids, quantity, price)
+            # Fetch current price and order book (for slippage) concurrently
+            price_future = _io_pool.submit(self.get_ticker_price, symbol)
+            order_book_future = _io_pool.submit(self._get_parsed_order_book, symbol, 10)
+            
+            price = price_future.result()
+            if not price:
+                raise Exception(f"Could not get price for {symbol}")
+            book = order_book_future.result()
+            
+            # Calculate execution price with slippage: buys walk the asks,
+            # sells walk the bids
+            if is_buy:
+                prices, sizes = book.ask_prices, book.ask_sizes
+            else:
+                prices, sizes = book.bid_prices, book.bid_sizes
+            exec_price = self._calculate_execution_price(prices, sizes, quantity, price)
+            if len(sizes):
+                self._quote_cache.put(("top", symbol, is_buy),
+                                      (_to_decimal(prices[0]), float(sizes[0])))
+        return exec_price
+        
+    def place_market_order(self, symbol: str, side: str, quantity: Decimal,
+                           exec_price: Optional[Decimal] = None) -> Dict:
+        """Simulate market order, at exec_price if already quoted"""
+        if exec_price is None:
+            exec_price = self.quote_market_order(symbol, side, quantity)
             
         # Execute simulated trade
         trade = self.balance_manager.execute_trade(
@@ -75,17 +345,18 @@ class MockBinanceClient:
         )
         
         if trade:
+            quantity_str = str(quantity)
             return {
                 "orderId": trade.trade_id,
                 "symbol": symbol,
                 "side": side,
                 "type": "MARKET",
-                "executedQty": str(quantity),
+                "executedQty": quantity_str,
                 "cummulativeQuoteQty": str(trade.total_cost),
                 "status": "FILLED",
                 "fills": [{
                     "price": str(exec_price),
-                    "qty": str(quantity),
+                    "qty": quantity_str,
                     "commission": str(trade.fee),
                     "commissionAsset": trade.fee_asset
                 }]
@@ -120,31 +391,17 @@ class MockBinanceClient:
             raise Exception("Failed to execute simulated trade")
             
     def get_deposit_address(self, coin: str, network: str = None) -> Dict:
-        """Return mock deposit address"""
-        return {
-            "address": f"MOCK_{self.exchange_name}_{coin}_ADDRESS",
-            "tag": None,
-            "coin": coin,
-            "network": network or "MOCK_NETWORK"
-        }
+        """Return mock deposit address (read-only, shared between calls)"""
+        return _mock_deposit_address(self.exchange_name, coin, network)
         
     def withdraw(self, coin: str, address: str, amount: Decimal, 
                       network: str = None, tag: str = None) -> Dict:
         """Simulate withdrawal (transfer)"""
         # Determine destination exchange from address
-        if "upbit" in address.lower():
-            to_exchange = "upbit"
-        else:
-            to_exchange = "external"
-            
+        to_exchange = _route_address(address, _BINANCE_ADDR_ROUTING)
+        
         # Use a fixed network fee for simulation
-        network_fees = {
-            "BTC": Decimal("0.0005"),
-            "ETH": Decimal("0.005"),
-            "XRP": Decimal("0.25"),
-            "USDT": Decimal("1.0")
-        }
-        network_fee = network_fees.get(coin, Decimal("1.0"))
+        network_fee = _NETWORK_FEES.get(coin, _DEFAULT_NETWORK_FEE)
         
         transfer = self.balance_manager.simulate_transfer(
             asset=coin,
@@ -166,89 +423,47 @@ class MockBinanceClient:
             
     def get_withdraw_history(self, coin: str = None, limit: int = 10) -> List[Dict]:
         """Get simulated withdrawal history"""
-        transfers = self.balance_manager.get_transfer_history(limit=limit)
-        history = []
-        
-        for transfer in transfers:
-            if transfer.from_exchange == self.exchange_name:
-                if coin and transfer.asset != coin:
-                    continue
-                    
-                history.append({
-                    "id": transfer.transfer_id,
-                    "amount": str(transfer.amount),
-                    "transactionFee": str(transfer.fee),
-                    "coin": transfer.asset,
-                    "status": 6 if transfer.status == "completed" else 2,  # 6=Success, 2=Processing
-                    "address": f"MOCK_{transfer.to_exchange}_ADDRESS",
-                    "applyTime": transfer.timestamp.isoformat()
-                })
-                
-        return history
+        transfers = self.balance_manager.get_transfer_history(
+            limit=limit, from_exchange=self.exchange_name, asset=coin or None
+        )
+        return [{
+            "id": transfer.transfer_id,
+            "amount": str(transfer.amount),
+            "transactionFee": str(transfer.fee),
+            "coin": transfer.asset,
+            "status": 6 if transfer.status == "completed" else 2,  # 6=Success, 2=Processing
+            "address": f"MOCK_{transfer.to_exchange}_ADDRESS",
+            "applyTime": transfer.timestamp.isoformat()
+        } for transfer in transfers]
         
     def get_trading_fees(self) -> List[Dict]:
-        """Get trading fee structure"""
-        return [{
-            "symbol": "BTCUSDT",
-            "makerCommission": str(self.trading_fee * 1000),  # Convert to basis points
-            "takerCommission": str(self.trading_fee * 1000)
-        }]
+        """Get trading fee structure (entries are read-only, built once)"""
+        return list(self._trading_fees)
         
     async def get_24hr_stats(self, symbol: str) -> Dict:
         """Get real 24hr stats from actual API"""
         return await self.real_client.get_24hr_stats(symbol)
         
-    def get_usdt_markets(self) -> List[str]:
-        """Get real USDT markets from actual API"""
-        return self.real_client.get_usdt_markets()
+    async def get_24hr_stats_batch(self, symbols: List[str]) -> List[Dict]:
+        """Get real 24hr stats for several symbols at once"""
+        return await self.real_client.get_24hr_stats_batch(symbols)
         
-    def withdraw(self, coin: str, address: str, amount: Decimal, 
-                network: str = None, tag: str = None) -> Dict:
-        """Simulate withdrawal (instant for paper trading)"""
-        # In paper trading, we'll handle the actual transfer in the strategy
-        return {
-            "id": f"MOCK_WITHDRAWAL_{self.exchange_name}_{datetime.now().timestamp()}",
-            "coin": coin,
-            "amount": str(amount),
-            "address": address,
-            "network": network,
-            "status": "processing"
-        }
-        
-    def get_deposit_address(self, coin: str, network: str = None) -> Dict:
-        """Get mock deposit address"""
-        return {
-            "address": f"MOCK_{self.exchange_name}_{coin}_ADDRESS",
-            "tag": f"MOCK_TAG_{coin}" if coin in ["XRP", "XLM"] else None,
-            "coin": coin,
-            "network": network
-        }
+    def get_usdt_markets(self) -> List[str]:
+        """Get real USDT markets from actual API (cached for a minute)"""
+        return self._markets_cache.get(("usdt_markets",), self.real_client.get_usdt_markets)
         
-    def _calculate_execution_price(self, orders: List[List], quantity: Decimal, 
-                                  default_price: Decimal) -> Decimal:
+    def _calculate_execution_price(self, prices: np.ndarray, sizes: np.ndarray,
+                                  quantity: Decimal, default_price: Decimal) -> Decimal:
         """Calculate execution price considering order book depth"""
-        if not orders:
+        if not len(prices):
             return default_price
             
-        remaining_qty = quantity
-        total_cost = Decimal("0")
-        
-        for order in orders:
-            price = Decimal(order[0])
-            available_qty = Decimal(order[1])
-            
-            if remaining_qty <= available_qty:
-                total_cost += remaining_qty * price
-                break
-            else:
-                total_cost += available_qty * price
-                remaining_qty -= available_qty
-                
-        if remaining_qty > 0:
-            # Not enough liquidity, use last price for remaining
-            total_cost += remaining_qty * default_price
+        # Small orders usually fill entirely at the best level
+        if sizes[0] >= float(quantity):
+            return _to_decimal(prices[0])
             
-        return total_cost / quantity
+        exec_price = _vwap_for_quantity(prices, sizes, float(quantity), float(default_price))
+        return _to_decimal(exec_price)
 
 
 class MockUpbitClient:
@@ -266,6 +481,13 @@ class MockUpbitClient:
         self.balance_manager = balance_manager
         self.exchange_name = "upbit"
         self.trading_fee = Decimal("0.0005")  # 0.05% fee
+        self._quote_cache = _QuoteCache()
+        self._markets_cache = _QuoteCache(MARKETS_CACHE_TTL)
+        
+    def clear_cache(self):
+        """Drop cached ticker prices, order books, best levels and market lists"""
+        self._quote_cache.clear()
+        self._markets_cache.clear()
         
     def get_balance(self, ticker: str = None) -> Dict[str, Decimal]:
         """Get virtual balance for a specific ticker"""
@@ -277,35 +499,74 @@ class MockUpbitClient:
                     "locked": balance.locked,
                     "total": balance.total
                 }
-        return {"free": Decimal("0"), "locked": Decimal("0"), "total": Decimal("0")}
+        return _ZERO_BALANCE
+        
+    def get_balances(self) -> Dict[str, Dict[str, Decimal]]:
+        """Get virtual balances for every asset"""
+        balances = self.balance_manager.balances.get(self.exchange_name, {})
+        return {
+            balance.asset: {
+                "free": balance.available,
+                "locked": balance.locked,
+                "total": balance.total
+            }
+            for balance in list(balances.values())
+        }
         
     def get_ticker_price(self, ticker: str) -> Optional[Decimal]:
-        """Get real ticker price from actual API"""
-        return self.real_client.get_ticker_price(ticker)
+        """Get real ticker price from actual API (briefly cached)"""
+        return self._quote_cache.get(
+            ("ticker", ticker), lambda: self.real_client.get_ticker_price(ticker))
         
     def get_orderbook(self, ticker: str) -> Dict:
-        """Get real order book from actual API"""
-        return self.real_client.get_orderbook(ticker)
-        
-    def place_market_buy_order(self, ticker: str, amount_krw: Decimal) -> Dict:
-        """Simulate market buy order with KRW amount"""
-        # Get current price
-        price = self.get_ticker_price(ticker)
-        if not price:
-            raise Exception(f"Could not get price for {ticker}")
-            
-        # Calculate quantity
-        quantity = amount_krw / price
+        """Get real order book from actual API (briefly cached)"""
+        return self._quote_cache.get(
+            ("orderbook", ticker), lambda: self.real_client.get_orderbook(ticker))
         
-        # Get order book for slippage
-        order_book = self.get_orderbook(ticker)
-        asks = order_book.get("orderbook_units", [])
+    def _get_parsed_orderbook(self, ticker: str) -> ParsedOrderBook:
+        """Order book as float arrays, cached for as long as the raw book"""
+        return self._quote_cache.get(
+            ("parsed_orderbook", ticker),
+            lambda: ParsedOrderBook.from_upbit(self.get_orderbook(ticker)))
         
-        # Calculate execution price
-        exec_price = self._calculate_execution_price_krw(
-            asks, amount_krw, price, is_buy=True
-        )
+    def quote_market_buy_order(self, ticker: str, amount_krw: Decimal) -> Decimal:
+        """Execution price a KRW-amount market buy would get, from real market data
         
+        Blocks on REST calls unless the quotes are cached; the strategies
+        run it on an executor and pass the result to place_market_buy_order.
+        """
+        # (best ask, its depth in KRW) as of the last book fetched within
+        # the quote TTL
+        top = self._quote_cache.peek(("top", ticker, True))
+        if top is not None and float(amount_krw) <= top[1] * SMALL_ORDER_DEPTH_FRACTION:
+            # Small order: fills at the best ask, no need for the order book
+            exec_price = top[0]
+        else:
+            # Fetch current price and order book (for slippage) concurrently
+            price_future = _io_pool.submit(self.get_ticker_price, ticker)
+            order_book_future = _io_pool.submit(self._get_parsed_orderbook, ticker)
+            
+            price = price_future.result()
+            if not price:
+                raise Exception(f"Could not get price for {ticker}")
+            book = order_book_future.result()
+            
+            # Calculate execution price
+            exec_price = self._calculate_execution_price_krw(
+                book.ask_prices, book.ask_sizes, amount_krw, price
+            )
+            if len(book.ask_sizes):
+                self._quote_cache.put(("top", ticker, True),
+                                      (_to_decimal(book.ask_prices[0]),
+                                       float(book.ask_prices[0] * book.ask_sizes[0])))
+        return exec_price
+        
+    def place_market_buy_order(self, ticker: str, amount_krw: Decimal,
+                               exec_price: Optional[Decimal] = None) -> Dict:
+        """Simulate market buy order with KRW amount, at exec_price if already quoted"""
+        if exec_price is None:
+            exec_price = self.quote_market_buy_order(ticker, amount_krw)
+            
         # Recalculate actual quantity with execution price
         actual_quantity = amount_krw / exec_price
         
@@ -321,6 +582,7 @@ class MockUpbitClient:
         )
         
         if trade:
+            quantity_str = str(actual_quantity)
             return {
                 "uuid": trade.trade_id,
                 "side": "bid",
@@ -330,12 +592,12 @@ class MockUpbitClient:
                 "market": ticker,
                 "created_at": trade.timestamp.isoformat(),
                 "volume": None,
-                "executed_volume": str(actual_quantity),
+                "executed_volume": quantity_str,
                 "trades_count": 1,
                 "trades": [{
                     "market": ticker,
                     "price": str(exec_price),
-                    "volume": str(actual_quantity),
+                    "volume": quantity_str,
                     "funds": str(trade.total_cost),
                     "side": "bid"
                 }]
@@ -343,22 +605,42 @@ class MockUpbitClient:
         else:
             raise Exception("Failed to execute simulated trade")
             
-    def place_market_sell_order(self, ticker: str, volume: Decimal) -> Dict:
-        """Simulate market sell order"""
-        # Get current price
-        price = self.get_ticker_price(ticker)
-        if not price:
-            raise Exception(f"Could not get price for {ticker}")
-            
-        # Get order book for slippage
-        order_book = self.get_orderbook(ticker)
-        bids = order_book.get("orderbook_units", [])
-        
-        # Calculate execution price
-        exec_price = self._calculate_execution_price_volume(
-            bids, volume, price, is_buy=False
-        )
+    def quote_market_sell_order(self, ticker: str, volume: Decimal) -> Decimal:
+        """Execution price a market sell would get, from real market data
         
+        Blocks on REST calls unless the quotes are cached; the strategies
+        run it on an executor and pass the result to place_market_sell_order.
+        """
+        # (best bid, its depth) as of the last book fetched within the quote TTL
+        top = self._quote_cache.peek(("top", ticker, False))
+        if top is not None and float(volume) <= top[1] * SMALL_ORDER_DEPTH_FRACTION:
+            # Small order: fills at the best bid, no need for the order book
+            exec_price = top[0]
+        else:
+            # Fetch current price and order book (for slippage) concurrently
+            price_future = _io_pool.submit(self.get_ticker_price, ticker)
+            order_book_future = _io_pool.submit(self._get_parsed_orderbook, ticker)
+            
+            price = price_future.result()
+            if not price:
+                raise Exception(f"Could not get price for {ticker}")
+            book = order_book_future.result()
+            
+            # Calculate execution price
+            exec_price = self._calculate_execution_price_volume(
+                book.bid_prices, book.bid_sizes, volume, price
+            )
+            if len(book.bid_sizes):
+                self._quote_cache.put(("top", ticker, False),
+                                      (_to_decimal(book.bid_prices[0]), float(book.bid_sizes[0])))
+        return exec_price
+        
+    def place_market_sell_order(self, ticker: str, volume: Decimal,
+                                exec_price: Optional[Decimal] = None) -> Dict:
+        """Simulate market sell order, at exec_price if already quoted"""
+        if exec_price is None:
+            exec_price = self.quote_market_sell_order(ticker, volume)
+            
         # Execute simulated trade
         trade = self.balance_manager.execute_trade(
             exchange=self.exchange_name,
@@ -371,6 +653,7 @@ class MockUpbitClient:
         )
         
         if trade:
+            volume_str = str(volume)
             return {
                 "uuid": trade.trade_id,
                 "side": "ask",
@@ -378,14 +661,14 @@ class MockUpbitClient:
                 "state": "done",
                 "market": ticker,
                 "created_at": trade.timestamp.isoformat(),
-                "volume": str(volume),
-                "executed_volume": str(volume),
+                "volume": volume_str,
+                "executed_volume": volume_str,
                 "price": None,
                 "trades_count": 1,
                 "trades": [{
                     "market": ticker,
                     "price": str(exec_price),
-                    "volume": str(volume),
+                    "volume": volume_str,
                     "funds": str(trade.total_cost),
                     "side": "ask"
                 }]
@@ -446,30 +729,17 @@ class MockUpbitClient:
             raise Exception("Failed to execute simulated trade")
             
     def get_deposit_address(self, currency: str) -> List[Dict]:
-        """Return mock deposit address"""
-        return [{
-            "currency": currency,
-            "deposit_address": f"MOCK_{self.exchange_name}_{currency}_ADDRESS",
-            "secondary_address": None
-        }]
+        """Return mock deposit address (entries are read-only, shared between calls)"""
+        return [_mock_upbit_deposit_address(self.exchange_name, currency)]
         
     def withdraw(self, currency: str, amount: Decimal, address: str,
                       secondary_address: str = None, transaction_type: str = "default") -> Dict:
         """Simulate withdrawal"""
         # Determine destination exchange
-        if "binance" in address.lower():
-            to_exchange = "binance"
-        else:
-            to_exchange = "external"
-            
+        to_exchange = _route_address(address, _UPBIT_ADDR_ROUTING)
+        
         # Use fixed network fees
-        network_fees = {
-            "BTC": Decimal("0.0005"),
-            "ETH": Decimal("0.005"), 
-            "XRP": Decimal("0.25"),
-            "USDT": Decimal("1.0")
-        }
-        network_fee = network_fees.get(currency, Decimal("1.0"))
+        network_fee = _NETWORK_FEES.get(currency, _DEFAULT_NETWORK_FEE)
         
         transfer = self.balance_manager.simulate_transfer(
             asset=currency,
@@ -496,51 +766,37 @@ class MockUpbitClient:
             
     def get_withdraw_history(self, currency: str = None, limit: int = 10) -> List[Dict]:
         """Get simulated withdrawal history"""
-        transfers = self.balance_manager.get_transfer_history(limit=limit)
-        history = []
-        
-        for transfer in transfers:
-            if transfer.from_exchange == self.exchange_name:
-                if currency and transfer.asset != currency:
-                    continue
-                    
-                history.append({
-                    "type": "withdraw",
-                    "uuid": transfer.transfer_id,
-                    "currency": transfer.asset,
-                    "txid": f"MOCK_TXID_{transfer.transfer_id}",
-                    "state": "DONE" if transfer.status == "completed" else "PROCESSING",
-                    "created_at": transfer.timestamp.isoformat(),
-                    "done_at": transfer.timestamp.isoformat() if transfer.status == "completed" else None,
-                    "amount": str(transfer.amount),
-                    "fee": str(transfer.fee)
-                })
-                
-        return history
+        transfers = self.balance_manager.get_transfer_history(
+            limit=limit, from_exchange=self.exchange_name, asset=currency or None
+        )
+        return [{
+            "type": "withdraw",
+            "uuid": transfer.transfer_id,
+            "currency": transfer.asset,
+            "txid": f"MOCK_TXID_{transfer.transfer_id}",
+            "state": "DONE" if transfer.status == "completed" else "PROCESSING",
+            "created_at": transfer.timestamp.isoformat(),
+            "done_at": transfer.timestamp.isoformat() if transfer.status == "completed" else None,
+            "amount": str(transfer.amount),
+            "fee": str(transfer.fee)
+        } for transfer in transfers]
         
     def get_deposit_history(self, currency: str = None, limit: int = 10) -> List[Dict]:
         """Get simulated deposit history"""
-        transfers = self.balance_manager.get_transfer_history(limit=limit)
-        history = []
-        
-        for transfer in transfers:
-            if transfer.to_exchange == self.exchange_name:
-                if currency and transfer.asset != currency:
-                    continue
-                    
-                history.append({
-                    "type": "deposit",
-                    "uuid": f"DEPOSIT_{transfer.transfer_id}",
-                    "currency": transfer.asset,
-                    "txid": f"MOCK_TXID_{transfer.transfer_id}",
-                    "state": "ACCEPTED" if transfer.status == "completed" else "PROCESSING",
-                    "created_at": transfer.timestamp.isoformat(),
-                    "done_at": transfer.timestamp.isoformat() if transfer.status == "completed" else None,
-                    "amount": str(transfer.amount),
-                    "fee": "0"
-                })
-                
-        return history
+        transfers = self.balance_manager.get_transfer_history(
+            limit=limit, to_exchange=self.exchange_name, asset=currency or None
+        )
+        return [{
+            "type": "deposit",
+            "uuid": f"DEPOSIT_{transfer.transfer_id}",
+            "currency": transfer.asset,
+            "txid": f"MOCK_TXID_{transfer.transfer_id}",
+            "state": "ACCEPTED" if transfer.status == "completed" else "PROCESSING",
+            "created_at": transfer.timestamp.isoformat(),
+            "done_at": transfer.timestamp.isoformat() if transfer.status == "completed" else None,
+            "amount": str(transfer.amount),
+            "fee": "0"
+        } for transfer in transfers]
         
     def get_trading_fee(self, market: str) -> Decimal:
         """Get trading fee"""
@@ -550,81 +806,45 @@ class MockUpbitClient:
         """Get real 24hr stats from actual API"""
         return await self.real_client.get_24hr_stats(ticker)
         
+    async def get_24hr_stats_batch(self, tickers: List[str]) -> List[Dict]:
+        """Get real 24hr stats for several tickers at once"""
+        return await self.real_client.get_24hr_stats_batch(tickers)
+        
     def get_krw_markets(self) -> List[str]:
-        """Get real KRW markets from actual API"""
-        return self.real_client.get_krw_markets()
+        """Get real KRW markets from actual API (cached for a minute)"""
+        return self._markets_cache.get(("krw_markets",), self.real_client.get_krw_markets)
         
     def get_tradable_markets_with_binance(self, binance_usdt_markets: List[str]) -> List[str]:
-        """Get KRW markets that also exist on Binance"""
-        return self.real_client.get_tradable_markets_with_binance(binance_usdt_markets)
+        """Get KRW markets that also exist on Binance (cached for a minute)"""
+        return self._markets_cache.get(
+            ("tradable", frozenset(binance_usdt_markets)),
+            lambda: self.real_client.get_tradable_markets_with_binance(binance_usdt_markets))
         
-    def _calculate_execution_price_krw(self, orders: List[Dict], amount_krw: Decimal,
-                                      default_price: Decimal, is_buy: bool) -> Decimal:
+    def _calculate_execution_price_krw(self, prices: np.ndarray, sizes: np.ndarray,
+                                      amount_krw: Decimal, default_price: Decimal) -> Decimal:
         """Calculate execution price for KRW amount order"""
-        if not orders:
+        if not len(prices):
             return default_price
             
-        total_volume = Decimal("0")
-        total_cost = Decimal("0")
-        
-        for order in orders:
-            if is_buy:
-                price = Decimal(str(order.get("ask_price", 0)))
-                size = Decimal(str(order.get("ask_size", 0)))
-            else:
-                price = Decimal(str(order.get("bid_price", 0)))
-                size = Decimal(str(order.get("bid_size", 0)))
-                
-            if price == 0 or size == 0:
-                continue
-                
-            order_cost = price * size
+        # Small orders usually fill entirely at the best level
+        if prices[0] * sizes[0] >= float(amount_krw):
+            return _to_decimal(prices[0])
             
-            if total_cost + order_cost <= amount_krw:
-                total_cost += order_cost
-                total_volume += size
-            else:
-                # Partial fill of this order
-                remaining_krw = amount_krw - total_cost
-                partial_volume = remaining_krw / price
-                total_volume += partial_volume
-                total_cost = amount_krw
-                break
-                
-        if total_volume > 0:
-            return total_cost / total_volume
+        exec_price = _vwap_for_amount(prices, sizes, float(amount_krw))
+        if exec_price > 0:
+            return _to_decimal(exec_price)
         else:
             return default_price
             
-    def _calculate_execution_price_volume(self, orders: List[Dict], volume: Decimal,
-                                         default_price: Decimal, is_buy: bool) -> Decimal:
+    def _calculate_execution_price_volume(self, prices: np.ndarray, sizes: np.ndarray,
+                                         volume: Decimal, default_price: Decimal) -> Decimal:
         """Calculate execution price for volume order"""
-        if not orders:
+        if not len(prices):
             return default_price
             
-        remaining_volume = volume
-        total_cost = Decimal("0")
-        
-        for order in orders:
-            if is_buy:
-                price = Decimal(str(order.get("ask_price", 0)))
-                size = Decimal(str(order.get("ask_size", 0)))
-            else:
-                price = Decimal(str(order.get("bid_price", 0)))
-                size = Decimal(str(order.get("bid_size", 0)))
-                
-            if price == 0 or size == 0:
-                continue
-                
-            if remaining_volume <= size:
-                total_cost += remaining_volume * price
-                break
-            else:
-                total_cost += size * price
-                remaining_volume -= size
-                
-        if remaining_volume > 0:
-            # Not enough liquidity
-            total_cost += remaining_volume * default_price
+        # Small orders usually fill entirely at the best level
+        if sizes[0] >= float(volume):
+            return _to_decimal(prices[0])
             
-        return total_cost / volume
\ No newline at end of file
+        exec_price = _vwap_for_quantity(prices, sizes, float(volume), float(default_price))
+        return _to_decimal(exec_price)
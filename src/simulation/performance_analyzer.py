@@ -3,16 +3,103 @@ from typing import Dict, List, Optional, Tuple
 from decimal import Decimal
 from datetime import datetime, timedelta
 from dataclasses import dataclass
+from types import MappingProxyType
 import json
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
+import numpy as np
 from loguru import logger
 
-from src.simulation.virtual_balance_manager import SimulatedTrade, SimulatedTransfer
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
+from src.simulation.virtual_balance_manager import SimulatedTrade, SimulatedTransfer, from_minor_units
 
-@dataclass
+
+# Trades within this window of the first trade of a group belong to the
+# same arbitrage opportunity
+TRADE_GROUP_WINDOW = timedelta(minutes=5)
+# Transfers within this window of a group's first trade are attributed to it
+TRANSFER_MATCH_WINDOW = timedelta(minutes=10)
+# Number of recent analyze_performance results kept
+METRICS_CACHE_SIZE = 8
+
+
+def _risk_kernel(cumulative_returns: np.ndarray, initial: float) -> Tuple[float, float]:
+    """Annualized Sharpe ratio and max drawdown percentage of cumulative daily returns
+    
+    Sharpe uses the per-day returns (assuming 0% risk-free rate and 365
+    trading days); the drawdown peak starts at the initial capital.
+    """
+    values = initial * (1.0 + cumulative_returns)
+    peaks = np.maximum.accumulate(np.maximum(values, initial))
+    max_drawdown = float(((peaks - values) / peaks).max())
+    
+    sharpe = 0.0
+    if len(cumulative_returns) >= 2:
+        returns = np.diff(cumulative_returns, prepend=0.0)
+        std_dev = returns.std()
+        if std_dev != 0:
+            sharpe = float(returns.mean() * 365 ** 0.5 / std_dev)
+            
+    return sharpe, max_drawdown * 100.0
+
+
+def _risk_kernel_loop(cumulative_returns: np.ndarray, initial: float) -> Tuple[float, float]:
+    """Single-pass scalar form of _risk_kernel, for Numba to compile"""
+    n = len(cumulative_returns)
+    peak = initial
+    max_drawdown = 0.0
+    previous = 0.0
+    total = 0.0
+    for i in range(n):
+        value = initial * (1.0 + cumulative_returns[i])
+        if value > peak:
+            peak = value
+        else:
+            drawdown = (peak - value) / peak
+            if drawdown > max_drawdown:
+                max_drawdown = drawdown
+        total += cumulative_returns[i] - previous
+        previous = cumulative_returns[i]
+        
+    sharpe = 0.0
+    if n >= 2:
+        mean = total / n
+        variance = 0.0
+        previous = 0.0
+        for i in range(n):
+            deviation = cumulative_returns[i] - previous - mean
+            variance += deviation * deviation
+            previous = cumulative_returns[i]
+        std_dev = (variance / n) ** 0.5
+        if std_dev != 0:
+            sharpe = (mean * 365 ** 0.5) / std_dev
+            
+    return sharpe, max_drawdown * 100.0
+
+
+# Compiled, the scalar loop beats the NumPy version's temporaries; as plain
+# Python it is slower, so it only replaces the NumPy version under Numba
+try:
+    from numba import njit
+except ImportError:
+    pass
+else:
+    _risk_kernel = njit(cache=True)(_risk_kernel_loop)
+
+
+@dataclass(frozen=True)
 class PerformanceMetrics:
     """Performance metrics for paper trading"""
+    __slots__ = ("total_trades", "successful_trades", "failed_trades", "win_rate",
+                 "total_profit_krw", "total_fees_krw", "net_profit_krw",
+                 "average_profit_per_trade", "best_trade_profit", "worst_trade_loss",
+                 "total_volume_krw", "roi_percent", "sharpe_ratio", "max_drawdown_percent",
+                 "trades_by_coin", "profit_by_coin", "daily_returns")
+    
     total_trades: int
     successful_trades: int
     failed_trades: int
@@ -32,6 +119,28 @@ class PerformanceMetrics:
     daily_returns: List[Tuple[datetime, Decimal]]
 
 
+# Shared result for an empty trade history
+_EMPTY_METRICS = PerformanceMetrics(
+    total_trades=0,
+    successful_trades=0,
+    failed_trades=0,
+    win_rate=0.0,
+    total_profit_krw=Decimal("0"),
+    total_fees_krw=Decimal("0"),
+    net_profit_krw=Decimal("0"),
+    average_profit_per_trade=Decimal("0"),
+    best_trade_profit=Decimal("0"),
+    worst_trade_loss=Decimal("0"),
+    total_volume_krw=Decimal("0"),
+    roi_percent=0.0,
+    sharpe_ratio=0.0,
+    max_drawdown_percent=0.0,
+    trades_by_coin=MappingProxyType({}),
+    profit_by_coin=MappingProxyType({}),
+    daily_returns=()
+)
+
+
 class PerformanceAnalyzer:
     """Analyzes paper trading performance"""
     
@@ -45,6 +154,7 @@ class PerformanceAnalyzer:
         """
         self.balance_manager = balance_manager
         self.exchange_rate_provider = exchange_rate_provider
+        self._metrics_cache: Dict[Tuple, PerformanceMetrics] = {}
         
     def analyze_performance(self, initial_capital_krw: Decimal) -> PerformanceMetrics:
         """
@@ -56,58 +166,90 @@ class PerformanceAnalyzer:
         Returns:
             PerformanceMetrics object with detailed analysis
         """
-        trades = self.balance_manager.trades
-        transfers = self.balance_manager.transfers
+        recent_trades = self.balance_manager.trades
         
-        if not trades:
+        if not recent_trades:
             return self._empty_metrics()
             
+        # Trade and transfer history is append-only, so unchanged record
+        # counters and last trade mean the previous result still holds. The
+        # counters keep growing once the in-memory history hits its cap
+        cache_key = (self.balance_manager.trade_counter, self.balance_manager.transfer_counter,
+                     recent_trades[-1].timestamp, initial_capital_krw)
+        metrics = self._metrics_cache.get(cache_key)
+        if metrics is None:
+            # The totals cover the whole run, including records already
+            # evicted from the in-memory history
+            metrics = self._compute_metrics(self.balance_manager.full_trade_history(),
+                                            self.balance_manager.full_transfer_history(),
+                                            initial_capital_krw)
+            if len(self._metrics_cache) >= METRICS_CACHE_SIZE:
+                self._metrics_cache.pop(next(iter(self._metrics_cache)))
+            self._metrics_cache[cache_key] = metrics
+        return metrics
+        
+    def _compute_metrics(self, trades: List[SimulatedTrade], transfers: List[SimulatedTransfer],
+                         initial_capital_krw: Decimal) -> PerformanceMetrics:
+        """Full analysis of the given trade and transfer history"""
         # Group trades by arbitrage opportunities
         arbitrage_trades = self._group_arbitrage_trades(trades, transfers)
         
-        # Calculate metrics
+        # Calculate metrics (sums are in integer minor units)
         total_trades = len(arbitrage_trades)
         successful_trades = 0
-        total_profit_krw = Decimal("0")
-        total_fees_krw = Decimal("0")
-        total_volume_krw = Decimal("0")
+        total_profit = 0
+        total_fees = 0
+        total_volume = 0
         
         profits = []
-        trades_by_coin = defaultdict(int)
-        profit_by_coin = defaultdict(Decimal)
+        coin_index: Dict[str, int] = {}
+        coin_ids = []
+        profit_by_date = defaultdict(int)
         
+        # Single pass over the trades: per-opportunity profit and the
+        # per-day cash flow behind the daily returns
         for arb_trade in arbitrage_trades:
-            profit, fees, volume = self._calculate_arbitrage_profit(arb_trade)
+            profit, fees, volume = self._calculate_arbitrage_profit(arb_trade, profit_by_date)
             
             if profit > 0:
                 successful_trades += 1
                 
-            total_profit_krw += profit
-            total_fees_krw += fees
-            total_volume_krw += volume
+            total_profit += profit
+            total_fees += fees
+            total_volume += volume
             profits.append(profit)
             
             # Track by coin
             coin = self._extract_coin_from_trades(arb_trade['trades'])
-            trades_by_coin[coin] += 1
-            profit_by_coin[coin] += profit
+            coin_ids.append(coin_index.setdefault(coin, len(coin_index)))
             
+        # Per-coin trade counts and profit sums as grouped reductions
+        coin_ids = np.array(coin_ids, dtype=np.intp)
+        coin_trades = np.bincount(coin_ids, minlength=len(coin_index))
+        coin_profits = np.zeros(len(coin_index), dtype=np.int64)
+        np.add.at(coin_profits, coin_ids, np.array(profits, dtype=np.int64))
+        
+        total_profit_krw = from_minor_units(total_profit)
+        total_fees_krw = from_minor_units(total_fees)
+        total_volume_krw = from_minor_units(total_volume)
+        
         # Calculate aggregate metrics
         win_rate = (successful_trades / total_trades * 100) if total_trades > 0 else 0
-        net_profit_krw = total_profit_krw - total_fees_krw
-        avg_profit = net_profit_krw / total_trades if total_trades > 0 else Decimal("0")
+        net_profit = total_profit - total_fees
+        net_profit_krw = from_minor_units(net_profit)
+        # Integer division in minor units (exact to 1e-8 KRW)
+        avg_profit = from_minor_units(net_profit // total_trades) if total_trades > 0 else Decimal("0")
         
-        best_trade = max(profits) if profits else Decimal("0")
-        worst_trade = min(profits) if profits else Decimal("0")
+        best_trade = from_minor_units(max(profits)) if profits else Decimal("0")
+        worst_trade = from_minor_units(min(profits)) if profits else Decimal("0")
         
         # Calculate ROI based on net profit
         # ROI should be net profit / initial capital
         roi_percent = float((net_profit_krw / initial_capital_krw) * 100) if initial_capital_krw > 0 else 0
         
         # Calculate risk metrics
-        daily_returns = self._calculate_daily_returns(trades, initial_capital_krw)
-        sharpe_ratio = self._calculate_sharpe_ratio(daily_returns)
-        max_drawdown = self._calculate_max_drawdown(daily_returns, initial_capital_krw)
+        daily_returns = self._calculate_daily_returns(profit_by_date, initial_capital_krw)
+        sharpe_ratio, max_drawdown = self._calculate_risk_metrics(daily_returns, initial_capital_krw)
         
         return PerformanceMetrics(
             total_trades=total_trades,
@@ -124,8 +266,8 @@ class PerformanceAnalyzer:
             roi_percent=roi_percent,
             sharpe_ratio=sharpe_ratio,
             max_drawdown_percent=max_drawdown,
-            trades_by_coin=dict(trades_by_coin),
-            profit_by_coin=dict(profit_by_coin),
+            trades_by_coin={coin: int(coin_trades[i]) for coin, i in coin_index.items()},
+            profit_by_coin={coin: from_minor_units(int(coin_profits[i])) for coin, i in coin_index.items()},
             daily_returns=daily_returns
         )
         
@@ -148,68 +290,90 @@ class PerformanceAnalyzer:
     def _group_arbitrage_trades(self, trades: List[SimulatedTrade], 
                                transfers: List[SimulatedTransfer]) -> List[Dict]:
         """Group trades and transfers into complete arbitrage opportunities"""
-        # Simple grouping by timestamp proximity (within 5 minutes)
+        # Records made inside an arbitrage cycle carry its arb_id and are
+        # grouped exactly; untagged ones fall back to timestamp proximity
+        tagged = defaultdict(lambda: {'trades': [], 'transfers': []})
+        untagged_trades = []
+        for trade in trades:
+            if trade.arb_id is None:
+                untagged_trades.append(trade)
+            else:
+                tagged[trade.arb_id]['trades'].append(trade)
+                
+        if not tagged:
+            return self._group_by_proximity(trades, transfers)
+            
+        untagged_transfers = []
+        for transfer in transfers:
+            if transfer.arb_id is None:
+                untagged_transfers.append(transfer)
+            elif transfer.arb_id in tagged:
+                tagged[transfer.arb_id]['transfers'].append(transfer)
+                
+        arbitrage_trades = list(tagged.values())
+        arbitrage_trades.extend(self._group_by_proximity(untagged_trades, untagged_transfers))
+        arbitrage_trades.sort(key=lambda arb_trade: arb_trade['trades'][0].timestamp)
+        return arbitrage_trades
+        
+    def _group_by_proximity(self, trades: List[SimulatedTrade],
+                            transfers: List[SimulatedTransfer]) -> List[Dict]:
+        """Group trades and transfers by timestamp proximity"""
+        # Simple grouping by timestamp proximity: a single sweep over the
+        # trades in time order, each group starting at the first trade not
+        # yet grouped
+        trades = sorted(trades, key=lambda trade: trade.timestamp)
+        transfers = sorted(transfers, key=lambda transfer: transfer.timestamp)
+        transfer_times = [transfer.timestamp for transfer in transfers]
+        
         arbitrage_trades = []
-        used_trades = set()
+        start = 0
         
-        for i, trade in enumerate(trades):
-            if i in used_trades:
-                continue
-                
+        while start < len(trades):
+            group_time = trades[start].timestamp
+            
             # Find related trades within 5 minutes
-            arb_group = {
-                'trades': [trade],
-                'transfers': []
-            }
+            group_end = group_time + TRADE_GROUP_WINDOW
+            end = start + 1
+            while end < len(trades) and trades[end].timestamp <= group_end:
+                end += 1
+                
+            # Find related transfers within 10 minutes either side
+            first = bisect_left(transfer_times, group_time - TRANSFER_MATCH_WINDOW)
+            last = bisect_right(transfer_times, group_time + TRANSFER_MATCH_WINDOW)
             
-            for j, other_trade in enumerate(trades[i+1:], i+1):
-                if j in used_trades:
-                    continue
-                    
-                time_diff = abs((other_trade.timestamp - trade.timestamp).total_seconds())
-                if time_diff <= 300:  # 5 minutes
-                    arb_group['trades'].append(other_trade)
-                    used_trades.add(j)
-                    
-            # Find related transfers
-            for transfer in transfers:
-                time_diff = abs((transfer.timestamp - trade.timestamp).total_seconds())
-                if time_diff <= 600:  # 10 minutes
-                    arb_group['transfers'].append(transfer)
-                    
-            arbitrage_trades.append(arb_group)
-            used_trades.add(i)
+            arbitrage_trades.append({
+                'trades': trades[start:end],
+                'transfers': transfers[first:last]
+            })
+            start = end
             
         return arbitrage_trades
         
-    def _calculate_arbitrage_profit(self, arb_trade: Dict) -> Tuple[Decimal, Decimal, Decimal]:
-        """Calculate profit, fees, and volume for an arbitrage trade"""
+    def _calculate_arbitrage_profit(self, arb_trade: Dict,
+                                   profit_by_date: Dict) -> Tuple[int, int, int]:
+        """Calculate profit, fees, and volume for an arbitrage trade, in minor units
+        
+        Each trade's cash flow net of fees is also added to profit_by_date.
+        """
         trades = arb_trade['trades']
         transfers = arb_trade['transfers']
         
-        total_buy_cost = Decimal("0")
-        total_sell_revenue = Decimal("0")
-        total_fees = Decimal("0")
-        total_volume = Decimal("0")
+        net_flow = 0  # Sell revenue minus buy cost
+        total_fees = 0
+        total_volume = 0
         
         for trade in trades:
-            if trade.side.lower() == "buy":
-                total_buy_cost += trade.total_cost
-            else:
-                total_sell_revenue += trade.total_cost
-                
-            total_fees += trade.fee
-            total_volume += trade.total_cost
+            net_flow += trade.side_sign * trade.cost_units
+            profit_by_date[trade.timestamp.date()] += trade.net_units
+            total_fees += trade.fee_units
+            total_volume += trade.cost_units
             
         # Add transfer fees
         for transfer in transfers:
-            total_fees += transfer.fee
+            total_fees += transfer.fee_units
             
-        # Convert to KRW if needed
-        usd_krw_rate = self.exchange_rate_provider.get_usd_krw_rate()
-        
         # Simple profit calculation (assuming proper currency conversions in trades)
-        profit = total_sell_revenue - total_buy_cost - total_fees
+        profit = net_flow - total_fees
         
         return profit, total_fees, total_volume
         
@@ -218,165 +382,91 @@ class PerformanceAnalyzer:
         total_values = self.balance_manager.get_total_value_krw(self.exchange_rate_provider)
         return sum(total_values.values())
         
-    def _calculate_daily_returns(self, trades: List[SimulatedTrade], 
+    def _calculate_daily_returns(self, profit_by_date: Dict, 
                                 initial_capital: Decimal) -> List[Tuple[datetime, Decimal]]:
-        """Calculate daily returns"""
-        if not trades:
-            return []
-            
-        # Group trades by date
-        trades_by_date = defaultdict(list)
-        for trade in trades:
-            date = trade.timestamp.date()
-            trades_by_date[date].append(trade)
+        """Calculate cumulative daily returns from per-day profit in minor units
+        
+        profit_by_date is filled while walking the time-sorted arbitrage
+        groups, so its insertion order is normally already chronological;
+        it is only sorted when a group spans a later group's date.
+        """
+        dates = list(profit_by_date)
+        if any(earlier > later for earlier, later in zip(dates, dates[1:])):
+            dates.sort()
             
-        # Calculate cumulative returns by date
         daily_returns = []
-        cumulative_profit = Decimal("0")
+        cumulative_profit = 0
         
-        for date in sorted(trades_by_date.keys()):
-            day_trades = trades_by_date[date]
-            day_profit = Decimal("0")
-            
-            for trade in day_trades:
-                # Simplified profit calculation
-                if trade.side.lower() == "sell":
-                    day_profit += trade.total_cost - trade.fee
-                else:
-                    day_profit -= trade.total_cost + trade.fee
-                    
-            cumulative_profit += day_profit
-            daily_return = cumulative_profit / initial_capital
+        for date in dates:
+            cumulative_profit += profit_by_date[date]
+            daily_return = from_minor_units(cumulative_profit) / initial_capital
             daily_returns.append((datetime.combine(date, datetime.min.time()), daily_return))
             
         return daily_returns
         
-    def _calculate_sharpe_ratio(self, daily_returns: List[Tuple[datetime, Decimal]]) -> float:
-        """Calculate Sharpe ratio (simplified version)"""
-        if len(daily_returns) < 2:
-            return 0.0
-            
-        returns = [float(r[1]) for r in daily_returns]
-        
-        # Calculate average return
-        avg_return = sum(returns) / len(returns)
-        
-        # Calculate standard deviation
-        variance = sum((r - avg_return) ** 2 for r in returns) / len(returns)
-        std_dev = variance ** 0.5
-        
-        # Sharpe ratio (assuming 0% risk-free rate)
-        if std_dev == 0:
-            return 0.0
-            
-        # Annualize (assuming 365 trading days)
-        return (avg_return * 365 ** 0.5) / std_dev
-        
-    def _calculate_max_drawdown(self, daily_returns: List[Tuple[datetime, Decimal]], 
-                               initial_capital: Decimal) -> float:
-        """Calculate maximum drawdown percentage"""
+    def _calculate_risk_metrics(self, daily_returns: List[Tuple[datetime, Decimal]],
+                                initial_capital: Decimal) -> Tuple[float, float]:
+        """Calculate Sharpe ratio and maximum drawdown percentage"""
         if not daily_returns:
-            return 0.0
+            return 0.0, 0.0
             
-        peak_value = initial_capital
-        max_drawdown = Decimal("0")
-        
-        for date, cumulative_return in daily_returns:
-            current_value = initial_capital * (1 + cumulative_return)
-            
-            if current_value > peak_value:
-                peak_value = current_value
-            else:
-                drawdown = (peak_value - current_value) / peak_value
-                if drawdown > max_drawdown:
-                    max_drawdown = drawdown
-                    
-        return float(max_drawdown * 100)
+        cumulative_returns = np.fromiter((float(r[1]) for r in daily_returns),
+                                         dtype=np.float64, count=len(daily_returns))
+        return _risk_kernel(cumulative_returns, float(initial_capital))
         
     def _extract_coin_from_trades(self, trades: List[SimulatedTrade]) -> str:
         """Extract coin symbol from trades"""
-        for trade in trades:
-            if trade.exchange == "binance" and trade.symbol.endswith("USDT"):
-                return trade.symbol[:-4]
-            elif trade.exchange == "upbit" and "-" in trade.symbol:
-                # Upbit format is KRW-BTC, so coin is the second part
-                parts = trade.symbol.split("-")
-                if len(parts) == 2 and parts[0] == "KRW":
-                    return parts[1]
-                
-        return "UNKNOWN"
+        # Parsed from the market symbol when each trade was recorded
+        return next((trade.coin for trade in trades if trade.coin), "UNKNOWN")
         
     def _empty_metrics(self) -> PerformanceMetrics:
         """Return empty metrics when no trades"""
-        return PerformanceMetrics(
-            total_trades=0,
-            successful_trades=0,
-            failed_trades=0,
-            win_rate=0.0,
-            total_profit_krw=Decimal("0"),
-            total_fees_krw=Decimal("0"),
-            net_profit_krw=Decimal("0"),
-            average_profit_per_trade=Decimal("0"),
-            best_trade_profit=Decimal("0"),
-            worst_trade_loss=Decimal("0"),
-            total_volume_krw=Decimal("0"),
-            roi_percent=0.0,
-            sharpe_ratio=0.0,
-            max_drawdown_percent=0.0,
-            trades_by_coin={},
-            profit_by_coin={},
-            daily_returns=[]
-        )
+        return _EMPTY_METRICS
         
     def _generate_text_report(self, metrics: PerformanceMetrics) -> str:
         """Generate text format report"""
-        report = []
-        report.append("=" * 60)
-        report.append("PAPER TRADING PERFORMANCE REPORT")
-        report.append("=" * 60)
-        report.append("")
-        
-        # Trading Summary
-        report.append("TRADING SUMMARY:")
-        report.append(f"  Total Trades: {metrics.total_trades}")
-        report.append(f"  Successful Trades: {metrics.successful_trades}")
-        report.append(f"  Failed Trades: {metrics.failed_trades}")
-        report.append(f"  Win Rate: {metrics.win_rate:.1f}%")
-        report.append("")
-        
-        # Financial Performance
-        report.append("FINANCIAL PERFORMANCE:")
-        report.append(f"  Total Volume: {metrics.total_volume_krw:,.0f} KRW")
-        report.append(f"  Total Profit: {metrics.total_profit_krw:,.0f} KRW")
-        report.append(f"  Total Fees: {metrics.total_fees_krw:,.0f} KRW")
-        report.append(f"  Net Profit: {metrics.net_profit_krw:,.0f} KRW")
-        report.append(f"  ROI: {metrics.roi_percent:.2f}%")
-        report.append("")
-        
-        # Trade Statistics
-        report.append("TRADE STATISTICS:")
-        report.append(f"  Average Profit per Trade: {metrics.average_profit_per_trade:,.0f} KRW")
-        report.append(f"  Best Trade: {metrics.best_trade_profit:,.0f} KRW")
-        report.append(f"  Worst Trade: {metrics.worst_trade_loss:,.0f} KRW")
-        report.append("")
-        
-        # Risk Metrics
-        report.append("RISK METRICS:")
-        report.append(f"  Sharpe Ratio: {metrics.sharpe_ratio:.2f}")
-        report.append(f"  Max Drawdown: {metrics.max_drawdown_percent:.2f}%")
-        report.append("")
+        rule = "=" * 60
         
         # Performance by Coin
+        by_coin = ""
         if metrics.trades_by_coin:
-            report.append("PERFORMANCE BY COIN:")
-            for coin, count in sorted(metrics.trades_by_coin.items()):
-                profit = metrics.profit_by_coin.get(coin, Decimal("0"))
-                report.append(f"  {coin}: {count} trades, {profit:,.0f} KRW profit")
-            report.append("")
+            coin_lines = "\n".join(
+                f"  {coin}: {count} trades, "
+                f"{metrics.profit_by_coin.get(coin, Decimal('0')):,.0f} KRW profit"
+                for coin, count in sorted(metrics.trades_by_coin.items())
+            )
+            by_coin = f"PERFORMANCE BY COIN:\n{coin_lines}\n\n"
             
-        report.append("=" * 60)
-        
-        return "\n".join(report)
+        return (
+            f"{rule}\n"
+            f"PAPER TRADING PERFORMANCE REPORT\n"
+            f"{rule}\n"
+            f"\n"
+            f"TRADING SUMMARY:\n"
+            f"  Total Trades: {metrics.total_trades}\n"
+            f"  Successful Trades: {metrics.successful_trades}\n"
+            f"  Failed Trades: {metrics.failed_trades}\n"
+            f"  Win Rate: {metrics.win_rate:.1f}%\n"
+            f"\n"
+            f"FINANCIAL PERFORMANCE:\n"
+            f"  Total Volume: {metrics.total_volume_krw:,.0f} KRW\n"
+            f"  Total Profit: {metrics.total_profit_krw:,.0f} KRW\n"
+            f"  Total Fees: {metrics.total_fees_krw:,.0f} KRW\n"
+            f"  Net Profit: {metrics.net_profit_krw:,.0f} KRW\n"
+            f"  ROI: {metrics.roi_percent:.2f}%\n"
+            f"\n"
+            f"TRADE STATISTICS:\n"
+            f"  Average Profit per Trade: {metrics.average_profit_per_trade:,.0f} KRW\n"
+            f"  Best Trade: {metrics.best_trade_profit:,.0f} KRW\n"
+            f"  Worst Trade: {metrics.worst_trade_loss:,.0f} KRW\n"
+            f"\n"
+            f"RISK METRICS:\n"
+            f"  Sharpe Ratio: {metrics.sharpe_ratio:.2f}\n"
+            f"  Max Drawdown: {metrics.max_drawdown_percent:.2f}%\n"
+            f"\n"
+            f"{by_coin}"
+            f"{rule}"
+        )
         
     def _generate_json_report(self, metrics: PerformanceMetrics) -> str:
         """Generate JSON format report"""
@@ -411,13 +501,13 @@ class PerformanceAnalyzer:
                 }
                 for coin, count in metrics.trades_by_coin.items()
             },
-            "daily_returns": [
-                {
-                    "date": date.isoformat(),
-                    "cumulative_return": float(ret)
-                }
-                for date, ret in metrics.daily_returns
-            ]
+            # Columnar: parallel date and cumulative return arrays
+            "daily_returns": {
+                "dates": [date.isoformat() for date, _ in metrics.daily_returns],
+                "cumulative_returns": [float(ret) for _, ret in metrics.daily_returns]
+            }
         }
         
+        if orjson is not None:
+            return orjson.dumps(report_data, option=orjson.OPT_INDENT_2).decode()
         return json.dumps(report_data, indent=2)
\ No newline at end of file
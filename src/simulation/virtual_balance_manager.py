@@ -1,28 +1,147 @@
 """Virtual balance manager for paper trading simulation"""
-from typing import Dict, Optional, List
+from typing import Deque, Dict, Optional, List, Tuple
 from decimal import Decimal
 from datetime import datetime
 from loguru import logger
 import json
 import os
-from dataclasses import dataclass, asdict
+import pickle
+import asyncio
+import atexit
+import threading
+from dataclasses import dataclass
+from collections import deque
+from functools import lru_cache
+from itertools import islice, chain
+from contextlib import contextmanager
+from contextvars import ContextVar
+import sys
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Balances are held, and money amounts cached on trade records, as integer
+# multiples of 1e-8, so updates and performance sums are plain int
+# arithmetic. The scale is shared by every asset (KRW included) and matches
+# the 8 decimals both exchanges report balances in; anything finer is
+# rounded half-even to the nearest unit
+MINOR_UNIT_EXPONENT = 8
+
+
+def to_minor_units(amount: Decimal) -> int:
+    """Amount as a whole number of 1e-8 units, rounded half-even"""
+    return int(amount.scaleb(MINOR_UNIT_EXPONENT).to_integral_value())
+
+
+def from_minor_units(units: int) -> Decimal:
+    """Inverse of to_minor_units"""
+    return Decimal(units).scaleb(-MINOR_UNIT_EXPONENT)
+
+
+def format_minor_units(units: int) -> str:
+    """Plain decimal string of an amount, without padding zeros ("0", "1.5")"""
+    return format(from_minor_units(units).normalize(), "f")
+
+
+# Arbitrage cycle that trades and transfers recorded in the current context
+# belong to (see VirtualBalanceManager.arbitrage_cycle)
+_current_arb_id = ContextVar("arb_id", default=None)  # type: ContextVar[Optional[int]]
+
+
+@lru_cache(maxsize=None)
+def parse_symbol(exchange: str, symbol: str) -> Optional[Tuple[str, str]]:
+    """(base, quote) assets of a market symbol, or None if it can't be parsed
+    
+    Memoized, since the bot trades the same few symbols over and over.
+    """
+    if exchange == "binance":
+        # Binance format: BTCUSDT
+        if symbol.endswith("USDT"):
+            return sys.intern(symbol[:-4]), "USDT"
+        return None
+    # Upbit format: KRW-BTC (quote-base)
+    parts = symbol.split("-")
+    if len(parts) != 2:
+        return None
+    return sys.intern(parts[1]), sys.intern(parts[0])
+
+
+def coin_from_symbol(exchange: str, symbol: str) -> Optional[str]:
+    """Base coin of a market symbol, by the same rules as parse_symbol"""
+    assets = parse_symbol(exchange, symbol)
+    return assets[0] if assets is not None else None
 
 
 @dataclass
 class VirtualBalance:
-    """Virtual balance for a specific asset"""
+    """Virtual balance for a specific asset
+    
+    Amounts are held as integer minor units (see to_minor_units) so balance
+    updates are plain int arithmetic; the Decimal views are built on read.
+    Credits and debits finer than 1e-8 are rounded to that scale.
+    """
+    __slots__ = ("asset", "available_units", "locked_units")
+    
     asset: str
-    available: Decimal
-    locked: Decimal = Decimal("0")
+    available_units: int
+    locked_units: int
     
+    @property
+    def available(self) -> Decimal:
+        return from_minor_units(self.available_units)
+        
+    @property
+    def locked(self) -> Decimal:
+        return from_minor_units(self.locked_units)
+        
     @property
     def total(self) -> Decimal:
-        return self.available + self.locked
+        return from_minor_units(self.available_units + self.locked_units)
+        
+    def to_dict(self):
+        """Convert to dictionary for JSON serialization"""
+        return {
+            "available": format_minor_units(self.available_units),
+            "locked": format_minor_units(self.locked_units)
+        }
+
+
+class _AssetBalances(dict):
+    """Asset -> VirtualBalance for one exchange
+    
+    Indexing an asset that has no balance yet creates it at zero, so
+    crediting a balance is a single lookup with no membership test.
+    get() still returns None for unknown assets. New balances are also
+    registered in the manager's flat (exchange, asset) index.
+    """
+    __slots__ = ("exchange", "index")
+    
+    def __init__(self, exchange: str, index: Dict[Tuple[str, str], VirtualBalance]):
+        super().__init__()
+        self.exchange = sys.intern(exchange)
+        self.index = index
+        
+    def __missing__(self, asset: str) -> VirtualBalance:
+        balance = self[asset] = VirtualBalance(asset=asset, available_units=0, locked_units=0)
+        self.index[(self.exchange, asset)] = balance
+        return balance
+        
+    def load(self, balances: Dict[str, VirtualBalance]):
+        """Bulk insert restored balances, registering them in the index"""
+        self.update(balances)
+        self.index.update(((self.exchange, asset), balance) for asset, balance in balances.items())
 
 
 @dataclass
 class SimulatedTrade:
     """Record of a simulated trade"""
+    __slots__ = ("timestamp", "trade_id", "exchange", "symbol", "side", "price",
+                 "quantity", "fee", "fee_asset", "total_cost", "trade_type",
+                 "cost_units", "fee_units", "side_sign", "net_units", "coin", "arb_id")
+    
     timestamp: datetime
     trade_id: str
     exchange: str
@@ -35,20 +154,58 @@ class SimulatedTrade:
     total_cost: Decimal
     trade_type: str  # market/limit
     
+    def __post_init__(self):
+        self.cost_units = to_minor_units(self.total_cost)
+        self.fee_units = to_minor_units(self.fee)
+        # Cash flow direction (-1 buy, +1 sell) and flow net of fee
+        self.side_sign = -1 if self.side.lower() == "buy" else 1
+        self.net_units = self.side_sign * self.cost_units - self.fee_units
+        self.coin = coin_from_symbol(self.exchange, self.symbol)
+        self.arb_id = _current_arb_id.get()
+        
     def to_dict(self):
         """Convert to dictionary for JSON serialization"""
-        data = asdict(self)
-        data['timestamp'] = self.timestamp.isoformat()
-        data['price'] = str(self.price)
-        data['quantity'] = str(self.quantity)
-        data['fee'] = str(self.fee)
-        data['total_cost'] = str(self.total_cost)
-        return data
+        return {
+            'timestamp': self.timestamp.isoformat(),
+            'trade_id': self.trade_id,
+            'exchange': self.exchange,
+            'symbol': self.symbol,
+            'side': self.side,
+            'price': str(self.price),
+            'quantity': str(self.quantity),
+            'fee': str(self.fee),
+            'fee_asset': self.fee_asset,
+            'total_cost': str(self.total_cost),
+            'trade_type': self.trade_type,
+            'arb_id': self.arb_id
+        }
+        
+    @classmethod
+    def from_dict(cls, data: Dict) -> "SimulatedTrade":
+        """Rebuild a trade from its to_dict form"""
+        trade = cls(
+            timestamp=datetime.fromisoformat(data['timestamp']),
+            trade_id=data['trade_id'],
+            exchange=data['exchange'],
+            symbol=data['symbol'],
+            side=data['side'],
+            price=Decimal(data['price']),
+            quantity=Decimal(data['quantity']),
+            fee=Decimal(data['fee']),
+            fee_asset=data['fee_asset'],
+            total_cost=Decimal(data['total_cost']),
+            trade_type=data['trade_type']
+        )
+        trade.arb_id = data.get('arb_id')
+        return trade
 
 
 @dataclass
 class SimulatedTransfer:
     """Record of a simulated transfer between exchanges"""
+    __slots__ = ("timestamp", "transfer_id", "asset", "amount", "from_exchange",
+                 "to_exchange", "fee", "status", "fee_units", "arb_id")
+    
     timestamp: datetime
     transfer_id: str
     asset: str
@@ -58,77 +215,189 @@ class SimulatedTransfer:
     fee: Decimal
     status: str  # pending/completed/failed
     
+    def __post_init__(self):
+        self.fee_units = to_minor_units(self.fee)
+        self.arb_id = _current_arb_id.get()
+        
     def to_dict(self):
         """Convert to dictionary for JSON serialization"""
-        data = asdict(self)
-        data['timestamp'] = self.timestamp.isoformat()
-        data['amount'] = str(self.amount)
-        data['fee'] = str(self.fee)
-        return data
+        return {
+            'timestamp': self.timestamp.isoformat(),
+            'transfer_id': self.transfer_id,
+            'asset': self.asset,
+            'amount': str(self.amount),
+            'from_exchange': self.from_exchange,
+            'to_exchange': self.to_exchange,
+            'fee': str(self.fee),
+            'status': self.status,
+            'arb_id': self.arb_id
+        }
+        
+    @classmethod
+    def from_dict(cls, data: Dict) -> "SimulatedTransfer":
+        """Rebuild a transfer from its to_dict form"""
+        transfer = cls(
+            timestamp=datetime.fromisoformat(data['timestamp']),
+            transfer_id=data['transfer_id'],
+            asset=data['asset'],
+            amount=Decimal(data['amount']),
+            from_exchange=data['from_exchange'],
+            to_exchange=data['to_exchange'],
+            fee=Decimal(data['fee']),
+            status=data['status']
+        )
+        transfer.arb_id = data.get('arb_id')
+        return transfer
+
+
+@dataclass
+class TradeSpec:
+    """Arguments of one execute_trade call, for execute_trades_batch"""
+    exchange: str
+    symbol: str
+    side: str
+    price: Decimal
+    quantity: Decimal
+    fee_rate: Decimal
+    trade_type: str = "market"
+
+
+@dataclass
+class TransferSpec:
+    """Arguments of one simulate_transfer call, for simulate_transfers_batch"""
+    asset: str
+    amount: Decimal
+    from_exchange: str
+    to_exchange: str
+    network_fee: Decimal
+
+
+def _most_recent(records: Deque, limit: int) -> List:
+    """Last `limit` records, oldest first, without walking the whole deque"""
+    recent = list(islice(reversed(records), limit))
+    recent.reverse()
+    return recent
+
+
+def _encode_row(record) -> bytes:
+    """One NDJSON line for a trade or transfer record"""
+    if orjson is not None:
+        return orjson.dumps(record.to_dict()) + b"\n"
+    return (json.dumps(record.to_dict()) + "\n").encode()
+
+
+def _decode_row(line: bytes) -> Dict:
+    """Inverse of _encode_row"""
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
 
 
 class VirtualBalanceManager:
     """Manages virtual balances for paper trading simulation"""
     
     def __init__(self, initial_balances: Dict[str, Dict[str, Decimal]], 
-                 state_file: str = "simulation_state.json"):
+                 state_file: str = "simulation_state.json",
+                 flush_interval: float = 0.5,
+                 known_assets: Optional[Dict[str, List[str]]] = None,
+                 history_limit: Optional[int] = 10000):
         """
         Initialize virtual balance manager
         
         Args:
             initial_balances: Initial balances by exchange and asset
                             e.g., {"binance": {"USDT": 10000}, "upbit": {"KRW": 10000000}}
-            state_file: Path to save/load simulation state
+            state_file: Path to save/load the balance and counter snapshot.
+                        A .pkl/.pickle suffix stores it as a pickle, otherwise
+                        JSON. Trade and transfer history is appended to NDJSON
+                        logs next to it (<name>_trades.ndjson, <name>_transfers.ndjson)
+            flush_interval: Seconds between state writes in run_periodic_flush
+            known_assets: Assets to create zero balances for up front, by exchange
+            history_limit: Most recent trades/transfers kept in memory (None for
+                           all); the NDJSON logs always hold the full history
         """
         self.state_file = state_file
-        self.balances: Dict[str, Dict[str, VirtualBalance]] = {}
-        self.trades: List[SimulatedTrade] = []
-        self.transfers: List[SimulatedTransfer] = []
+        base_path, extension = os.path.splitext(state_file)
+        self._pickle_state = extension in (".pkl", ".pickle")
+        self._tmp_state_file = f"{state_file}.tmp"
+        self.trades_log = f"{base_path}_trades.ndjson"
+        self.transfers_log = f"{base_path}_transfers.ndjson"
+        self.flush_interval = flush_interval
+        self.known_assets = known_assets or {}
+        self.history_limit = history_limit
+        self._dirty = False  # Mutations since the last save_state
+        self.balances: Dict[str, _AssetBalances] = {}
+        # Same VirtualBalance objects keyed by (exchange, asset), so lookups
+        # take one hash probe; self.balances serves per-exchange iteration
+        self._balance_index: Dict[Tuple[str, str], VirtualBalance] = {}
+        self.trades: Deque[SimulatedTrade] = deque(maxlen=history_limit)
+        self.transfers: Deque[SimulatedTransfer] = deque(maxlen=history_limit)
         self.trade_counter = 0
         self.transfer_counter = 0
+        self.arbitrage_counter = 0
+        
+        # Saves are snapshotted here and written to disk by a background
+        # thread (see _writer_loop), so trading never waits on file I/O
+        self._write_cond = threading.Condition()
+        self._pending_write: Optional[Tuple[bytearray, bytearray, Dict]] = None
+        self._writing = False
+        self._closing = False
         
         # Try to load existing state
         if os.path.exists(state_file):
             self.load_state()
+            self._open_logs("ab")
         else:
+            self._open_logs("wb")
             # Initialize with provided balances
             for exchange, assets in initial_balances.items():
-                self.balances[exchange] = {}
+                balances = self._exchange_balances(exchange)
                 for asset, amount in assets.items():
-                    self.balances[exchange][asset] = VirtualBalance(
-                        asset=asset,
-                        available=amount
-                    )
-                    
+                    balances[asset].available_units = to_minor_units(amount)
+        self._add_known_assets()
+        
+        self._writer_thread = threading.Thread(target=self._writer_loop,
+                                               name="simulation-state-writer", daemon=True)
+        self._writer_thread.start()
+        # Pending changes still reach disk if the process exits between flushes
+        atexit.register(self.flush)
+        
         logger.info("Virtual balance manager initialized")
         self._log_all_balances()
         
     def get_balance(self, exchange: str, asset: str) -> Optional[VirtualBalance]:
         """Get virtual balance for an asset on an exchange"""
-        if exchange not in self.balances:
-            return None
-        return self.balances[exchange].get(asset)
+        return self._balance_index.get((exchange, asset))
+        
+    def _exchange_balances(self, exchange: str) -> _AssetBalances:
+        """Balances of one exchange, created empty on first use"""
+        balances = self.balances.get(exchange)
+        if balances is None:
+            balances = self.balances[exchange] = _AssetBalances(exchange, self._balance_index)
+        return balances
         
     def lock_balance(self, exchange: str, asset: str, amount: Decimal) -> bool:
         """Lock balance for pending order"""
         balance = self.get_balance(exchange, asset)
-        if not balance or balance.available < amount:
+        units = to_minor_units(amount)
+        if not balance or balance.available_units < units:
             return False
             
-        balance.available -= amount
-        balance.locked += amount
-        self.save_state()
+        balance.available_units -= units
+        balance.locked_units += units
+        self._dirty = True
         return True
         
     def unlock_balance(self, exchange: str, asset: str, amount: Decimal) -> bool:
         """Unlock previously locked balance"""
         balance = self.get_balance(exchange, asset)
-        if not balance or balance.locked < amount:
+        units = to_minor_units(amount)
+        if not balance or balance.locked_units < units:
             return False
             
-        balance.locked -= amount
-        balance.available += amount
-        self.save_state()
+        balance.locked_units -= units
+        balance.available_units += units
+        self._dirty = True
         return True
         
     def execute_trade(self, exchange: str, symbol: str, side: str, 
@@ -150,65 +419,50 @@ class VirtualBalanceManager:
             SimulatedTrade object if successful, None otherwise
         """
         # Parse symbol to get base and quote assets
-        if exchange == "binance":
-            # Binance format: BTCUSDT
-            if symbol.endswith("USDT"):
-                base_asset = symbol[:-4]
-                quote_asset = "USDT"
-            else:
+        assets = parse_symbol(exchange, symbol)
+        if assets is None:
+            if exchange == "binance":
                 logger.error(f"Unsupported Binance symbol format: {symbol}")
-                return None
-        else:  # upbit
-            # Upbit format: KRW-BTC (quote-base)
-            parts = symbol.split("-")
-            if len(parts) != 2:
+            else:
                 logger.error(f"Invalid Upbit symbol format: {symbol}")
-                return None
-            quote_asset = parts[0]  # KRW
-            base_asset = parts[1]   # BTC
-            
-        # Calculate costs and fees
+            return None
+        base_asset, quote_asset = assets
+        
+        # Calculate costs and fees; balances move in minor units
         total_cost = price * quantity
         fee = total_cost * fee_rate
+        cost_units = to_minor_units(total_cost)
+        fee_units = to_minor_units(fee)
+        quantity_units = to_minor_units(quantity)
         
         # Update balances based on trade side
         if side.lower() == "buy":
             # Deduct quote asset and add base asset
             quote_balance = self.get_balance(exchange, quote_asset)
-            if not quote_balance or quote_balance.available < (total_cost + fee):
+            if not quote_balance or quote_balance.available_units < cost_units + fee_units:
                 logger.error(f"Insufficient {quote_asset} balance for buy order - needed: {total_cost + fee}, available: {quote_balance.available if quote_balance else 0}")
                 return None
                 
             # Update balances
-            quote_balance.available -= (total_cost + fee)
+            quote_balance.available_units -= cost_units + fee_units
             
             # Add base asset
-            if base_asset not in self.balances[exchange]:
-                self.balances[exchange][base_asset] = VirtualBalance(
-                    asset=base_asset,
-                    available=Decimal("0")
-                )
-            self.balances[exchange][base_asset].available += quantity
+            self.balances[exchange][base_asset].available_units += quantity_units
             
             fee_asset = quote_asset
             
         else:  # sell
             # Deduct base asset and add quote asset
             base_balance = self.get_balance(exchange, base_asset)
-            if not base_balance or base_balance.available < quantity:
+            if not base_balance or base_balance.available_units < quantity_units:
                 logger.error(f"Insufficient {base_asset} balance for sell order - needed: {quantity}, available: {base_balance.available if base_balance else 0}")
                 return None
                 
             # Update balances
-            base_balance.available -= quantity
+            base_balance.available_units -= quantity_units
             
             # Add quote asset (minus fee)
-            if quote_asset not in self.balances[exchange]:
-                self.balances[exchange][quote_asset] = VirtualBalance(
-                    asset=quote_asset,
-                    available=Decimal("0")
-                )
-            self.balances[exchange][quote_asset].available += (total_cost - fee)
+            self.balances[exchange][quote_asset].available_units += cost_units - fee_units
             
             fee_asset = quote_asset
             
@@ -229,10 +483,14 @@ class VirtualBalanceManager:
         )
         
         self.trades.append(trade)
-        self.save_state()
+        self._pending_trade_rows += _encode_row(trade)
+        self._dirty = True
         
-        logger.info(f"Simulated {side} trade on {exchange}: {quantity} {base_asset} @ {price} {quote_asset}")
-        logger.info(f"Fee: {fee} {fee_asset}, Total: {total_cost} {quote_asset}")
+        # Format arguments are passed through, so loguru only renders the
+        # Decimals when the record is actually emitted
+        logger.info("Simulated {} trade on {}: {} {} @ {} {}",
+                    side, exchange, quantity, base_asset, price, quote_asset)
+        logger.info("Fee: {} {}, Total: {} {}", fee, fee_asset, total_cost, quote_asset)
         
         return trade
         
@@ -254,20 +512,17 @@ class VirtualBalanceManager:
         """
         # Check source balance
         from_balance = self.get_balance(from_exchange, asset)
-        if not from_balance or from_balance.available < (amount + network_fee):
+        amount_units = to_minor_units(amount)
+        fee_units = to_minor_units(network_fee)
+        if not from_balance or from_balance.available_units < amount_units + fee_units:
             logger.error(f"Insufficient {asset} balance on {from_exchange} for transfer")
             return None
             
         # Deduct from source (including fee)
-        from_balance.available -= (amount + network_fee)
+        from_balance.available_units -= amount_units + fee_units
         
         # Add to destination
-        if asset not in self.balances[to_exchange]:
-            self.balances[to_exchange][asset] = VirtualBalance(
-                asset=asset,
-                available=Decimal("0")
-            )
-        self.balances[to_exchange][asset].available += amount
+        self._exchange_balances(to_exchange)[asset].available_units += amount_units
         
         # Create transfer record
         self.transfer_counter += 1
@@ -283,13 +538,42 @@ class VirtualBalanceManager:
         )
         
         self.transfers.append(transfer)
-        self.save_state()
+        self._pending_transfer_rows += _encode_row(transfer)
+        self._dirty = True
         
-        logger.info(f"Simulated transfer: {amount} {asset} from {from_exchange} to {to_exchange}")
-        logger.info(f"Network fee: {network_fee} {asset}")
+        logger.info("Simulated transfer: {} {} from {} to {}", amount, asset, from_exchange, to_exchange)
+        logger.info("Network fee: {} {}", network_fee, asset)
         
         return transfer
         
+    def execute_trades_batch(self, orders: List[TradeSpec]) -> List[Optional[SimulatedTrade]]:
+        """
+        Execute several trades back to back and queue one save for them all
+        
+        Legs are applied in order and independently, as separate
+        execute_trade calls would; a failed leg yields None in its slot.
+        The save is handed to the writer thread without waiting for it.
+        """
+        trades = [
+            self.execute_trade(order.exchange, order.symbol, order.side, order.price,
+                               order.quantity, order.fee_rate, order.trade_type)
+            for order in orders
+        ]
+        if self._dirty:
+            self._request_save()
+        return trades
+        
+    def simulate_transfers_batch(self, transfers: List[TransferSpec]) -> List[Optional[SimulatedTransfer]]:
+        """Simulate several transfers and queue one save for them all"""
+        results = [
+            self.simulate_transfer(transfer.asset, transfer.amount, transfer.from_exchange,
+                                   transfer.to_exchange, transfer.network_fee)
+            for transfer in transfers
+        ]
+        if self._dirty:
+            self._request_save()
+        return results
+        
     def get_total_value_krw(self, exchange_rate_provider) -> Dict[str, Decimal]:
         """
         Calculate total portfolio value in KRW for each exchange
@@ -301,25 +585,26 @@ class VirtualBalanceManager:
             Dictionary of total values by exchange
         """
         total_values = {}
+        # One rate lookup per valuation rather than one per USDT balance
+        usd_krw_rate = exchange_rate_provider.get_usd_krw_rate()
         
         for exchange, balances in self.balances.items():
             total_krw = Decimal("0")
             
             for asset, balance in balances.items():
-                if balance.total == 0:
+                if balance.available_units + balance.locked_units == 0:
                     continue
                     
                 if asset == "KRW":
                     total_krw += balance.total
                 elif asset == "USDT":
                     # Convert USDT to KRW
-                    usd_krw_rate = exchange_rate_provider.get_usd_krw_rate()
                     if usd_krw_rate:
                         total_krw += balance.total * usd_krw_rate
                 else:
                     # For other assets, we'd need their prices
                     # For now, we'll skip them
-                    logger.debug(f"Skipping {asset} in portfolio value calculation")
+                    logger.debug("Skipping {} in portfolio value calculation", asset)
                     
             total_values[exchange] = total_krw
             
@@ -328,89 +613,313 @@ class VirtualBalanceManager:
     def get_trade_history(self, limit: Optional[int] = None) -> List[SimulatedTrade]:
         """Get recent trade history"""
         if limit:
-            return self.trades[-limit:]
-        return self.trades
+            return _most_recent(self.trades, limit)
+        return list(self.trades)
         
-    def get_transfer_history(self, limit: Optional[int] = None) -> List[SimulatedTransfer]:
-        """Get recent transfer history"""
-        if limit:
-            return self.transfers[-limit:]
-        return self.transfers
+    def get_transfer_history(self, limit: Optional[int] = None,
+                             from_exchange: Optional[str] = None,
+                             to_exchange: Optional[str] = None,
+                             asset: Optional[str] = None) -> List[SimulatedTransfer]:
+        """
+        Get recent transfer history
+        
+        With filters, returns the most recent `limit` matching transfers;
+        the scan runs newest-first and stops once that many are found.
+        """
+        if from_exchange is None and to_exchange is None and asset is None:
+            if limit:
+                return _most_recent(self.transfers, limit)
+            return list(self.transfers)
+            
+        matches = (
+            transfer for transfer in reversed(self.transfers)
+            if (from_exchange is None or transfer.from_exchange == from_exchange)
+            and (to_exchange is None or transfer.to_exchange == to_exchange)
+            and (asset is None or transfer.asset == asset)
+        )
+        recent = list(islice(matches, limit or None))
+        recent.reverse()  # Oldest first, like the unfiltered history
+        return recent
+        
+    def full_trade_history(self) -> List[SimulatedTrade]:
+        """Every trade recorded, oldest first
+        
+        Served from memory while nothing has been evicted under
+        history_limit, otherwise read back from the trades log.
+        """
+        return self._full_history(self.trades, self.trade_counter, self.trades_log, SimulatedTrade)
+        
+    def full_transfer_history(self) -> List[SimulatedTransfer]:
+        """Every transfer recorded, oldest first (see full_trade_history)"""
+        return self._full_history(self.transfers, self.transfer_counter, self.transfers_log,
+                                  SimulatedTransfer)
+        
+    def _full_history(self, records: Deque, counter: int, path: str, record_type) -> List:
+        if len(records) >= counter:
+            return list(records)
+        self.flush()  # Rows not saved yet must reach the log first
+        return [record_type.from_dict(_decode_row(line)) for line in self._read_log(path)]
+        
+    def flush(self):
+        """Save state if anything changed and wait until it is on disk"""
+        if self._dirty:
+            self._request_save()
+        self._wait_for_writer()
+        
+    def close(self):
+        """Flush pending changes, stop the writer thread and close the logs"""
+        self.flush()
+        atexit.unregister(self.flush)
+        with self._write_cond:
+            self._closing = True
+            self._write_cond.notify_all()
+        self._writer_thread.join()
+        self._trades_fp.close()
+        self._transfers_fp.close()
         
+    async def run_periodic_flush(self):
+        """Flush pending changes every flush_interval seconds; run as a task
+        
+        Mutations only mark the state dirty, so a burst of trades costs one
+        write per interval instead of one full rewrite each.
+        """
+        try:
+            while True:
+                await asyncio.sleep(self.flush_interval)
+                if self._dirty:
+                    self._request_save()  # Hand-off only; the write runs on the writer thread
+        finally:
+            self.flush()
+            
     def save_state(self):
-        """Save current state to file"""
+        """Save balances and counters to the state file, blocking until written
+        
+        Trades and transfers are not part of the snapshot. Rows encoded
+        since the last save are appended to their logs first, so a save
+        costs the same however long the history grows.
+        """
+        self._request_save()
+        self._wait_for_writer()
+        
+    def _request_save(self):
+        """Snapshot the state and queue it for the writer thread
+        
+        The snapshot is taken on the caller's thread, the one that mutates
+        balances, so the writer never sees a half-applied trade. A snapshot
+        still waiting in the queue is merged: its rows are kept and its state
+        is superseded.
+        """
+        self._dirty = False
+        trade_rows, self._pending_trade_rows = self._pending_trade_rows, bytearray()
+        transfer_rows, self._pending_transfer_rows = self._pending_transfer_rows, bytearray()
         state = {
-            "balances": {},
-            "trades": [trade.to_dict() for trade in self.trades],
-            "transfers": [transfer.to_dict() for transfer in self.transfers],
+            "balances": {
+                exchange: {asset: balance.to_dict() for asset, balance in assets.items()}
+                for exchange, assets in self.balances.items()
+            },
             "trade_counter": self.trade_counter,
-            "transfer_counter": self.transfer_counter
+            "transfer_counter": self.transfer_counter,
+            "arbitrage_counter": self.arbitrage_counter
         }
         
-        # Convert balances to serializable format
-        for exchange, assets in self.balances.items():
-            state["balances"][exchange] = {}
-            for asset, balance in assets.items():
-                state["balances"][exchange][asset] = {
-                    "available": str(balance.available),
-                    "locked": str(balance.locked)
-                }
+        with self._write_cond:
+            if self._pending_write is not None:
+                queued_trade_rows, queued_transfer_rows, _ = self._pending_write
+                trade_rows = queued_trade_rows + trade_rows
+                transfer_rows = queued_transfer_rows + transfer_rows
+            self._pending_write = (trade_rows, transfer_rows, state)
+            self._write_cond.notify_all()
+            
+    def _wait_for_writer(self):
+        """Block until every queued save has been written"""
+        with self._write_cond:
+            self._write_cond.wait_for(lambda: self._pending_write is None and not self._writing)
+            
+    def _writer_loop(self):
+        """Writer thread body: write queued snapshots until close()"""
+        while True:
+            with self._write_cond:
+                self._write_cond.wait_for(lambda: self._pending_write is not None or self._closing)
+                if self._pending_write is None:
+                    return
+                pending, self._pending_write = self._pending_write, None
+                self._writing = True
+            try:
+                self._write_state(*pending)
+            except Exception as e:
+                logger.error(f"Failed to save simulation state: {e}")
+            finally:
+                with self._write_cond:
+                    self._writing = False
+                    self._write_cond.notify_all()
+                    
+    def _write_state(self, trade_rows: bytearray, transfer_rows: bytearray, state: Dict):
+        """Append history rows to the logs, then replace the snapshot"""
+        for fp, rows in ((self._trades_fp, trade_rows), (self._transfers_fp, transfer_rows)):
+            if rows:
+                fp.write(rows)
+                fp.flush()
                 
-        with open(self.state_file, "w") as f:
-            json.dump(state, f, indent=2)
+        if self._pickle_state:
+            payload = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+        elif orjson is not None:
+            payload = orjson.dumps(state)
+        else:
+            payload = json.dumps(state, separators=(",", ":")).encode()
+            
+        # Write a temp file and swap it in, so a crash mid-write never
+        # leaves a truncated state file behind
+        with open(self._tmp_state_file, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(self._tmp_state_file, self.state_file)
             
     def load_state(self):
         """Load state from file"""
         try:
-            with open(self.state_file, "r") as f:
-                state = json.load(f)
+            with open(self.state_file, "rb") as f:
+                data = f.read()
+            if self._pickle_state:
+                state = pickle.loads(data)
+            elif orjson is not None:
+                state = orjson.loads(data)
+            else:
+                state = json.loads(data)
                 
             # Restore balances
             self.balances = {}
+            self._balance_index.clear()
             for exchange, assets in state.get("balances", {}).items():
-                self.balances[exchange] = {}
-                for asset, data in assets.items():
-                    self.balances[exchange][asset] = VirtualBalance(
+                self._exchange_balances(exchange).load({
+                    asset: VirtualBalance(
                         asset=asset,
-                        available=Decimal(data["available"]),
-                        locked=Decimal(data.get("locked", "0"))
+                        available_units=to_minor_units(Decimal(data["available"])),
+                        locked_units=to_minor_units(Decimal(data.get("locked", "0")))
                     )
-                    
-            # Restore counters
-            self.trade_counter = state.get("trade_counter", 0)
-            self.transfer_counter = state.get("transfer_counter", 0)
+                    for asset, data in assets.items()
+                })
+                
+            self._migrate_legacy_history(state)
             
-            # Note: We're not restoring trade/transfer history for simplicity
-            # Could be added if needed
+            # Restore recent history from the append-only logs. Only the
+            # lines kept in memory are parsed; the rest are just counted
+            trade_lines = self._read_log(self.trades_log)
+            transfer_lines = self._read_log(self.transfers_log)
+            self.trades = deque(
+                (SimulatedTrade.from_dict(_decode_row(line)) for line in self._history_tail(trade_lines)),
+                maxlen=self.history_limit
+            )
+            self.transfers = deque(
+                (SimulatedTransfer.from_dict(_decode_row(line)) for line in self._history_tail(transfer_lines)),
+                maxlen=self.history_limit
+            )
+            
+            # Restore counters. Each save appends to the logs before it
+            # replaces the snapshot, so after a crash the logs may be ahead
+            self.trade_counter = max(state.get("trade_counter", 0), len(trade_lines))
+            self.transfer_counter = max(state.get("transfer_counter", 0), len(transfer_lines))
+            arb_ids = [record.arb_id for record in chain(self.trades, self.transfers)
+                       if record.arb_id is not None]
+            self.arbitrage_counter = max([state.get("arbitrage_counter", 0), *arb_ids])
             
             logger.info("Loaded simulation state from file")
             
         except Exception as e:
             logger.error(f"Failed to load simulation state: {e}")
             
+    def _migrate_legacy_history(self, state: Dict):
+        """Move history from an old snapshot into the NDJSON logs
+        
+        Snapshots written before the logs existed hold the full "trades" and
+        "transfers" lists. The next save drops those keys, so they are
+        replayed into any log that doesn't exist yet before that happens.
+        """
+        for key, path, record_type in (("trades", self.trades_log, SimulatedTrade),
+                                       ("transfers", self.transfers_log, SimulatedTransfer)):
+            records = state.get(key)
+            if not records or os.path.exists(path):
+                continue
+            rows = b"".join(_encode_row(record_type.from_dict(record)) for record in records)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(rows)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+            logger.info("Migrated {} {} from the state snapshot to {}", len(records), key, path)
+            
+    def _add_known_assets(self):
+        """Make sure every asset in known_assets has a balance entry"""
+        for exchange, assets in self.known_assets.items():
+            balances = self._exchange_balances(exchange)
+            for asset in assets:
+                balances[asset]  # Created at zero if missing
+                
+    def _history_tail(self, lines: List[bytes]) -> List[bytes]:
+        """The log lines that fit in memory under history_limit"""
+        if self.history_limit is None:
+            return lines
+        return lines[-self.history_limit:] if self.history_limit else []
+        
+    def _read_log(self, path: str) -> List[bytes]:
+        """Non-empty lines of an NDJSON history log, unparsed"""
+        if not os.path.exists(path):
+            return []
+        with open(path, "rb") as f:
+            return [line for line in f.read().splitlines() if line.strip()]
+            
+    def _open_logs(self, mode: str):
+        """Open the trade and transfer logs; "wb" starts them empty"""
+        self._trades_fp = open(self.trades_log, mode)
+        self._transfers_fp = open(self.transfers_log, mode)
+        # NDJSON rows recorded since the last save_state
+        self._pending_trade_rows = bytearray()
+        self._pending_transfer_rows = bytearray()
+        
+    @contextmanager
+    def arbitrage_cycle(self):
+        """Tag every trade and transfer recorded inside the block with one arb_id
+        
+        The id is held in a context variable, so concurrent asyncio tasks
+        each keep their own cycle.
+        """
+        self.arbitrage_counter += 1
+        token = _current_arb_id.set(self.arbitrage_counter)
+        try:
+            yield self.arbitrage_counter
+        finally:
+            _current_arb_id.reset(token)
+            
     def reset_state(self, initial_balances: Dict[str, Dict[str, Decimal]]):
         """Reset to initial state"""
+        self._wait_for_writer()  # The writer must be done with the old logs
         self.balances = {}
-        self.trades = []
-        self.transfers = []
+        self._balance_index.clear()
+        self.trades = deque(maxlen=self.history_limit)
+        self.transfers = deque(maxlen=self.history_limit)
         self.trade_counter = 0
         self.transfer_counter = 0
         
+        self._trades_fp.close()
+        self._transfers_fp.close()
+        self._open_logs("wb")
+        
         for exchange, assets in initial_balances.items():
-            self.balances[exchange] = {}
+            balances = self._exchange_balances(exchange)
             for asset, amount in assets.items():
-                self.balances[exchange][asset] = VirtualBalance(
-                    asset=asset,
-                    available=amount
-                )
-                
+                balances[asset].available_units = to_minor_units(amount)
+        self._add_known_assets()
+        
         self.save_state()
         logger.info("Reset simulation state to initial balances")
         
     def _log_all_balances(self):
         """Log all current balances"""
         for exchange, balances in self.balances.items():
-            logger.info(f"{exchange.upper()} balances:")
+            logger.info("{} balances:", exchange.upper())
             for asset, balance in balances.items():
-                if balance.total > 0:
-                    logger.info(f"  {asset}: {balance.available} available, {balance.locked} locked")
\ No newline at end of file
+                if balance.available_units + balance.locked_units > 0:
+                    # Lazy: available/locked build Decimals on access
+                    logger.opt(lazy=True).info("  {}: {} available, {} locked", lambda: asset,
+                                               lambda: balance.available, lambda: balance.locked)
\ No newline at end of file
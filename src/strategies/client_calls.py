@@ -0,0 +1,96 @@
+from typing import Callable, Dict, Tuple
+import asyncio
+import functools
+
+from .waiting import wait_or_timeout
+
+
+# Order states after which a market order will not fill any further
+_UPBIT_FINAL_STATES = ('done', 'cancel')
+_BINANCE_FINAL_STATUSES = ('FILLED', 'CANCELED', 'REJECTED', 'EXPIRED')
+# Backoff between order status checks, the last delay repeats
+_FILL_POLL_DELAYS = (0.05, 0.2, 0.5, 1.0)
+
+
+class ClientCallsMixin:
+    """Exchange client calls for the strategies, kept off the event loop
+    
+    The clients are synchronous, so every call that can wait on the network
+    runs on the default executor. A strategy using this sets
+    is_paper_trading, _clients (exchange name -> client),
+    max_concurrent_requests, _request_semaphores and order_fill_timeout in
+    its __init__.
+    """
+    
+    async def _run_blocking(self, exchange: str, func: Callable, *args, **kwargs):
+        """Run a blocking client call on the default executor
+        
+        Used as is for market data and order lookups, which paper trading
+        clients also fetch from the real exchange APIs.
+        """
+        semaphore = self._request_semaphores.get(exchange)
+        if semaphore is None:
+            semaphore = self._request_semaphores[exchange] = asyncio.Semaphore(self.max_concurrent_requests)
+        call = functools.partial(func, *args, **kwargs)
+        async with semaphore:
+            return await asyncio.get_running_loop().run_in_executor(None, call)
+    
+    async def _run_account_call(self, exchange: str, func: Callable, *args, **kwargs):
+        """Run a client call that reads or changes account balances
+        
+        Paper trading clients serve these from the VirtualBalanceManager,
+        which is only safe to touch from the loop thread, so they are
+        called inline; live calls go to the executor.
+        """
+        if self.is_paper_trading:
+            return func(*args, **kwargs)
+        return await self._run_blocking(exchange, func, *args, **kwargs)
+    
+    async def _run_order(self, exchange: str, func: Callable, *args, **kwargs):
+        """Run an order or withdrawal"""
+        return await self._run_account_call(exchange, func, *args, **kwargs)
+    
+    async def _run_market_order(self, exchange: str, order: str, **kwargs):
+        """Place a market order through the client's place_<order> method
+        
+        Paper trading clients price the order from real market data, so
+        their quote_<order> runs on the executor first and only the fill
+        against the virtual balances runs inline.
+        """
+        client = self._clients[exchange]
+        if self.is_paper_trading:
+            kwargs['exec_price'] = await self._run_blocking(
+                exchange, getattr(client, f"quote_{order}"), **kwargs)
+        return await self._run_order(exchange, getattr(client, f"place_{order}"), **kwargs)
+    
+    async def _wait_for_upbit_fill(self, order: Dict) -> Dict:
+        if order.get('state') in _UPBIT_FINAL_STATES:
+            return order
+        return await self._wait_for_fill(
+            'upbit', order, 'state', _UPBIT_FINAL_STATES,
+            self._clients['upbit'].get_order, order['uuid']
+        )
+        
+    async def _wait_for_binance_fill(self, order: Dict) -> Dict:
+        if order.get('status') in _BINANCE_FINAL_STATUSES:
+            return order
+        return await self._wait_for_fill(
+            'binance', order, 'status', _BINANCE_FINAL_STATUSES,
+            self._clients['binance'].get_order, order['symbol'], order['orderId']
+        )
+        
+    async def _wait_for_fill(self, exchange: str, order: Dict, state_key: str,
+                             final_states: Tuple[str, ...], get_order: Callable, *args) -> Dict:
+        """Poll an order with backoff until it reaches a final state, return the last status"""
+        async def poll() -> Dict:
+            current = order
+            delays = iter(_FILL_POLL_DELAYS)
+            while current.get(state_key) not in final_states:
+                await asyncio.sleep(next(delays, _FILL_POLL_DELAYS[-1]))
+                current = await self._run_blocking(exchange, get_order, *args)
+            return current
+            
+        return await wait_or_timeout(
+            poll(), self.order_fill_timeout,
+            f"Order {args[-1]} not filled on {exchange.capitalize()}"
+        )
@@ -1,13 +1,47 @@
-from typing import Dict, Optional, Tuple
+from typing import Awaitable, Callable, Dict, Optional, Tuple
 from decimal import Decimal
 from datetime import datetime, timedelta
+from collections import Counter
+from types import MappingProxyType
 import asyncio
+import time
 from loguru import logger
 from enum import Enum
 
 from ..api.binance_client import BinanceClient
 from ..api.upbit_client import UpbitClient
 from ..utils.premium_calculator import ArbitrageOpportunity
+from .client_calls import ClientCallsMixin
+from .trade_record import TradeRecord
+from .waiting import wait_or_timeout
+
+
+# Network selection for different coins
+_NETWORK_MAP = {
+    'BTC': 'BTC',
+    'ETH': 'ETH',
+    'USDT': 'TRC20',  # TRC20 is faster and cheaper
+    'XRP': 'XRP',
+    'ADA': 'ADA',
+    'SOL': 'SOL',
+    'DOT': 'DOT',
+    'AVAX': 'AVAX-C'
+}
+
+_NETWORK_FEES = {
+    "BTC": Decimal("0.0005"),
+    "ETH": Decimal("0.005"),
+    "XRP": Decimal("0.25"),
+    "USDT": Decimal("1.0"),
+    "ADA": Decimal("1.0"),
+    "SOL": Decimal("0.01"),
+    "DOT": Decimal("0.1"),
+    "AVAX": Decimal("0.01")
+}
+_DEFAULT_NETWORK_FEE = Decimal("1.0")
+
+# Balance reported for assets missing from an exchange's account list
+_ZERO_BALANCE = MappingProxyType({'free': Decimal("0"), 'locked': Decimal("0"), 'total': Decimal("0")})
 
 
 class TradeStatus(Enum):
@@ -21,7 +55,7 @@ class TradeStatus(Enum):
     FAILED = "failed"
 
 
-class ForwardArbitrageStrategy:
+class ForwardArbitrageStrategy(ClientCallsMixin):
     """
     Forward Arbitrage Strategy (Reverse Premium)
     Buy on Upbit (cheaper) → Transfer to Binance → Sell for USDT → Transfer USDT to Upbit → Sell for KRW
@@ -39,47 +73,79 @@ class ForwardArbitrageStrategy:
         self.is_paper_trading = is_paper_trading
         # Use 1 minute for paper trading, otherwise use configured timeout
         self.paper_trading_transfer_time = 60  # seconds
+        # One balance watcher per exchange serves every pending deposit
+        self.balance_poll_interval = 10  # seconds
+        self._clients = {'binance': binance_client, 'upbit': upbit_client}
+        self._balance_watchers: Dict[str, asyncio.Task] = {}
+        self._balance_conditions: Dict[str, asyncio.Condition] = {}
+        self._watched_coins: Dict[str, Counter] = {'binance': Counter(), 'upbit': Counter()}
+        # Latest balances each watcher observed, with the monotonic time their fetch started
+        self._last_balance: Dict[str, Tuple[float, Dict[str, Dict[str, Decimal]]]] = {}
+        # Cap on overlapping REST calls per exchange
+        self.max_concurrent_requests = 4
+        self._request_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.order_fill_timeout = 10  # seconds
+        # All balances of an exchange come from one call and are shared for a short time;
+        # orders and withdrawals bump the version so stale snapshots are never reused
+        self.balance_cache_ttl = 2  # seconds
+        self._balance_cache: Dict[str, Tuple[float, Dict[str, Dict[str, Decimal]]]] = {}
+        self._balance_version = 0
+        self._balance_locks: Dict[str, asyncio.Lock] = {}
         
-    async def execute_arbitrage(self, opportunity: ArbitrageOpportunity) -> Dict:
+    async def execute_arbitrage(self, opportunity: ArbitrageOpportunity) -> TradeRecord:
         trade_id = f"forward_{opportunity.coin_symbol}_{datetime.now().timestamp()}"
+        # Durations come from the monotonic clock; the datetimes are for display
+        started = time.monotonic()
         
-        trade_record = {
-            'id': trade_id,
-            'opportunity': opportunity,
-            'status': TradeStatus.PENDING,
-            'start_time': datetime.now(),
-            'steps': []
-        }
+        trade_record = TradeRecord(
+            id=trade_id,
+            opportunity=opportunity,
+            status=TradeStatus.PENDING,
+            start_time=datetime.now()
+        )
         
         self.active_trades[trade_id] = trade_record
         
+        # Deposit addresses don't depend on the orders, so fetch them while
+        # the Upbit buy is in flight
+        coin = opportunity.coin_symbol
+        binance_address = asyncio.create_task(self._run_blocking(
+            'binance', self.binance.get_deposit_address,
+            coin=coin, network=self._get_optimal_network(coin)
+        ))
+        upbit_address = asyncio.create_task(self._run_blocking(
+            'upbit', self.upbit.get_deposit_address, 'USDT'
+        ))
+        
         try:
             # Step 1: Buy coin on Upbit
             await self._buy_on_upbit(trade_record)
             
             # Step 2: Transfer coin to Binance
-            await self._transfer_to_binance(trade_record)
+            await self._transfer_to_binance(trade_record, binance_address)
             
             # Step 3: Sell coin for USDT on Binance
             await self._sell_on_binance(trade_record)
             
             # Step 4: Transfer USDT to Upbit
-            await self._transfer_usdt_to_upbit(trade_record)
+            await self._transfer_usdt_to_upbit(trade_record, upbit_address)
             
             # Step 5: Sell USDT for KRW on Upbit
             await self._sell_usdt_on_upbit(trade_record)
             
-            trade_record['status'] = TradeStatus.COMPLETED
-            trade_record['end_time'] = datetime.now()
-            trade_record['profit'] = self._calculate_profit(trade_record)
+            trade_record.status = TradeStatus.COMPLETED
+            trade_record.end_time = datetime.now()
+            trade_record.duration = time.monotonic() - started
+            trade_record.profit = self._calculate_profit(trade_record)
             
             logger.info(f"Forward arbitrage completed successfully: {trade_record}")
             return trade_record
             
         except Exception as e:
-            trade_record['status'] = TradeStatus.FAILED
-            trade_record['error'] = str(e)
-            trade_record['end_time'] = datetime.now()
+            trade_record.status = TradeStatus.FAILED
+            trade_record.error = str(e)
+            trade_record.end_time = datetime.now()
+            trade_record.duration = time.monotonic() - started
             logger.error(f"Forward arbitrage failed: {e}")
             
             # Attempt recovery if possible
@@ -87,35 +153,85 @@ class ForwardArbitrageStrategy:
             
             return trade_record
             
-    async def _buy_on_upbit(self, trade_record: Dict):
-        trade_record['status'] = TradeStatus.BUYING_UPBIT
-        opportunity = trade_record['opportunity']
+        finally:
+            self._discard_prefetch(binance_address, upbit_address)
+            
+    @staticmethod
+    def _discard_prefetch(*tasks: asyncio.Task):
+        # Cancel fetches a failed trade never reached, and retrieve errors
+        # so they aren't reported as unhandled
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                task.exception()
+                
+    async def _run_order(self, exchange: str, func: Callable, *args, **kwargs):
+        """Run an order or withdrawal, then drop the cached balances
+        
+        Withdrawals credit the other exchange, so both caches are dropped.
+        """
+        try:
+            return await super()._run_order(exchange, func, *args, **kwargs)
+        finally:
+            self._balance_version += 1
+            self._balance_cache.clear()
+            
+    async def _all_balances(self, exchange: str,
+                            since: float = 0.0) -> Tuple[float, Dict[str, Dict[str, Decimal]]]:
+        """All balances of an exchange and the monotonic time their fetch started
+        
+        A snapshot is shared for balance_cache_ttl seconds, unless it was
+        fetched before `since`.
+        """
+        lock = self._balance_locks.get(exchange)
+        if lock is None:
+            lock = self._balance_locks[exchange] = asyncio.Lock()
+            
+        async with lock:
+            cached = self._balance_cache.get(exchange)
+            if (cached is not None and cached[0] >= since
+                    and time.monotonic() - cached[0] < self.balance_cache_ttl):
+                return cached
+                
+            version = self._balance_version
+            fetched_at = time.monotonic()
+            balances = await self._run_account_call(exchange, self._clients[exchange].get_balances)
+            # An order placed during the fetch may not be reflected in it
+            if self._balance_version == version:
+                self._balance_cache[exchange] = (fetched_at, balances)
+            return fetched_at, balances
+            
+    async def _get_balance(self, exchange: str, coin: str) -> Dict[str, Decimal]:
+        return (await self._all_balances(exchange))[1].get(coin, _ZERO_BALANCE)
+        
+    async def _buy_on_upbit(self, trade_record: TradeRecord):
+        trade_record.status = TradeStatus.BUYING_UPBIT
+        opportunity = trade_record.opportunity
         
         try:
             # Get current market price
             ticker = f"KRW-{opportunity.coin_symbol}"
-            current_price = self.upbit.get_ticker_price(ticker)
+            current_price = await self._run_blocking('upbit', self.upbit.get_ticker_price, ticker)
             
             # Check slippage
             expected_price = current_price  # You might want to use orderbook for better accuracy
             
             # Execute market buy
-            order = self.upbit.place_market_buy_order(
+            order = await self._run_market_order(
+                'upbit', 'market_buy_order',
                 ticker=ticker,
                 amount_krw=opportunity.trade_amount_krw
             )
-            
-            # Wait for order to fill
-            await asyncio.sleep(2)  # Give time for order to fill
+            order = await self._wait_for_upbit_fill(order)
             
             # Record the step
-            trade_record['steps'].append({
-                'step': 'buy_upbit',
-                'timestamp': datetime.now(),
-                'order': order,
-                'amount_krw': opportunity.trade_amount_krw,
-                'executed_price': current_price
-            })
+            trade_record.add_step(
+                'buy_upbit',
+                order=order,
+                amount_krw=opportunity.trade_amount_krw,
+                executed_price=current_price
+            )
             
             logger.info(f"Bought {opportunity.coin_symbol} on Upbit: {order}")
             
@@ -123,23 +239,21 @@ class ForwardArbitrageStrategy:
             logger.error(f"Failed to buy on Upbit: {e}")
             raise
             
-    async def _transfer_to_binance(self, trade_record: Dict):
-        trade_record['status'] = TradeStatus.TRANSFERRING_TO_BINANCE
-        opportunity = trade_record['opportunity']
+    async def _transfer_to_binance(self, trade_record: TradeRecord, deposit_address: Awaitable[Dict]):
+        trade_record.status = TradeStatus.TRANSFERRING_TO_BINANCE
+        opportunity = trade_record.opportunity
         
         try:
-            # Get Binance deposit address
-            deposit_info = self.binance.get_deposit_address(
-                coin=opportunity.coin_symbol,
-                network=self._get_optimal_network(opportunity.coin_symbol)
-            )
+            # Binance deposit address, prefetched during the buy
+            deposit_info = await deposit_address
             
             # Get actual coin balance
-            balance = self.upbit.get_balance(opportunity.coin_symbol)
+            balance = await self._get_balance('upbit', opportunity.coin_symbol)
             transfer_amount = balance['free'] * Decimal("0.999")  # Keep small amount for fees
             
             # Initiate withdrawal from Upbit
-            withdrawal = self.upbit.withdraw(
+            withdrawal = await self._run_order(
+                'upbit', self.upbit.withdraw,
                 currency=opportunity.coin_symbol,
                 amount=transfer_amount,
                 address=deposit_info['address'],
@@ -147,13 +261,12 @@ class ForwardArbitrageStrategy:
                 transaction_type='default'
             )
             
-            trade_record['steps'].append({
-                'step': 'transfer_to_binance',
-                'timestamp': datetime.now(),
-                'withdrawal': withdrawal,
-                'amount': transfer_amount,
-                'address': deposit_info['address']
-            })
+            trade_record.add_step(
+                'transfer_to_binance',
+                withdrawal=withdrawal,
+                amount=transfer_amount,
+                address=deposit_info['address']
+            )
             
             # Wait for deposit to arrive
             await self._wait_for_binance_deposit(
@@ -168,30 +281,31 @@ class ForwardArbitrageStrategy:
             logger.error(f"Failed to transfer to Binance: {e}")
             raise
             
-    async def _sell_on_binance(self, trade_record: Dict):
-        trade_record['status'] = TradeStatus.SELLING_BINANCE
-        opportunity = trade_record['opportunity']
+    async def _sell_on_binance(self, trade_record: TradeRecord):
+        trade_record.status = TradeStatus.SELLING_BINANCE
+        opportunity = trade_record.opportunity
         
         try:
             # Get current balance
-            balance = self.binance.get_balance(opportunity.coin_symbol)
+            balance = await self._get_balance('binance', opportunity.coin_symbol)
             sell_amount = balance['free']
             
             # Execute market sell
             symbol = f"{opportunity.coin_symbol}USDT"
-            order = self.binance.place_market_order(
+            order = await self._run_market_order(
+                'binance', 'market_order',
                 symbol=symbol,
                 side='SELL',
                 quantity=sell_amount
             )
+            order = await self._wait_for_binance_fill(order)
             
-            trade_record['steps'].append({
-                'step': 'sell_binance',
-                'timestamp': datetime.now(),
-                'order': order,
-                'amount': sell_amount,
-                'symbol': symbol
-            })
+            trade_record.add_step(
+                'sell_binance',
+                order=order,
+                amount=sell_amount,
+                symbol=symbol
+            )
             
             logger.info(f"Sold {opportunity.coin_symbol} on Binance: {order}")
             
@@ -199,19 +313,20 @@ class ForwardArbitrageStrategy:
             logger.error(f"Failed to sell on Binance: {e}")
             raise
             
-    async def _transfer_usdt_to_upbit(self, trade_record: Dict):
-        trade_record['status'] = TradeStatus.TRANSFERRING_TO_UPBIT
+    async def _transfer_usdt_to_upbit(self, trade_record: TradeRecord, deposit_address: Awaitable[Dict]):
+        trade_record.status = TradeStatus.TRANSFERRING_TO_UPBIT
         
         try:
             # Get USDT balance
-            balance = self.binance.get_balance('USDT')
+            balance = await self._get_balance('binance', 'USDT')
             transfer_amount = balance['free'] - Decimal("1")  # Keep 1 USDT for fees
             
-            # Get Upbit USDT deposit address
-            deposit_info = self.upbit.get_deposit_address('USDT')
+            # Upbit USDT deposit address, prefetched at the start of the trade
+            deposit_info = await deposit_address
             
             # Initiate withdrawal from Binance
-            withdrawal = self.binance.withdraw(
+            withdrawal = await self._run_order(
+                'binance', self.binance.withdraw,
                 coin='USDT',
                 address=deposit_info['deposit_address'],
                 amount=transfer_amount,
@@ -219,13 +334,12 @@ class ForwardArbitrageStrategy:
                 tag=deposit_info.get('secondary_address')
             )
             
-            trade_record['steps'].append({
-                'step': 'transfer_usdt_to_upbit',
-                'timestamp': datetime.now(),
-                'withdrawal': withdrawal,
-                'amount': transfer_amount,
-                'network': 'TRC20'
-            })
+            trade_record.add_step(
+                'transfer_usdt_to_upbit',
+                withdrawal=withdrawal,
+                amount=transfer_amount,
+                network='TRC20'
+            )
             
             # Wait for deposit to arrive
             await self._wait_for_upbit_deposit('USDT', transfer_amount, withdrawal['id'])
@@ -236,26 +350,27 @@ class ForwardArbitrageStrategy:
             logger.error(f"Failed to transfer USDT to Upbit: {e}")
             raise
             
-    async def _sell_usdt_on_upbit(self, trade_record: Dict):
-        trade_record['status'] = TradeStatus.SELLING_USDT_UPBIT
+    async def _sell_usdt_on_upbit(self, trade_record: TradeRecord):
+        trade_record.status = TradeStatus.SELLING_USDT_UPBIT
         
         try:
             # Get USDT balance
-            balance = self.upbit.get_balance('USDT')
+            balance = await self._get_balance('upbit', 'USDT')
             sell_amount = balance['free']
             
             # Execute market sell
-            order = self.upbit.place_market_sell_order(
+            order = await self._run_market_order(
+                'upbit', 'market_sell_order',
                 ticker='KRW-USDT',
                 volume=sell_amount
             )
+            order = await self._wait_for_upbit_fill(order)
             
-            trade_record['steps'].append({
-                'step': 'sell_usdt_upbit',
-                'timestamp': datetime.now(),
-                'order': order,
-                'amount': sell_amount
-            })
+            trade_record.add_step(
+                'sell_usdt_upbit',
+                order=order,
+                amount=sell_amount
+            )
             
             logger.info(f"Sold USDT on Upbit: {order}")
             
@@ -275,26 +390,7 @@ class ForwardArbitrageStrategy:
             return
             
         # Real trading logic
-        start_time = datetime.now()
-        initial_balance = self.binance.get_balance(coin)['total']
-        
-        while datetime.now() - start_time < self.transfer_timeout:
-            try:
-                current_balance = self.binance.get_balance(coin)['total']
-                
-                if current_balance > initial_balance:
-                    # Check if the increase matches expected amount (with some tolerance)
-                    if current_balance - initial_balance >= amount * Decimal("0.99"):
-                        logger.info(f"Deposit confirmed on Binance: {coin}")
-                        return
-                        
-                await asyncio.sleep(30)  # Check every 30 seconds
-                
-            except Exception as e:
-                logger.warning(f"Error checking Binance balance: {e}")
-                await asyncio.sleep(30)
-                
-        raise TimeoutError(f"Deposit timeout: {coin} not received on Binance")
+        await self._wait_for_deposit('binance', coin, amount)
         
     async def _wait_for_upbit_deposit(self, currency: str, amount: Decimal,
                                     withdrawal_id: str):
@@ -308,64 +404,84 @@ class ForwardArbitrageStrategy:
             return
             
         # Real trading logic
-        start_time = datetime.now()
-        initial_balance = self.upbit.get_balance(currency)['total']
+        await self._wait_for_deposit('upbit', currency, amount)
         
-        while datetime.now() - start_time < self.transfer_timeout:
-            try:
-                current_balance = self.upbit.get_balance(currency)['total']
-                
-                if current_balance > initial_balance:
-                    # Check if the increase matches expected amount (with some tolerance)
-                    if current_balance - initial_balance >= amount * Decimal("0.99"):
-                        logger.info(f"Deposit confirmed on Upbit: {currency}")
-                        return
-                        
-                await asyncio.sleep(30)  # Check every 30 seconds
+    async def _wait_for_deposit(self, exchange: str, coin: str, amount: Decimal):
+        """Wait until the shared balance watcher sees the deposit land"""
+        # The baseline and every balance checked against it must be fetched
+        # after this point, i.e. after the withdrawal was made
+        registered_at = time.monotonic()
+        _, balances = await self._all_balances(exchange, since=registered_at)
+        target_balance = balances.get(coin, _ZERO_BALANCE)['total'] + amount * Decimal("0.99")
+        
+        def arrived() -> bool:
+            observed = self._last_balance.get(exchange)
+            return (observed is not None and observed[0] >= registered_at
+                    and observed[1].get(coin, _ZERO_BALANCE)['total'] >= target_balance)
+            
+        watched = self._watched_coins[exchange]
+        watched[coin] += 1
+        condition = self._balance_condition(exchange)
+        watcher = self._balance_watchers.get(exchange)
+        if watcher is None or watcher.done():
+            self._balance_watchers[exchange] = asyncio.create_task(self._balance_watcher(exchange))
+            
+        try:
+            async with condition:
+                await wait_or_timeout(
+                    condition.wait_for(arrived), self.transfer_timeout.total_seconds(),
+                    f"Deposit timeout: {coin} not received on {exchange.capitalize()}"
+                )
+            logger.info(f"Deposit confirmed on {exchange.capitalize()}: {coin}")
+        finally:
+            watched[coin] -= 1
+            if watched[coin] <= 0:
+                del watched[coin]
                 
+    def _balance_condition(self, exchange: str) -> asyncio.Condition:
+        # Created lazily so it binds to the running event loop
+        condition = self._balance_conditions.get(exchange)
+        if condition is None:
+            condition = self._balance_conditions[exchange] = asyncio.Condition()
+        return condition
+        
+    async def _balance_watcher(self, exchange: str):
+        """Publish the latest balances while any deposit is awaited and wake the waiters"""
+        watched = self._watched_coins[exchange]
+        condition = self._balance_condition(exchange)
+        
+        while watched:
+            await asyncio.sleep(self.balance_poll_interval)
+            try:
+                observed = await self._all_balances(exchange)
             except Exception as e:
-                logger.warning(f"Error checking Upbit balance: {e}")
-                await asyncio.sleep(30)
+                logger.warning(f"Error checking {exchange.capitalize()} balance: {e}")
+                continue
                 
-        raise TimeoutError(f"Deposit timeout: {currency} not received on Upbit")
+            latest = self._last_balance.get(exchange)
+            if latest is None or observed[0] > latest[0]:
+                self._last_balance[exchange] = observed
+                async with condition:
+                    condition.notify_all()
         
-    def _get_optimal_network(self, coin: str) -> str:
-        # Network selection for different coins
-        network_map = {
-            'BTC': 'BTC',
-            'ETH': 'ETH',
-            'USDT': 'TRC20',  # TRC20 is faster and cheaper
-            'XRP': 'XRP',
-            'ADA': 'ADA',
-            'SOL': 'SOL',
-            'DOT': 'DOT',
-            'AVAX': 'AVAX-C'
-        }
-        return network_map.get(coin, coin)
+    @staticmethod
+    def _get_optimal_network(coin: str) -> str:
+        return _NETWORK_MAP.get(coin, coin)
         
-    def _get_network_fee(self, coin: str) -> Decimal:
+    @staticmethod
+    def _get_network_fee(coin: str) -> Decimal:
         """Get network fee for a coin"""
-        network_fees = {
-            "BTC": Decimal("0.0005"),
-            "ETH": Decimal("0.005"),
-            "XRP": Decimal("0.25"),
-            "USDT": Decimal("1.0"),
-            "ADA": Decimal("1.0"),
-            "SOL": Decimal("0.01"),
-            "DOT": Decimal("0.1"),
-            "AVAX": Decimal("0.01")
-        }
-        return network_fees.get(coin, Decimal("1.0"))  # Default fee
+        return _NETWORK_FEES.get(coin, _DEFAULT_NETWORK_FEE)
         
-    def _calculate_profit(self, trade_record: Dict) -> Dict:
+    def _calculate_profit(self, trade_record: TradeRecord) -> Dict:
         try:
-            initial_krw = trade_record['opportunity'].trade_amount_krw
+            initial_krw = trade_record.opportunity.trade_amount_krw
             
             # Get final KRW amount from last step
-            final_step = trade_record['steps'][-1]
-            if 'order' in final_step:
+            final_step = trade_record.steps[-1]
+            if 'order' in final_step.data:
                 # Estimate final KRW (this should be more accurate with actual order data)
-                final_krw = Decimal(str(final_step['order'].get('executed_funds', 0)))
+                final_krw = Decimal(str(final_step.data['order'].get('executed_funds', 0)))
             else:
                 final_krw = Decimal("0")
                 
@@ -382,16 +498,16 @@ class ForwardArbitrageStrategy:
         except Exception as e:
             logger.error(f"Failed to calculate profit: {e}")
             return {
-                'initial_krw': trade_record['opportunity'].trade_amount_krw,
+                'initial_krw': trade_record.opportunity.trade_amount_krw,
                 'final_krw': Decimal("0"),
                 'profit_krw': Decimal("0"),
                 'profit_rate': Decimal("0")
             }
             
-    async def _attempt_recovery(self, trade_record: Dict):
+    async def _attempt_recovery(self, trade_record: TradeRecord):
         """Attempt to recover from failed trades"""
         try:
-            status = trade_record['status']
+            status = trade_record.status
             
             if status == TradeStatus.TRANSFERRING_TO_BINANCE:
                 # Check if transfer completed
@@ -2,12 +2,16 @@ from typing import Dict, Optional, Tuple
 from decimal import Decimal
 from datetime import datetime, timedelta
 import asyncio
+import time
 from loguru import logger
 from enum import Enum
 
 from ..api.binance_client import BinanceClient
 from ..api.upbit_client import UpbitClient
 from ..utils.premium_calculator import ArbitrageOpportunity
+from .client_calls import ClientCallsMixin
+from .trade_record import TradeRecord
+from .waiting import wait_or_timeout
 
 
 class TradeStatus(Enum):
@@ -22,7 +26,7 @@ class TradeStatus(Enum):
     FAILED = "failed"
 
 
-class ReverseArbitrageStrategy:
+class ReverseArbitrageStrategy(ClientCallsMixin):
     """
     Reverse Arbitrage Strategy (Kimchi Premium)
     Buy USDT → Buy coin on Binance → Transfer to Upbit → Sell for KRW → Buy USDT on Upbit → Transfer back to Binance
@@ -30,23 +34,31 @@ class ReverseArbitrageStrategy:
     
     def __init__(self, binance_client: BinanceClient, upbit_client: UpbitClient,
                  max_slippage: Decimal = Decimal("0.005"),
-                 transfer_timeout_minutes: int = 30):
+                 transfer_timeout_minutes: int = 30,
+                 is_paper_trading: bool = False):
         self.binance = binance_client
         self.upbit = upbit_client
         self.max_slippage = max_slippage
         self.transfer_timeout = timedelta(minutes=transfer_timeout_minutes)
         self.active_trades = {}
+        self.is_paper_trading = is_paper_trading
+        self._clients = {'binance': binance_client, 'upbit': upbit_client}
+        # Cap on overlapping REST calls per exchange
+        self.max_concurrent_requests = 4
+        self._request_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.order_fill_timeout = 10  # seconds
         
-    async def execute_arbitrage(self, opportunity: ArbitrageOpportunity) -> Dict:
+    async def execute_arbitrage(self, opportunity: ArbitrageOpportunity) -> TradeRecord:
         trade_id = f"reverse_{opportunity.coin_symbol}_{datetime.now().timestamp()}"
+        # Durations come from the monotonic clock; the datetimes are for display
+        started = time.monotonic()
         
-        trade_record = {
-            'id': trade_id,
-            'opportunity': opportunity,
-            'status': TradeStatus.PENDING,
-            'start_time': datetime.now(),
-            'steps': []
-        }
+        trade_record = TradeRecord(
+            id=trade_id,
+            opportunity=opportunity,
+            status=TradeStatus.PENDING,
+            start_time=datetime.now()
+        )
         
         self.active_trades[trade_id] = trade_record
         
@@ -69,17 +81,19 @@ class ReverseArbitrageStrategy:
             # Step 6: Transfer USDT back to Binance
             await self._transfer_usdt_to_binance(trade_record)
             
-            trade_record['status'] = TradeStatus.COMPLETED
-            trade_record['end_time'] = datetime.now()
-            trade_record['profit'] = self._calculate_profit(trade_record)
+            trade_record.status = TradeStatus.COMPLETED
+            trade_record.end_time = datetime.now()
+            trade_record.duration = time.monotonic() - started
+            trade_record.profit = self._calculate_profit(trade_record)
             
             logger.info(f"Reverse arbitrage completed successfully: {trade_record}")
             return trade_record
             
         except Exception as e:
-            trade_record['status'] = TradeStatus.FAILED
-            trade_record['error'] = str(e)
-            trade_record['end_time'] = datetime.now()
+            trade_record.status = TradeStatus.FAILED
+            trade_record.error = str(e)
+            trade_record.end_time = datetime.now()
+            trade_record.duration = time.monotonic() - started
             logger.error(f"Reverse arbitrage failed: {e}")
             
             # Attempt recovery if possible
@@ -87,8 +101,8 @@ class ReverseArbitrageStrategy:
             
             return trade_record
             
-    async def _ensure_usdt_balance(self, trade_record: Dict):
-        opportunity = trade_record['opportunity']
+    async def _ensure_usdt_balance(self, trade_record: TradeRecord):
+        opportunity = trade_record.opportunity
         
         try:
             # Convert KRW amount to USDT
@@ -101,50 +115,50 @@ class ReverseArbitrageStrategy:
             required_usdt *= Decimal("1.01")  # Add 1% buffer for price changes
             
             # Check current USDT balance
-            balance = self.binance.get_balance('USDT')
+            balance = await self._run_account_call('binance', self.binance.get_balance, 'USDT')
             
             if balance['free'] < required_usdt:
                 raise ValueError(f"Insufficient USDT balance. Required: {required_usdt}, Available: {balance['free']}")
                 
-            trade_record['steps'].append({
-                'step': 'check_usdt_balance',
-                'timestamp': datetime.now(),
-                'required_usdt': required_usdt,
-                'available_usdt': balance['free']
-            })
+            trade_record.add_step(
+                'check_usdt_balance',
+                required_usdt=required_usdt,
+                available_usdt=balance['free']
+            )
             
         except Exception as e:
             logger.error(f"Failed to ensure USDT balance: {e}")
             raise
             
-    async def _buy_on_binance(self, trade_record: Dict):
-        trade_record['status'] = TradeStatus.BUYING_COIN_BINANCE
-        opportunity = trade_record['opportunity']
+    async def _buy_on_binance(self, trade_record: TradeRecord):
+        trade_record.status = TradeStatus.BUYING_COIN_BINANCE
+        opportunity = trade_record.opportunity
         
         try:
             # Get current market price
             symbol = f"{opportunity.coin_symbol}USDT"
-            current_price = self.binance.get_ticker_price(symbol)
+            current_price = await self._run_blocking('binance', self.binance.get_ticker_price, symbol)
             
             # Calculate quantity to buy
-            usdt_amount = trade_record['steps'][0]['required_usdt']
+            usdt_amount = trade_record.steps[0].data['required_usdt']
             quantity = (usdt_amount / current_price) * Decimal("0.995")  # Account for fees
             
             # Execute market buy
-            order = self.binance.place_market_order(
+            order = await self._run_market_order(
+                'binance', 'market_order',
                 symbol=symbol,
                 side='BUY',
                 quantity=quantity
             )
+            order = await self._wait_for_binance_fill(order)
             
-            trade_record['steps'].append({
-                'step': 'buy_binance',
-                'timestamp': datetime.now(),
-                'order': order,
-                'symbol': symbol,
-                'quantity': quantity,
-                'usdt_spent': usdt_amount
-            })
+            trade_record.add_step(
+                'buy_binance',
+                order=order,
+                symbol=symbol,
+                quantity=quantity,
+                usdt_spent=usdt_amount
+            )
             
             logger.info(f"Bought {opportunity.coin_symbol} on Binance: {order}")
             
@@ -152,16 +166,20 @@ class ReverseArbitrageStrategy:
             logger.error(f"Failed to buy on Binance: {e}")
             raise
             
-    async def _transfer_to_upbit(self, trade_record: Dict):
-        trade_record['status'] = TradeStatus.TRANSFERRING_TO_UPBIT
-        opportunity = trade_record['opportunity']
+    async def _transfer_to_upbit(self, trade_record: TradeRecord):
+        trade_record.status = TradeStatus.TRANSFERRING_TO_UPBIT
+        opportunity = trade_record.opportunity
         
         try:
             # Get Upbit deposit address
-            deposit_info = self.upbit.get_deposit_address(opportunity.coin_symbol)
+            deposit_info = await self._run_blocking(
+                'upbit', self.upbit.get_deposit_address, opportunity.coin_symbol
+            )
             
             # Get actual coin balance
-            balance = self.binance.get_balance(opportunity.coin_symbol)
+            balance = await self._run_account_call(
+                'binance', self.binance.get_balance, opportunity.coin_symbol
+            )
             transfer_amount = balance['free']
             
             # Get withdrawal fee
@@ -169,7 +187,8 @@ class ReverseArbitrageStrategy:
             transfer_amount = transfer_amount - withdrawal_fee
             
             # Initiate withdrawal from Binance
-            withdrawal = self.binance.withdraw(
+            withdrawal = await self._run_order(
+                'binance', self.binance.withdraw,
                 coin=opportunity.coin_symbol,
                 address=deposit_info['deposit_address'],
                 amount=transfer_amount,
@@ -177,14 +196,13 @@ class ReverseArbitrageStrategy:
                 tag=deposit_info.get('secondary_address')
             )
             
-            trade_record['steps'].append({
-                'step': 'transfer_to_upbit',
-                'timestamp': datetime.now(),
-                'withdrawal': withdrawal,
-                'amount': transfer_amount,
-                'fee': withdrawal_fee,
-                'address': deposit_info['deposit_address']
-            })
+            trade_record.add_step(
+                'transfer_to_upbit',
+                withdrawal=withdrawal,
+                amount=transfer_amount,
+                fee=withdrawal_fee,
+                address=deposit_info['deposit_address']
+            )
             
             # Wait for deposit to arrive
             await self._wait_for_upbit_deposit(
@@ -199,32 +217,32 @@ class ReverseArbitrageStrategy:
             logger.error(f"Failed to transfer to Upbit: {e}")
             raise
             
-    async def _sell_on_upbit(self, trade_record: Dict):
-        trade_record['status'] = TradeStatus.SELLING_UPBIT
-        opportunity = trade_record['opportunity']
+    async def _sell_on_upbit(self, trade_record: TradeRecord):
+        trade_record.status = TradeStatus.SELLING_UPBIT
+        opportunity = trade_record.opportunity
         
         try:
             # Get current balance
-            balance = self.upbit.get_balance(opportunity.coin_symbol)
+            balance = await self._run_account_call(
+                'upbit', self.upbit.get_balance, opportunity.coin_symbol
+            )
             sell_amount = balance['free']
             
             # Execute market sell
             ticker = f"KRW-{opportunity.coin_symbol}"
-            order = self.upbit.place_market_sell_order(
+            order = await self._run_market_order(
+                'upbit', 'market_sell_order',
                 ticker=ticker,
                 volume=sell_amount
             )
+            order = await self._wait_for_upbit_fill(order)
             
-            # Wait for order to complete
-            await asyncio.sleep(2)
-            
-            trade_record['steps'].append({
-                'step': 'sell_upbit',
-                'timestamp': datetime.now(),
-                'order': order,
-                'amount': sell_amount,
-                'ticker': ticker
-            })
+            trade_record.add_step(
+                'sell_upbit',
+                order=order,
+                amount=sell_amount,
+                ticker=ticker
+            )
             
             logger.info(f"Sold {opportunity.coin_symbol} on Upbit: {order}")
             
@@ -232,29 +250,27 @@ class ReverseArbitrageStrategy:
             logger.error(f"Failed to sell on Upbit: {e}")
             raise
             
-    async def _buy_usdt_on_upbit(self, trade_record: Dict):
-        trade_record['status'] = TradeStatus.BUYING_USDT_UPBIT
+    async def _buy_usdt_on_upbit(self, trade_record: TradeRecord):
+        trade_record.status = TradeStatus.BUYING_USDT_UPBIT
         
         try:
             # Get KRW balance
-            balance = self.upbit.get_balance('KRW')
+            balance = await self._run_account_call('upbit', self.upbit.get_balance, 'KRW')
             available_krw = balance['free'] - Decimal("10000")  # Keep 10k KRW as buffer
             
             # Execute market buy of USDT
-            order = self.upbit.place_market_buy_order(
+            order = await self._run_market_order(
+                'upbit', 'market_buy_order',
                 ticker='KRW-USDT',
                 amount_krw=available_krw
             )
+            order = await self._wait_for_upbit_fill(order)
             
-            # Wait for order to complete
-            await asyncio.sleep(2)
-            
-            trade_record['steps'].append({
-                'step': 'buy_usdt_upbit',
-                'timestamp': datetime.now(),
-                'order': order,
-                'krw_spent': available_krw
-            })
+            trade_record.add_step(
+                'buy_usdt_upbit',
+                order=order,
+                krw_spent=available_krw
+            )
             
             logger.info(f"Bought USDT on Upbit: {order}")
             
@@ -262,19 +278,22 @@ class ReverseArbitrageStrategy:
             logger.error(f"Failed to buy USDT on Upbit: {e}")
             raise
             
-    async def _transfer_usdt_to_binance(self, trade_record: Dict):
-        trade_record['status'] = TradeStatus.TRANSFERRING_TO_BINANCE
+    async def _transfer_usdt_to_binance(self, trade_record: TradeRecord):
+        trade_record.status = TradeStatus.TRANSFERRING_TO_BINANCE
         
         try:
             # Get USDT balance
-            balance = self.upbit.get_balance('USDT')
+            balance = await self._run_account_call('upbit', self.upbit.get_balance, 'USDT')
             transfer_amount = balance['free'] - Decimal("1")  # Keep 1 USDT for fees
             
             # Get Binance USDT deposit address
-            deposit_info = self.binance.get_deposit_address('USDT', network='TRC20')
+            deposit_info = await self._run_blocking(
+                'binance', self.binance.get_deposit_address, 'USDT', network='TRC20'
+            )
             
             # Initiate withdrawal from Upbit
-            withdrawal = self.upbit.withdraw(
+            withdrawal = await self._run_order(
+                'upbit', self.upbit.withdraw,
                 currency='USDT',
                 amount=transfer_amount,
                 address=deposit_info['address'],
@@ -282,13 +301,12 @@ class ReverseArbitrageStrategy:
                 transaction_type='default'
             )
             
-            trade_record['steps'].append({
-                'step': 'transfer_usdt_to_binance',
-                'timestamp': datetime.now(),
-                'withdrawal': withdrawal,
-                'amount': transfer_amount,
-                'network': 'TRC20'
-            })
+            trade_record.add_step(
+                'transfer_usdt_to_binance',
+                withdrawal=withdrawal,
+                amount=transfer_amount,
+                network='TRC20'
+            )
             
             # Wait for deposit to arrive
             await self._wait_for_binance_deposit('USDT', transfer_amount, withdrawal['uuid'])
@@ -301,55 +319,67 @@ class ReverseArbitrageStrategy:
             
     async def _wait_for_upbit_deposit(self, currency: str, amount: Decimal,
                                     withdrawal_id: str):
-        start_time = datetime.now()
-        initial_balance = self.upbit.get_balance(currency)['total']
+        initial_balance = (await self._run_account_call('upbit', self.upbit.get_balance, currency))['total']
         
-        while datetime.now() - start_time < self.transfer_timeout:
-            try:
-                # Check deposit history
-                deposits = self.upbit.get_deposit_history(currency=currency, limit=10)
-                for deposit in deposits:
-                    if deposit.get('state') == 'accepted' and \
-                       Decimal(deposit.get('amount', 0)) >= amount * Decimal("0.99"):
-                        logger.info(f"Deposit confirmed on Upbit: {currency}")
+        async def poll():
+            while True:
+                try:
+                    # Check deposit history
+                    deposits = await self._run_account_call(
+                        'upbit', self.upbit.get_deposit_history, currency=currency, limit=10
+                    )
+                    for deposit in deposits:
+                        if deposit.get('state') == 'accepted' and \
+                           Decimal(deposit.get('amount', 0)) >= amount * Decimal("0.99"):
+                            logger.info(f"Deposit confirmed on Upbit: {currency}")
+                            return
+                            
+                    # Also check balance increase
+                    current_balance = (await self._run_account_call(
+                        'upbit', self.upbit.get_balance, currency
+                    ))['total']
+                    if current_balance - initial_balance >= amount * Decimal("0.99"):
+                        logger.info(f"Deposit confirmed on Upbit via balance check: {currency}")
                         return
                         
-                # Also check balance increase
-                current_balance = self.upbit.get_balance(currency)['total']
-                if current_balance - initial_balance >= amount * Decimal("0.99"):
-                    logger.info(f"Deposit confirmed on Upbit via balance check: {currency}")
-                    return
+                    await asyncio.sleep(30)  # Check every 30 seconds
                     
-                await asyncio.sleep(30)  # Check every 30 seconds
-                
-            except Exception as e:
-                logger.warning(f"Error checking Upbit deposit: {e}")
-                await asyncio.sleep(30)
-                
-        raise TimeoutError(f"Deposit timeout: {currency} not received on Upbit")
+                except Exception as e:
+                    logger.warning(f"Error checking Upbit deposit: {e}")
+                    await asyncio.sleep(30)
+                    
+        await wait_or_timeout(
+            poll(), self.transfer_timeout.total_seconds(),
+            f"Deposit timeout: {currency} not received on Upbit"
+        )
         
     async def _wait_for_binance_deposit(self, coin: str, amount: Decimal,
                                        withdrawal_id: str):
-        start_time = datetime.now()
-        initial_balance = self.binance.get_balance(coin)['total']
+        initial_balance = (await self._run_account_call('binance', self.binance.get_balance, coin))['total']
         
-        while datetime.now() - start_time < self.transfer_timeout:
-            try:
-                current_balance = self.binance.get_balance(coin)['total']
-                
-                if current_balance > initial_balance:
-                    # Check if the increase matches expected amount (with some tolerance)
-                    if current_balance - initial_balance >= amount * Decimal("0.99"):
-                        logger.info(f"Deposit confirmed on Binance: {coin}")
-                        return
-                        
-                await asyncio.sleep(30)  # Check every 30 seconds
-                
-            except Exception as e:
-                logger.warning(f"Error checking Binance balance: {e}")
-                await asyncio.sleep(30)
-                
-        raise TimeoutError(f"Deposit timeout: {coin} not received on Binance")
+        async def poll():
+            while True:
+                try:
+                    current_balance = (await self._run_account_call(
+                        'binance', self.binance.get_balance, coin
+                    ))['total']
+                    
+                    if current_balance > initial_balance:
+                        # Check if the increase matches expected amount (with some tolerance)
+                        if current_balance - initial_balance >= amount * Decimal("0.99"):
+                            logger.info(f"Deposit confirmed on Binance: {coin}")
+                            return
+                            
+                    await asyncio.sleep(30)  # Check every 30 seconds
+                    
+                except Exception as e:
+                    logger.warning(f"Error checking Binance balance: {e}")
+                    await asyncio.sleep(30)
+                    
+        await wait_or_timeout(
+            poll(), self.transfer_timeout.total_seconds(),
+            f"Deposit timeout: {coin} not received on Binance"
+        )
         
     def _get_optimal_network(self, coin: str) -> str:
         network_map = {
@@ -376,14 +406,14 @@ class ReverseArbitrageStrategy:
         }
         return fees.get(coin, Decimal("0"))
         
-    def _calculate_profit(self, trade_record: Dict) -> Dict:
+    def _calculate_profit(self, trade_record: TradeRecord) -> Dict:
         try:
             # Get initial USDT spent
-            initial_usdt = trade_record['steps'][0]['required_usdt']
+            initial_usdt = trade_record.steps[0].data['required_usdt']
             
             # Get final USDT balance change
-            final_step = [s for s in trade_record['steps'] if s['step'] == 'transfer_usdt_to_binance'][0]
-            returned_usdt = final_step['amount']
+            final_step = [s for s in trade_record.steps if s.step == 'transfer_usdt_to_binance'][0]
+            returned_usdt = final_step.data['amount']
             
             profit_usdt = returned_usdt - initial_usdt
             profit_rate = (profit_usdt / initial_usdt) * 100
@@ -413,10 +443,10 @@ class ReverseArbitrageStrategy:
                 'profit_rate': Decimal("0")
             }
             
-    async def _attempt_recovery(self, trade_record: Dict):
+    async def _attempt_recovery(self, trade_record: TradeRecord):
         """Attempt to recover from failed trades"""
         try:
-            status = trade_record['status']
+            status = trade_record.status
             
             if status == TradeStatus.BUYING_COIN_BINANCE:
                 # Check if order was partially filled
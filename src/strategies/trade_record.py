@@ -0,0 +1,38 @@
+from typing import Dict
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+
+from ..utils.premium_calculator import ArbitrageOpportunity
+
+
+@dataclass
+class TradeStep:
+    """One completed step of an arbitrage, with its order or transfer details"""
+    __slots__ = ("step", "timestamp", "data")
+    
+    step: str
+    timestamp: datetime
+    data: Dict
+
+
+@dataclass
+class TradeRecord:
+    """Progress and outcome of one arbitrage cycle"""
+    __slots__ = ("id", "opportunity", "status", "start_time",
+                 "steps", "end_time", "duration", "profit", "error")
+    
+    id: str
+    opportunity: ArbitrageOpportunity
+    status: Enum
+    start_time: datetime
+    
+    def __post_init__(self):
+        self.steps = []
+        self.end_time = None
+        self.duration = None  # seconds, from the monotonic clock
+        self.profit = None
+        self.error = None
+    
+    def add_step(self, step: str, **data):
+        self.steps.append(TradeStep(step, datetime.now(), data))
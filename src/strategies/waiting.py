@@ -0,0 +1,27 @@
+from typing import Awaitable, TypeVar
+import asyncio
+
+
+T = TypeVar("T")
+
+
+if hasattr(asyncio, "timeout"):
+    async def wait_or_timeout(awaitable: Awaitable[T], seconds: float, message: str) -> T:
+        """Await under a single deadline, raising TimeoutError(message) once it passes
+        
+        The awaitable runs in the caller's task under one timeout context,
+        with no extra task per wait.
+        """
+        try:
+            async with asyncio.timeout(seconds):
+                return await awaitable
+        except TimeoutError:
+            raise TimeoutError(message)
+else:
+    # Python < 3.11 has no asyncio.timeout; wait_for wraps the wait in a task
+    async def wait_or_timeout(awaitable: Awaitable[T], seconds: float, message: str) -> T:
+        """Await under a single deadline, raising TimeoutError(message) once it passes"""
+        try:
+            return await asyncio.wait_for(awaitable, timeout=seconds)
+        except asyncio.TimeoutError:
+            raise TimeoutError(message)
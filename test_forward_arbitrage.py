@@ -0,0 +1,124 @@
+"""Tests for the forward arbitrage strategy's order and deposit waits"""
+
+import asyncio
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+
+from src.strategies.forward_arbitrage import ForwardArbitrageStrategy
+
+
+class _FakeClient:
+    """Exchange client stand-in with scripted order states and settable balances"""
+
+    def __init__(self, order_states=(), balances=None):
+        self._order_states = iter(order_states)
+        self.totals = dict(balances or {})
+        self.order_lookups = 0
+
+    def get_order(self, *args):
+        self.order_lookups += 1
+        state = next(self._order_states)
+        return {'uuid': args[-1], 'state': state, 'symbol': args[0], 'orderId': args[-1], 'status': state}
+
+    def get_balances(self):
+        return {coin: {'free': total, 'locked': Decimal("0"), 'total': total}
+                for coin, total in self.totals.items()}
+
+
+def _strategy(binance=None, upbit=None):
+    strategy = ForwardArbitrageStrategy(binance or _FakeClient(), upbit or _FakeClient())
+    strategy.balance_poll_interval = 0.01
+    strategy.balance_cache_ttl = 0
+    strategy.transfer_timeout = timedelta(seconds=1)
+    return strategy
+
+
+def test_upbit_fill_polls_until_done():
+    upbit = _FakeClient(order_states=('wait', 'wait', 'done'))
+    strategy = _strategy(upbit=upbit)
+
+    order = asyncio.run(strategy._wait_for_upbit_fill({'uuid': 'U1', 'state': 'wait'}))
+
+    assert order['state'] == 'done'
+    assert upbit.order_lookups == 3
+
+
+def test_binance_fill_polls_until_filled():
+    binance = _FakeClient(order_states=('NEW', 'FILLED'))
+    strategy = _strategy(binance=binance)
+
+    order = asyncio.run(strategy._wait_for_binance_fill(
+        {'symbol': 'XRPUSDT', 'orderId': 7, 'status': 'NEW'}))
+
+    assert order['status'] == 'FILLED'
+    assert binance.order_lookups == 2
+
+
+def test_unfilled_order_times_out():
+    upbit = _FakeClient(order_states=iter(lambda: 'wait', None))
+    strategy = _strategy(upbit=upbit)
+    strategy.order_fill_timeout = 0.3
+
+    with pytest.raises(TimeoutError, match="Order U1 not filled on Upbit"):
+        asyncio.run(strategy._wait_for_upbit_fill({'uuid': 'U1', 'state': 'wait'}))
+
+
+def test_concurrent_deposit_waiters_are_all_woken():
+    binance = _FakeClient(balances={'XRP': Decimal("0"), 'USDT': Decimal("0")})
+    strategy = _strategy(binance=binance)
+
+    async def scenario():
+        waiters = [asyncio.create_task(strategy._wait_for_deposit('binance', coin, Decimal("100")))
+                   for coin in ('XRP', 'USDT')]
+        await asyncio.sleep(0.05)
+        assert not any(waiter.done() for waiter in waiters)
+        binance.totals.update(XRP=Decimal("100"), USDT=Decimal("100"))
+        await asyncio.wait_for(asyncio.gather(*waiters), 1)
+
+    asyncio.run(scenario())
+
+
+def test_balance_seen_before_registration_does_not_count():
+    binance = _FakeClient(balances={'XRP': Decimal("0")})
+    strategy = _strategy(binance=binance)
+    strategy.transfer_timeout = timedelta(seconds=0.2)
+    # A snapshot from before the waiter registered already shows the amount
+    strategy._last_balance['binance'] = (time.monotonic(), {
+        'XRP': {'free': Decimal("500"), 'locked': Decimal("0"), 'total': Decimal("500")}
+    })
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(strategy._wait_for_deposit('binance', 'XRP', Decimal("100")))
+
+
+def test_deposit_timeout_message():
+    strategy = _strategy(upbit=_FakeClient(balances={'USDT': Decimal("0")}))
+    strategy.transfer_timeout = timedelta(seconds=0.1)
+
+    with pytest.raises(TimeoutError, match="Deposit timeout: USDT not received on Upbit"):
+        asyncio.run(strategy._wait_for_deposit('upbit', 'USDT', Decimal("10")))
+
+
+def test_watcher_stops_when_idle_and_restarts_for_new_waiter():
+    binance = _FakeClient(balances={'XRP': Decimal("0")})
+    strategy = _strategy(binance=binance)
+
+    async def deliver(amount):
+        await asyncio.sleep(0.05)
+        binance.totals['XRP'] += amount
+
+    async def scenario():
+        await asyncio.gather(strategy._wait_for_deposit('binance', 'XRP', Decimal("100")),
+                             deliver(Decimal("100")))
+        first_watcher = strategy._balance_watchers['binance']
+        await asyncio.wait_for(first_watcher, 1)  # Exits once nothing is watched
+        assert not strategy._watched_coins['binance']
+
+        await asyncio.gather(strategy._wait_for_deposit('binance', 'XRP', Decimal("50")),
+                             deliver(Decimal("50")))
+        assert strategy._balance_watchers['binance'] is not first_watcher
+
+    asyncio.run(asyncio.wait_for(scenario(), 2))
@@ -0,0 +1,73 @@
+"""Tests for the paper-trading mock exchange clients"""
+
+from decimal import Decimal
+
+import pytest
+
+from src.simulation.mock_exchange_clients import MockBinanceClient
+from src.simulation.virtual_balance_manager import VirtualBalanceManager
+
+
+@pytest.fixture
+def balance_manager(tmp_path):
+    manager = VirtualBalanceManager(
+        {"binance": {"USDT": Decimal("1000"), "BTC": Decimal("1")}, "upbit": {"KRW": Decimal("0")}},
+        state_file=str(tmp_path / "state.json")
+    )
+    yield manager
+    manager.close()
+
+
+def test_binance_withdraw_records_transfer(balance_manager):
+    """withdraw must be the variant that moves funds through simulate_transfer"""
+    client = MockBinanceClient(real_client=None, balance_manager=balance_manager)
+
+    result = client.withdraw("BTC", "MOCK_upbit_BTC_ADDRESS", Decimal("0.5"))
+
+    transfers = balance_manager.get_transfer_history()
+    assert len(transfers) == 1
+    transfer = transfers[0]
+    assert result["id"] == transfer.transfer_id
+    assert (transfer.asset, transfer.amount) == ("BTC", Decimal("0.5"))
+    assert (transfer.from_exchange, transfer.to_exchange) == ("binance", "upbit")
+    # Amount plus the fixed BTC network fee leaves Binance; the amount lands on Upbit
+    assert balance_manager.get_balance("binance", "BTC").available == Decimal("0.4995")
+    assert balance_manager.get_balance("upbit", "BTC").available == Decimal("0.5")
+
+
+class _FakeBinance:
+    """Real-client stand-in serving a fixed quote and counting book fetches"""
+
+    def __init__(self):
+        self.book_fetches = 0
+
+    def get_ticker_price(self, symbol):
+        return Decimal("100")
+
+    def get_order_book(self, symbol, limit):
+        self.book_fetches += 1
+        return {"asks": [["101", "10"], ["102", "10"]], "bids": [["99", "10"], ["98", "10"]]}
+
+
+def test_small_order_fills_at_cached_best_level(balance_manager):
+    real_client = _FakeBinance()
+    client = MockBinanceClient(real_client=real_client, balance_manager=balance_manager)
+
+    client.place_market_order("BTCUSDT", "BUY", Decimal("1"))
+    order = client.place_market_order("BTCUSDT", "BUY", Decimal("1"))
+    assert real_client.book_fetches == 1
+    # The spread is kept: the fast path fills at the best ask, not the last trade
+    assert order["fills"][0]["price"] == "101.0"
+
+    order = client.place_market_order("BTCUSDT", "SELL", Decimal("1"))
+    assert order["fills"][0]["price"] == "99.0"
+
+
+def test_cached_best_level_expires_with_the_quotes(balance_manager, monkeypatch):
+    real_client = _FakeBinance()
+    client = MockBinanceClient(real_client=real_client, balance_manager=balance_manager)
+
+    client.place_market_order("BTCUSDT", "BUY", Decimal("1"))
+    monkeypatch.setattr(client._quote_cache, "ttl", 0)
+    client.place_market_order("BTCUSDT", "BUY", Decimal("1"))
+    assert real_client.book_fetches == 2
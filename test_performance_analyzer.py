@@ -0,0 +1,84 @@
+"""Tests for the paper-trading performance analyzer"""
+
+from datetime import datetime
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from src.simulation.performance_analyzer import PerformanceAnalyzer, _risk_kernel, _risk_kernel_loop
+from src.simulation.virtual_balance_manager import SimulatedTrade, VirtualBalanceManager
+
+
+class _History:
+    """Balance manager stand-in holding a fixed trade history"""
+
+    def __init__(self, trades):
+        self.trades = trades
+        self.transfers = []
+        self.trade_counter = len(trades)
+        self.transfer_counter = 0
+
+    def full_trade_history(self):
+        return list(self.trades)
+
+    def full_transfer_history(self):
+        return list(self.transfers)
+
+
+class _FixedRate:
+    """Exchange rate provider stand-in"""
+
+    def get_usd_krw_rate(self):
+        return Decimal("1300")
+
+
+def _trade(day, side, total_cost):
+    return SimulatedTrade(
+        timestamp=datetime(2025, 7, day, 12), trade_id=f"SIM_upbit_{day}_{side}", exchange="upbit",
+        symbol="KRW-XRP", side=side, price=total_cost, quantity=Decimal("1"), fee=Decimal("0"),
+        fee_asset="KRW", total_cost=total_cost, trade_type="market"
+    )
+
+
+def test_sharpe_uses_per_day_returns():
+    # Net cash flow of 100, 200 and 600 KRW over three days on 10000 KRW:
+    # per-day returns of 1%, 2% and 6% (cumulative 1%, 3%, 9%)
+    trades = []
+    for day, profit in ((21, 100), (22, 200), (23, 600)):
+        trades += [_trade(day, "buy", Decimal("1000")), _trade(day, "sell", Decimal(1000 + profit))]
+
+    metrics = PerformanceAnalyzer(_History(trades), _FixedRate()).analyze_performance(Decimal("10000"))
+
+    # Mean 3%, population variance (0.02^2 + 0.01^2 + 0.03^2) / 3
+    expected = 0.03 * 365 ** 0.5 / (0.0014 / 3) ** 0.5
+    assert metrics.sharpe_ratio == pytest.approx(expected)
+
+
+def test_totals_cover_trades_evicted_from_memory(tmp_path):
+    manager = VirtualBalanceManager({"upbit": {"KRW": Decimal("1000000")}},
+                                    state_file=str(tmp_path / "state.json"), history_limit=5)
+    try:
+        for _ in range(12):
+            with manager.arbitrage_cycle():
+                manager.execute_trade("upbit", "KRW-XRP", "buy", Decimal("800"), Decimal("10"), Decimal("0"))
+                manager.execute_trade("upbit", "KRW-XRP", "sell", Decimal("810"), Decimal("10"), Decimal("0"))
+        assert len(manager.trades) == 5
+
+        metrics = PerformanceAnalyzer(manager, None).analyze_performance(Decimal("1000000"))
+
+        assert metrics.total_trades == 12
+        assert metrics.total_volume_krw == Decimal(12 * (8000 + 8100))
+        assert metrics.net_profit_krw == Decimal(12 * 100)
+        assert metrics.trades_by_coin == {"XRP": 12}
+    finally:
+        manager.close()
+
+
+def test_risk_kernel_matches_scalar_loop():
+    cumulative_returns = np.array([0.01, -0.02, 0.03, 0.025, -0.01, 0.04])
+    assert np.allclose(_risk_kernel(cumulative_returns, 10000.0),
+                       _risk_kernel_loop(cumulative_returns, 10000.0))
+    # Never above the initial capital: the drawdown is measured from it
+    assert np.allclose(_risk_kernel(np.array([-0.05, -0.01]), 10000.0),
+                       _risk_kernel_loop(np.array([-0.05, -0.01]), 10000.0))
@@ -0,0 +1,130 @@
+"""Tests for the paper-trading virtual balance manager"""
+
+import json
+from decimal import Decimal
+
+from src.simulation.virtual_balance_manager import (
+    TradeSpec, TransferSpec, VirtualBalance, VirtualBalanceManager, coin_from_symbol, parse_symbol,
+    to_minor_units
+)
+
+
+# State file layout from before trade/transfer history moved to NDJSON logs
+_LEGACY_STATE = {
+    "balances": {
+        "upbit": {"KRW": {"available": "1000000", "locked": "0"}},
+        "binance": {"USDT": {"available": "500", "locked": "0"}}
+    },
+    "trades": [{
+        "timestamp": "2025-07-21T22:07:01.036278",
+        "trade_id": "SIM_upbit_1",
+        "exchange": "upbit",
+        "symbol": "KRW-XRP",
+        "side": "buy",
+        "price": "800",
+        "quantity": "10",
+        "fee": "4",
+        "fee_asset": "KRW",
+        "total_cost": "8000",
+        "trade_type": "market"
+    }],
+    "transfers": [{
+        "timestamp": "2025-07-21T22:07:21.165280",
+        "transfer_id": "SIM_TRANSFER_1",
+        "asset": "XRP",
+        "amount": "9.75",
+        "from_exchange": "upbit",
+        "to_exchange": "binance",
+        "fee": "0.25",
+        "status": "completed"
+    }],
+    "trade_counter": 1,
+    "transfer_counter": 1
+}
+
+
+def test_load_legacy_snapshot_keeps_history(tmp_path):
+    state_file = tmp_path / "simulation_state.json"
+    state_file.write_text(json.dumps(_LEGACY_STATE))
+
+    manager = VirtualBalanceManager({}, state_file=str(state_file))
+    assert [trade.trade_id for trade in manager.get_trade_history()] == ["SIM_upbit_1"]
+    assert [transfer.transfer_id for transfer in manager.get_transfer_history()] == ["SIM_TRANSFER_1"]
+    # Saving rewrites the snapshot without the history lists
+    manager.save_state()
+    manager.close()
+    assert "trades" not in json.loads(state_file.read_text())
+
+    reloaded = VirtualBalanceManager({}, state_file=str(state_file))
+    try:
+        trades = reloaded.get_trade_history()
+        assert [trade.trade_id for trade in trades] == ["SIM_upbit_1"]
+        assert trades[0].total_cost == Decimal("8000")
+        assert reloaded.get_transfer_history()[0].amount == Decimal("9.75")
+        assert reloaded.trade_counter == 1
+        assert reloaded.get_balance("upbit", "KRW").available == Decimal("1000000")
+    finally:
+        reloaded.close()
+
+
+def test_balance_to_dict_drops_padding_zeros():
+    balance = VirtualBalance(asset="KRW", available_units=to_minor_units(Decimal("1000000")),
+                             locked_units=0)
+    assert balance.to_dict() == {"available": "1000000", "locked": "0"}
+    balance.available_units = to_minor_units(Decimal("0.12345678"))
+    assert balance.to_dict()["available"] == "0.12345678"
+
+
+def test_coin_from_symbol_agrees_with_parse_symbol():
+    for exchange, symbol in (("binance", "BTCUSDT"), ("binance", "ETHBTC"),
+                             ("upbit", "KRW-XRP"), ("upbit", "BTC-ETH"), ("upbit", "XRP")):
+        assets = parse_symbol(exchange, symbol)
+        assert coin_from_symbol(exchange, symbol) == (assets[0] if assets else None)
+
+
+def _manager(tmp_path, **kwargs):
+    return VirtualBalanceManager(
+        {"binance": {"USDT": Decimal("1000")}, "upbit": {"KRW": Decimal("1000000")}},
+        state_file=str(tmp_path / "state.json"), **kwargs
+    )
+
+
+def test_trade_batch_queues_one_save_and_keeps_failed_legs(tmp_path, monkeypatch):
+    manager = _manager(tmp_path)
+    try:
+        saves = []
+        request_save = manager._request_save
+        monkeypatch.setattr(manager, "_request_save", lambda: (saves.append(1), request_save()))
+
+        trades = manager.execute_trades_batch([
+            TradeSpec("binance", "XRPUSDT", "buy", Decimal("0.5"), Decimal("100"), Decimal("0.001")),
+            TradeSpec("binance", "BADSYMBOL", "buy", Decimal("1"), Decimal("1"), Decimal("0.001")),
+            TradeSpec("upbit", "KRW-XRP", "sell", Decimal("800"), Decimal("5"), Decimal("0.0005")),
+        ])
+
+        assert saves == [1]
+        assert trades[0] is not None and trades[0].symbol == "XRPUSDT"
+        assert trades[1] is None  # Unparseable symbol
+        assert trades[2] is None  # No XRP on Upbit to sell
+        manager.flush()
+        assert json.loads((tmp_path / "state.json").read_text())["trade_counter"] == 1
+    finally:
+        manager.close()
+
+
+def test_transfer_batch_queues_one_save(tmp_path, monkeypatch):
+    manager = _manager(tmp_path)
+    try:
+        saves = []
+        request_save = manager._request_save
+        monkeypatch.setattr(manager, "_request_save", lambda: (saves.append(1), request_save()))
+
+        transfers = manager.simulate_transfers_batch([
+            TransferSpec("USDT", Decimal("100"), "binance", "upbit", Decimal("1")),
+            TransferSpec("USDT", Decimal("5000"), "binance", "upbit", Decimal("1")),
+        ])
+
+        assert saves == [1]
+        assert transfers[0] is not None and transfers[1] is None
+    finally:
+        manager.close()